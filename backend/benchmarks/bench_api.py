@@ -0,0 +1,119 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.generators import env_size, seed_user
+from finances.models import Expense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.month_cache_service import get_month_cache
+
+EXPENSES_URL = '/api/v1/finances/expenses/'
+CATEGORIES_URL = '/api/v1/finances/categories/'
+INSTALLMENTS_URL = '/api/v1/finances/installment-expenses/'
+ROUNDS = env_size('ROUNDS', 5)
+
+
+@pytest.fixture
+def seeded(bench_user):
+    return seed_user(bench_user)
+
+
+@pytest.fixture
+def jwt_client(bench_user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(bench_user).access_token}')
+    return client
+
+
+def _get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response
+
+
+def test_bench_month_listing(bench, jwt_client, seeded):
+    url = f'{EXPENSES_URL}?year=2020&month=6'
+    cache = get_month_cache()
+    bench('month listing, cold cache', _get_ok, jwt_client, url, rounds=ROUNDS, setup=cache.clear)
+    bench('month listing, warm cache', _get_ok, jwt_client, url, rounds=ROUNDS)
+    bench('month listing, keyset page', _get_ok, jwt_client, f'{url}&page_size=50', rounds=ROUNDS)
+
+
+def test_bench_available_months(bench, bench_user, jwt_client, seeded):
+    bench('available_months service', ExpenseListService(bench_user).available_months, rounds=ROUNDS)
+    bench('months endpoint', _get_ok, jwt_client, f'{EXPENSES_URL}months/', rounds=ROUNDS)
+
+
+def test_bench_search(bench, jwt_client, seeded):
+    url = f'{EXPENSES_URL}search/'
+    bench('search, selective name', _get_ok, jwt_client, f'{url}?q=Despesa 4242', rounds=ROUNDS)
+    bench('search, broad name', _get_ok, jwt_client, f'{url}?q=Despesa&page_size=50', rounds=ROUNDS)
+    bench(
+        'search, filters only',
+        _get_ok,
+        jwt_client,
+        f'{url}?min=100&max=200&from=2018-01&to=2019-12&page_size=50',
+        rounds=ROUNDS,
+    )
+    bench('search, rollup facets', _get_ok, jwt_client, f'{url}?from=2018-01', rounds=ROUNDS)
+
+
+def test_bench_mark_paid_many_items(bench, bench_user, jwt_client, seeded):
+    concrete = list(
+        Expense.objects.filter(user=bench_user, due_date__year=2020).values_list('id', flat=True)[:500]
+    )
+    rules = list(RecurringExpense.objects.filter(user=bench_user).values_list('id', flat=True)[:200])
+    items = [{'type': 'e', 'id': pk} for pk in concrete] + [{'type': 'r', 'id': pk} for pk in rules]
+    payload = {'ids': items, 'month': 6, 'year': 2020}
+
+    def post(path):
+        response = jwt_client.post(f'{EXPENSES_URL}{path}/', payload, format='json')
+        assert response.status_code == 200, response.content
+
+    bench(
+        f'mark-paid {len(items)} items', post, 'mark-paid',
+        rounds=ROUNDS, setup=lambda: post('unmark-paid'),
+    )
+    bench(
+        f'unmark-paid {len(items)} items', post, 'unmark-paid',
+        rounds=ROUNDS, setup=lambda: post('mark-paid'),
+    )
+
+
+def test_bench_installment_creation(bench, jwt_client, seeded):
+    quantity = env_size('INSTALLMENTS', 60)
+    payload = {
+        'name': 'Financiamento',
+        'total_amount': '98765.43',
+        'installments_quantity': quantity,
+        'first_due_date': '2021-01-10',
+        'category_id': seeded[0].id,
+    }
+
+    def create():
+        response = jwt_client.post(INSTALLMENTS_URL, payload, format='json')
+        assert response.status_code == 201, response.content
+
+    bench(f'installment plan, {quantity} installments', create, rounds=ROUNDS)
+
+
+def test_bench_category_crud(bench, jwt_client, seeded):
+    def crud():
+        created = jwt_client.post(CATEGORIES_URL, {'name': 'Bench CRUD'}, format='json')
+        assert created.status_code == 201, created.content
+        url = f'{CATEGORIES_URL}{created.data["id"]}/'
+        assert jwt_client.patch(url, {'name': 'Bench CRUD 2'}, format='json').status_code == 200
+        assert jwt_client.get(CATEGORIES_URL).status_code == 200
+        assert jwt_client.delete(url).status_code == 204
+
+    bench('category create/update/list/delete', crud, rounds=ROUNDS)
+
+
+def test_bench_jwt_overhead(bench, bench_user, jwt_client, seeded):
+    session_client = APIClient()
+    session_client.force_authenticate(bench_user)
+    url = f'{EXPENSES_URL}months/'
+
+    with_jwt = bench('months with JWT', _get_ok, jwt_client, url, rounds=ROUNDS)
+    forced = bench('months with forced auth', _get_ok, session_client, url, rounds=ROUNDS)
+    print(f'JWT overhead: {(with_jwt["seconds"] - forced["seconds"]) * 1000:.2f}ms per request')
@@ -0,0 +1,55 @@
+import time
+from datetime import date
+
+from rest_framework.renderers import JSONRenderer
+
+from finances.interfaces.api.v1.serializers import ExpenseSerializer, serialize_expense_list
+from finances.models import Expense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+
+ROWS = 500
+ROUNDS = 20
+
+
+def _rounds(fn, expenses):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        data = fn(expenses)
+    elapsed = time.perf_counter() - started
+    return elapsed, data
+
+
+def test_bench_serialize_500_row_month(bench_user, bench_category):
+    Expense.objects.bulk_create(
+        Expense(
+            user=bench_user,
+            name=f'Despesa {i}',
+            amount=f'{i % 300}.{i % 100:02d}',
+            due_date=date(2025, 7, 1 + i % 31),
+            paid=bool(i % 2),
+            category=bench_category if i % 5 else None,
+        )
+        for i in range(ROWS - 50)
+    )
+    RecurringExpense.objects.bulk_create(
+        RecurringExpense(
+            user=bench_user,
+            name=f'Regra {i}',
+            amount=99,
+            due_day=1 + i % 31,
+            category=bench_category,
+            start_date=date(2025, 1, 1),
+        )
+        for i in range(50)
+    )
+    expenses = ExpenseListService(bench_user).all_for_month(2025, 7)
+    assert len(expenses) == ROWS
+
+    legacy_seconds, legacy = _rounds(lambda e: ExpenseSerializer(e, many=True).data, expenses)
+    fast_seconds, fast = _rounds(serialize_expense_list, expenses)
+    print(f'\nExpenseSerializer: {legacy_seconds / ROUNDS * 1000:.2f}ms per month')
+    print(f'serialize_expense_list: {fast_seconds / ROUNDS * 1000:.2f}ms per month')
+
+    renderer = JSONRenderer()
+    assert renderer.render(fast) == renderer.render(legacy)
+    assert fast_seconds < legacy_seconds
@@ -0,0 +1,22 @@
+from finances.models import Expense
+from finances.services.expense_import_service import ExpenseImportService
+
+ROWS = 50_000
+
+
+def _rows():
+    for i in range(ROWS):
+        yield {
+            'name': f'Lançamento {i}',
+            'amount': f'{i % 500}.{i % 100:02d}',
+            'due_date': f'20{10 + i % 15}-{1 + i % 12:02d}-{1 + i % 28:02d}',
+            'paid': 'true' if i % 3 else 'false',
+            'category': 'Benchmark',
+        }
+
+
+def test_bench_import_50k_rows(bench, bench_user, bench_category):
+    result = bench('import 50k rows', ExpenseImportService(bench_user).run, _rows())
+
+    assert result['result']['created'] == ROWS
+    assert Expense.objects.count() == ROWS
@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+
+from finances.models import Expense, InstallmentExpense
+from finances.services.installment_expense_service import InstallmentExpenseService
+
+PLANS = 1_000
+INSTALLMENTS = 12
+
+
+def _legacy_create(user, category, index):
+    """The per-row implementation the service used before bulk_create."""
+    total_amount = Decimal('1234.56')
+    plan = InstallmentExpense.objects.create(
+        user=user,
+        name=f'Plano {index}',
+        total_amount=total_amount,
+        installments_quantity=INSTALLMENTS,
+        first_due_date=date(2025, 1, 10),
+        category=category,
+    )
+    installment_amount = round(total_amount / INSTALLMENTS, 2)
+    for i in range(INSTALLMENTS):
+        Expense.objects.create(
+            user=user,
+            name=f'Plano {index} ({i+1}/{INSTALLMENTS})',
+            amount=installment_amount,
+            due_date=date(2025, 1, 10) + relativedelta(months=i),
+            category=category,
+            installment_origin=plan,
+        )
+
+
+def _service_create(user, category, index):
+    InstallmentExpenseService(
+        user=user,
+        name=f'Plano {index}',
+        total_amount=Decimal('1234.56'),
+        installments_quantity=INSTALLMENTS,
+        first_due_date=date(2025, 1, 10),
+        category_id=category.id,
+    ).create_installment_expense()
+
+
+def _create_plans(create, user, category):
+    for index in range(PLANS):
+        create(user, category, index)
+
+
+def test_bench_installment_plans(bench, bench_user, bench_category):
+    legacy = bench('legacy per-row create', _create_plans, _legacy_create, bench_user, bench_category)
+    Expense.objects.all().delete()
+    InstallmentExpense.objects.all().delete()
+
+    current = bench('bulk_create service', _create_plans, _service_create, bench_user, bench_category)
+
+    assert Expense.objects.count() == PLANS * INSTALLMENTS
+    assert current['queries'] < legacy['queries']
@@ -0,0 +1,60 @@
+from datetime import date
+
+from finances.models import Expense, RecurringExpense
+from finances.services.recurring_expansion_service import RecurringExpansionService
+from finances.utils.validations import FinancesValidations
+
+RULES = 1_000
+START, END = (2015, 1), (2024, 12)
+
+
+def _legacy_expand(user, rules, paid):
+    """The per-occurrence Expense construction the listing used before."""
+    expenses = []
+    for year, month in FinancesValidations.iter_months(START, END):
+        first_day, last_day = FinancesValidations.month_bounds(year, month)
+        for rule in rules:
+            if rule.start_date > last_day or (rule.end_date and rule.end_date < first_day):
+                continue
+            expenses.append(
+                Expense(
+                    id=-rule.id,
+                    user=user,
+                    name=rule.name,
+                    amount=rule.amount,
+                    due_date=FinancesValidations.safe_due_date(year, month, rule.due_day),
+                    category=rule.category,
+                    paid=(rule.id, month, year) in paid,
+                )
+            )
+    return expenses
+
+
+def _engine_expand(rules, paid):
+    return RecurringExpansionService(rules).expand(START, END, paid)
+
+
+def test_bench_expand_1000_rules_over_10_years(bench, bench_user, bench_category):
+    RecurringExpense.objects.bulk_create(
+        RecurringExpense(
+            user=bench_user,
+            name=f'Regra {i}',
+            amount=10 + i % 90,
+            due_day=1 + i % 31,
+            category=bench_category,
+            start_date=date(2015, 1 + i % 12, 1),
+            end_date=date(2024, 1 + i % 12, 28) if i % 4 == 0 else None,
+        )
+        for i in range(RULES)
+    )
+    rules = list(RecurringExpense.objects.select_related('category').filter(user=bench_user))
+    paid = {(rule.id, 1 + rule.id % 12, 2020) for rule in rules}
+
+    legacy = bench('legacy Expense instances', _legacy_expand, bench_user, rules, paid)
+    current = bench('expansion engine', _engine_expand, rules, paid)
+
+    assert len(current['result']) == len(legacy['result'])
+    assert [(r.id, r.due_date, r.paid) for r in current['result']] == [
+        (e.id, e.due_date, e.paid) for e in legacy['result']
+    ]
+    assert current['seconds'] < legacy['seconds']
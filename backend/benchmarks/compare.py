@@ -0,0 +1,45 @@
+"""Compares two BENCH_RESULTS files and flags regressions.
+
+    python backend/benchmarks/compare.py before.json after.json --threshold 1.2
+
+Exits with status 1 when any measurement got slower than ``threshold``
+times its baseline or issues more queries.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path) as source:
+        data = json.load(source)
+    return data, {(r['test'], r['label']): r for r in data['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    baseline_info, baseline = _load(args.baseline)
+    current_info, current = _load(args.current)
+    print(f'{baseline_info["commit"]} -> {current_info["commit"]}')
+
+    regressions = 0
+    for key in sorted(set(baseline) & set(current)):
+        before, after = baseline[key], current[key]
+        ratio = after['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        slower = ratio > args.threshold or after['queries'] > before['queries']
+        regressions += slower
+        print(
+            f'{"!" if slower else " "} {key[1]:<45} '
+            f'{before["seconds"] * 1000:9.2f}ms -> {after["seconds"] * 1000:9.2f}ms ({ratio:5.2f}x) '
+            f'{before["queries"]:>5} -> {after["queries"]:<5} queries'
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Benchmarks for the finances hot paths.
+
+Benchmark modules are named ``bench_*.py`` so the regular test run does not
+collect them. Run them explicitly, e.g.::
+
+    pytest backend/benchmarks/bench_installments.py -s
+
+Set ``BENCH_RESULTS`` to a file path to write every measurement as JSON,
+then compare two runs with ``python backend/benchmarks/compare.py``.
+"""
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import time
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from finances.models import Category
+
+
+@pytest.fixture
+def bench_user(db):
+    return User.objects.create_user(username='bench', password='12345678')
+
+
+@pytest.fixture
+def bench_category(bench_user):
+    return Category.objects.create(user=bench_user, name='Benchmark')
+
+
+class QueryCounter:
+    """execute_wrapper that counts queries without keeping them in memory."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+_results = []
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    path = os.environ.get('BENCH_RESULTS')
+    if not path or not _results:
+        return
+    with open(path, 'w') as output:
+        json.dump(
+            {
+                'commit': _git_commit(),
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'results': _results,
+            },
+            output,
+            indent=2,
+        )
+
+
+@pytest.fixture
+def bench(request):
+    """Runs a callable ``rounds`` times and reports its best time and query count."""
+
+    def _bench(label, fn, *args, rounds=1, setup=None, **kwargs):
+        timings = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                result = fn(*args, **kwargs)
+                timings.append(time.perf_counter() - started)
+
+        entry = {
+            'test': request.node.name,
+            'label': label,
+            'rounds': rounds,
+            'seconds': min(timings),
+            'mean_seconds': statistics.fmean(timings),
+            'queries': counter.count,
+        }
+        _results.append(entry)
+        print(f'\n{label}: {entry["seconds"]:.4f}s best of {rounds}, {counter.count} queries')
+        return {**entry, 'result': result}
+
+    return _bench
@@ -0,0 +1,98 @@
+"""Data generators that seed a benchmark user with realistic volumes.
+
+Sizes default to the ``BENCH_*`` environment variables so the same suite can
+run small on a laptop and at 1M expenses on a dedicated box::
+
+    BENCH_EXPENSES=1000000 pytest backend/benchmarks/bench_api.py -s
+"""
+import os
+import random
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+from dateutil.relativedelta import relativedelta
+
+from finances.models import Category, Expense, RecurringExpense
+from finances.services.installment_expense_service import InstallmentExpenseService
+from finances.services.rollup_service import RollupService
+
+START = date(2015, 1, 1)
+MONTHS = 120
+
+
+def env_size(name: str, default: int) -> int:
+    return int(os.environ.get(f'BENCH_{name}', default))
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def seed_categories(user, count=10):
+    return Category.objects.bulk_create(
+        Category(user=user, name=f'Categoria {i}') for i in range(count)
+    )
+
+
+def seed_expenses(user, categories, count, seed=0, batch_size=5000):
+    """Spreads ``count`` expenses over ten years and rebuilds the rollups once."""
+    rng = random.Random(seed)
+    rows = (
+        Expense(
+            user=user,
+            name=f'Despesa {i}',
+            amount=Decimal(rng.randint(100, 500_000)) / 100,
+            due_date=START + relativedelta(months=rng.randrange(MONTHS), days=rng.randrange(28)),
+            paid=rng.random() < 0.6,
+            category=rng.choice(categories + [None]),
+        )
+        for i in range(count)
+    )
+    for batch in _batched(rows, batch_size):
+        Expense.objects.bulk_create(batch)
+    RollupService.rebuild([user.id])
+
+
+def seed_recurring(user, categories, count, seed=0):
+    rng = random.Random(seed)
+    return RecurringExpense.objects.bulk_create(
+        RecurringExpense(
+            user=user,
+            name=f'Recorrente {i}',
+            amount=Decimal(rng.randint(1_000, 300_000)) / 100,
+            due_day=rng.randint(1, 31),
+            category=rng.choice(categories),
+            start_date=START + relativedelta(months=rng.randrange(MONTHS)),
+            end_date=None if i % 3 else START + relativedelta(months=MONTHS + rng.randrange(24)),
+        )
+        for i in range(count)
+    )
+
+
+def seed_installment_plans(user, categories, plans, installments):
+    for i in range(plans):
+        InstallmentExpenseService(
+            user=user,
+            name=f'Parcelado {i}',
+            total_amount=Decimal('12345.67'),
+            installments_quantity=installments,
+            first_due_date=START + relativedelta(months=i % MONTHS),
+            category_id=categories[i % len(categories)].id,
+        ).create_installment_expense()
+
+
+def seed_user(user, expenses=None, rules=None, plans=None, installments=None):
+    """Seeds the user with the configured volumes and returns the categories."""
+    categories = seed_categories(user)
+    seed_expenses(user, categories, expenses if expenses is not None else env_size('EXPENSES', 10_000))
+    seed_recurring(user, categories, rules if rules is not None else env_size('RULES', 300))
+    seed_installment_plans(
+        user,
+        categories,
+        plans if plans is not None else env_size('PLANS', 20),
+        installments if installments is not None else env_size('INSTALLMENTS', 60),
+    )
+    return categories
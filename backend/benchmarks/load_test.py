@@ -0,0 +1,107 @@
+"""Closed-loop HTTP load test comparing the WSGI and ASGI deployments.
+
+Standard library only. Start the same project under both servers, e.g.::
+
+    gunicorn core.wsgi:application -w 1 --threads 16 -b 127.0.0.1:8000
+    uvicorn core.asgi:application --workers 1 --port 8001
+
+then point the script at each, once per endpoint flavour::
+
+    python backend/benchmarks/load_test.py --base http://127.0.0.1:8000 \\
+        --username bench --password 12345678 \\
+        --path '/api/v1/finances/expenses/?year=2025&month=7' \\
+        --path '/api/v1/finances/async/expenses/?year=2025&month=7'
+
+Each path is hammered by ``--concurrency`` workers for ``--duration``
+seconds; req/s and latency percentiles are printed and, with ``--json``,
+appended to a results file.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def obtain_token(base, username, password):
+    request = urllib.request.Request(
+        f'{base}/api/v1/authentication/token/',
+        data=json.dumps({'username': username, 'password': password}).encode(),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)['access']
+
+
+def run(url, token, concurrency, duration):
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        local, failed = [], 0
+        headers = {'Authorization': f'Bearer {token}'}
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+                    response.read()
+                local.append(time.perf_counter() - started)
+            except (urllib.error.URLError, ConnectionError):
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000  # noqa: E731
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else None,
+        'p50_ms': percentile(0.50) if latencies else None,
+        'p95_ms': percentile(0.95) if latencies else None,
+        'p99_ms': percentile(0.99) if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base', required=True)
+    parser.add_argument('--path', action='append', required=True)
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--json', help='append results to this JSON-lines file')
+    args = parser.parse_args(argv)
+
+    token = obtain_token(args.base, args.username, args.password)
+    for path in args.path:
+        result = run(f'{args.base}{path}', token, args.concurrency, args.duration)
+        print(
+            f'{path}: {result["rps"]:.1f} req/s, p50 {result["p50_ms"]:.1f}ms, '
+            f'p95 {result["p95_ms"]:.1f}ms, {result["errors"]} errors'
+        )
+        if args.json:
+            with open(args.json, 'a') as output:
+                output.write(json.dumps(result) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
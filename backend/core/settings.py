@@ -1,14 +1,14 @@
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='', cast=Csv())
 
 SECRET_KEY = config('SECRET_KEY')
 
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'finances.interfaces.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -69,12 +70,46 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 'postgresql' needs the optional psycopg extra: uv sync --extra postgresql (see README)
+DATABASE_BACKEND = config('DATABASE_BACKEND', default='sqlite')
+
+if DATABASE_BACKEND == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DATABASE_NAME', default='cashflow'),
+            'USER': config('DATABASE_USER', default='postgres'),
+            'PASSWORD': config('DATABASE_PASSWORD', default=''),
+            'HOST': config('DATABASE_HOST', default='localhost'),
+            'PORT': config('DATABASE_PORT', default=5432, cast=int),
+            'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if config('DATABASE_POOL', default=False, cast=bool):
+        # psycopg's pool owns connection reuse; Django requires CONN_MAX_AGE = 0 with it
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DATABASE_POOL_TIMEOUT', default=10, cast=int),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DATABASE_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'OPTIONS': {
+                # WAL lets readers run alongside the single writer
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                # seconds to wait on a locked database (busy_timeout)
+                'timeout': config('DATABASE_TIMEOUT', default=20, cast=int),
+                # take the write lock at BEGIN so transactions queue instead of failing to upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
-}
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -105,6 +140,9 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# queued imports are spooled here until the run_jobs worker reads them
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -129,6 +167,50 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
 }
 
+FINANCES_MONTH_CACHE = {
+    'BACKEND': config(
+        'FINANCES_MONTH_CACHE_BACKEND',
+        default='finances.services.month_cache_service.LocalMemoryMonthCacheBackend',
+    ),
+    'OPTIONS': {
+        'timeout': config('FINANCES_MONTH_CACHE_TIMEOUT', default=300, cast=int),
+    },
+}
+
+FINANCES_METRICS = {
+    'ENABLED': config('FINANCES_METRICS_ENABLED', default=False, cast=bool),
+    # bearer token the Prometheus scraper sends to /metrics; staff sessions need none.
+    # Counters are per process: scrape every worker, not a load-balanced address.
+    'TOKEN': config('FINANCES_METRICS_TOKEN', default=''),
+}
+
+FINANCES_JOBS = {
+    'THREADS': config('FINANCES_JOBS_THREADS', default=4, cast=int),
+    'POLL_INTERVAL': config('FINANCES_JOBS_POLL_INTERVAL', default=1.0, cast=float),
+    'MAX_RUNNING_PER_USER': config('FINANCES_JOBS_MAX_RUNNING_PER_USER', default=1, cast=int),
+    'MAX_PENDING_PER_USER': config('FINANCES_JOBS_MAX_PENDING_PER_USER', default=20, cast=int),
+    # seconds without progress before a running job is handed to another worker
+    'STALE_AFTER': config('FINANCES_JOBS_STALE_AFTER', default=600, cast=int),
+    # larger imports and installment plans are queued and answered with 202
+    'INLINE_IMPORT_ROWS': config('FINANCES_JOBS_INLINE_IMPORT_ROWS', default=1000, cast=int),
+    'INLINE_INSTALLMENTS': config('FINANCES_JOBS_INLINE_INSTALLMENTS', default=120, cast=int),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'finances.metrics': {
+            'handlers': ['console'],
+            'level': config('FINANCES_METRICS_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Cash Flow API',
     'DESCRIPTION': 'API documentation for the frontend',
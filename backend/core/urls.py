@@ -6,10 +6,13 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from finances.interfaces.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/<str:version>/authentication/', include('authentication.urls')),
     path('api/<str:version>/finances/', include('finances.interfaces.api.urls')),
+    path('metrics', metrics_view, name='metrics'),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path(
         'api/docs/',
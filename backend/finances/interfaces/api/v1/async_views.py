@@ -0,0 +1,95 @@
+"""Async variants of the read-heavy endpoints, for ASGI deployments.
+
+Plain Django async views: DRF's APIView is synchronous, so authentication
+goes through SimpleJWT wrapped in ``sync_to_async`` and the responses are
+rendered with the same compact JSON as DRF's JSONRenderer.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import serializers
+from finances.models import Category
+from finances.services.change_marker_service import ChangeMarkerService
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.expense_summary_service import ExpenseSummaryService
+from finances.services.month_cache_service import get_month_cache
+from finances.utils.validations import FinancesValidations
+
+
+def _json(data, status=200) -> JsonResponse:
+    return JsonResponse(
+        data,
+        status=status,
+        safe=False,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+    )
+
+
+async def _authenticate(request):
+    result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0]
+
+
+def async_api_view(view):
+    """Authenticates with JWT and turns DRF API exceptions into JSON responses."""
+
+    @require_GET
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            request.user = await _authenticate(request)
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+            return _json(detail, status=exc.status_code)
+
+    return wrapper
+
+
+@async_api_view
+async def expense_list(request, *args, **kwargs):
+    year, month = FinancesValidations.validate_month_year(
+        year=request.GET.get('year'), month=request.GET.get('month')
+    )
+    service = ExpenseListService(request.user)
+
+    async def build():
+        return serializers.serialize_expense_list(await service.aall_for_month(year, month))
+
+    marker = await sync_to_async(ChangeMarkerService(request.user).marker)()
+    return _json(
+        await get_month_cache().aget_or_build(request.user.id, year, month, build, marker=marker)
+    )
+
+
+@async_api_view
+async def expense_months(request, *args, **kwargs):
+    return _json(await ExpenseListService(request.user).aavailable_months())
+
+
+@async_api_view
+async def expense_summary(request, *args, **kwargs):
+    params = request.GET
+    if 'from' in params or 'to' in params:
+        start, end = FinancesValidations.validate_month_range(params.get('from'), params.get('to'))
+    else:
+        year, month = FinancesValidations.validate_month_year(
+            year=params.get('year'), month=params.get('month')
+        )
+        start = end = (year, month)
+
+    summary = await sync_to_async(ExpenseSummaryService(request.user).summarize)(start, end)
+    return _json(serializers.ExpenseSummarySerializer(summary).data)
+
+
+@async_api_view
+async def category_list(request, *args, **kwargs):
+    categories = [category async for category in Category.objects.filter(user=request.user)]
+    return _json(serializers.CategorySerializer(categories, many=True).data)
@@ -1,15 +1,63 @@
+import hashlib
+
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status, serializers
 
 from finances.models import Category
+from finances.services.change_marker_service import ChangeMarkerService
+from finances.services.month_cache_service import get_month_cache
+
+
+def user_data_marker(request) -> str:
+    """The user's change marker, computed once per request."""
+    if not hasattr(request, '_finances_change_marker'):
+        request._finances_change_marker = ChangeMarkerService(request.user).marker()
+    return request._finances_change_marker
+
+
+def user_data_etag(request, *args, **kwargs):
+    token = user_data_marker(request)
+    seed = ':'.join(
+        [str(request.user.pk), request.get_full_path(), request.META.get('HTTP_ACCEPT', ''), token]
+    )
+    return hashlib.sha1(seed.encode()).hexdigest()
+
+
+def user_data_month_etag(request, *args, **kwargs):
+    """ETag for payloads that also move with the current month."""
+    today = timezone.localdate()
+    return f'{user_data_etag(request)}-{today.year}{today.month:02d}'
+
+
+# no Last-Modified: the newest updated_at does not move when a row is deleted,
+# so If-Modified-Since would answer 304 over removed data
+conditional_on_user_data = method_decorator(condition(etag_func=user_data_etag))
+conditional_on_user_data_and_month = method_decorator(condition(etag_func=user_data_month_etag))
 
 
 class BaseUserQuerysetMixin:
+    """Scopes the queryset to the request user; list it before the DRF base classes."""
+
     def get_queryset(self):
         return self.queryset.filter(user=self.request.user)
 
 
+class UserCacheInvalidationMixin:
+    """Drops every cached month of the user when the object changes."""
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        get_month_cache().invalidate_user(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        get_month_cache().invalidate_user(self.request.user.id)
+
+
 class MarkPaidActionMixin:
     def _toggle_payment(self, request, mark=True):
         try:
@@ -0,0 +1,62 @@
+import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ExpenseKeysetPagination(BasePagination):
+    """Opt-in keyset pagination for the merged month listing.
+
+    Only used when the client sends ``page_size`` or ``cursor``; otherwise the
+    listing keeps returning the whole month as a plain list.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_page_size = 50
+    max_page_size = 500
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.default_page_size
+        try:
+            page_size = int(raw)
+        except ValueError:
+            raise ValidationError({'error': 'Tamanho de página inválido.'})
+        if page_size < 1:
+            raise ValidationError({'error': 'Tamanho de página inválido.'})
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            due_date, pk = raw.split('|')
+            return datetime.date.fromisoformat(due_date), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise ValidationError({'error': 'Cursor inválido.'})
+
+    def encode_cursor(self, key) -> str:
+        due_date, pk = key
+        raw = f'{due_date.isoformat()}|{pk}'
+        return urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def get_paginated_response(self, data, request, next_key, **extra):
+        next_url = None
+        if next_key is not None:
+            next_url = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                self.encode_cursor(next_key),
+            )
+        return Response({'next': next_url, 'results': data, **extra})
@@ -0,0 +1,57 @@
+import codecs
+import csv
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+def iter_csv_rows(text_stream):
+    """Yields one dict per CSV data row, keyed by the header line."""
+    try:
+        yield from csv.DictReader(text_stream)
+    except UnicodeDecodeError:
+        raise ParseError({'error': 'O arquivo deve estar codificado em UTF-8.'})
+    except csv.Error as e:
+        raise ParseError({'error': f'CSV inválido: {e}'})
+
+
+def iter_ndjson_rows(text_stream):
+    """Yields one object per non-blank NDJSON line, or None for invalid JSON."""
+    try:
+        for line in text_stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+    except UnicodeDecodeError:
+        raise ParseError({'error': 'O arquivo deve estar codificado em UTF-8.'})
+
+
+def decode_stream(stream, encoding='utf-8'):
+    return codecs.getreader(encoding)(stream)
+
+
+class CSVRowParser(BaseParser):
+    """Parses a CSV body lazily into an iterator of row dicts."""
+
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return iter(())
+        return iter_csv_rows(decode_stream(stream))
+
+
+class NDJSONRowParser(BaseParser):
+    """Parses a newline-delimited JSON body lazily into an iterator of rows."""
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return iter(())
+        return iter_ndjson_rows(decode_stream(stream))
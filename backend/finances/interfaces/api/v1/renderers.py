@@ -0,0 +1,72 @@
+import csv
+import json
+import re
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the line back to the csv writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+# spreadsheets evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+NUMBER = re.compile(r'[-+]?\d+(\.\d+)?')
+
+
+def _csv_cell(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) and not NUMBER.fullmatch(value):
+        return f"'{value}"
+    return value
+
+
+class CSVRowRenderer(BaseRenderer):
+    """Renders a sequence of flat dicts as CSV, one line at a time.
+
+    Without ``fields`` the header comes from the first row, so an empty
+    sequence renders nothing; exports pass their columns to always get one.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.iter_rows(rows))
+
+    def iter_rows(self, rows, fields=None):
+        writer = csv.writer(_EchoBuffer())
+        header = list(fields) if fields is not None else None
+        if header is not None:
+            yield writer.writerow(header).encode(self.charset)
+        for row in rows:
+            if header is None:
+                header = list(row)
+                yield writer.writerow(header).encode(self.charset)
+            yield writer.writerow([_csv_cell(row.get(key)) for key in header]).encode(self.charset)
+
+
+class NDJSONRowRenderer(BaseRenderer):
+    """Renders a sequence of dicts as newline-delimited JSON."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.iter_rows(rows))
+
+    def iter_rows(self, rows, fields=None):
+        for row in rows:
+            line = json.dumps(row, cls=JSONEncoder, ensure_ascii=False)
+            yield f'{line}\n'.encode(self.charset)
@@ -1,3 +1,6 @@
+from decimal import Context, Decimal
+from typing import Dict, Iterable, Iterator, List
+
 from django.utils.timezone import localtime
 from rest_framework import serializers
 
@@ -6,9 +9,11 @@ from finances.models import (
     Category,
     Expense,
     InstallmentExpense,
+    Job,
     PaidRecurringExpense,
     RecurringExpense
 )
+from finances.services.metrics_service import timed
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -71,6 +76,87 @@ class ExpenseSerializer(serializers.ModelSerializer, UserCategoryCreateMixin):
         return instance
 
 
+_AMOUNT_FIELD = Expense._meta.get_field('amount')
+_AMOUNT_QUANTUM = Decimal(1).scaleb(-_AMOUNT_FIELD.decimal_places)
+_AMOUNT_CONTEXT = Context(prec=_AMOUNT_FIELD.max_digits)
+
+
+def _amount_string(amount) -> str:
+    return f'{Decimal(amount).quantize(_AMOUNT_QUANTUM, context=_AMOUNT_CONTEXT):f}'
+
+
+@timed('serialize')
+def serialize_expense_list(expenses: Iterable) -> List[Dict]:
+    """Read-only fast path with the same output as ``ExpenseSerializer(many=True)``.
+
+    Builds plain dicts in the serializer's key order and shares one category
+    dict per category, skipping DRF's per-field dispatch. Accepts Expense
+    instances and VirtualExpense records alike.
+    """
+    categories: Dict[int, Dict] = {}
+    rows = []
+    for expense in expenses:
+        category_id = expense.category_id
+        category = None
+        if category_id is not None:
+            category = categories.get(category_id)
+            if category is None:
+                category = categories[category_id] = {
+                    'id': category_id,
+                    'name': expense.category.name,
+                }
+
+        pk = expense.id
+        origin_id = expense.installment_origin_id
+        rows.append({
+            'id': -pk if pk < 0 else pk,
+            'name': expense.name,
+            'amount': _amount_string(expense.amount),
+            'due_date': expense.due_date.isoformat(),
+            'paid': bool(expense.paid),
+            'category': category,
+            'installment_origin': origin_id,
+            'is_recurring': pk < 0,
+            'is_installment': origin_id is not None,
+        })
+    return rows
+
+
+EXPENSE_EXPORT_FIELDS = (
+    'id',
+    'name',
+    'amount',
+    'due_date',
+    'paid',
+    'category',
+    'installment_origin',
+    'is_recurring',
+    'is_installment',
+)
+
+
+def iter_expense_export_rows(expenses: Iterable) -> Iterator[Dict]:
+    """Flat export rows, one per expense, consumed lazily.
+
+    Column names follow the import format, so an export can be imported
+    back; the category is exported by name.
+    """
+    for expense in expenses:
+        pk = expense.id
+        origin_id = expense.installment_origin_id
+        yield {
+            'id': -pk if pk < 0 else pk,
+            'name': expense.name,
+            'amount': _amount_string(expense.amount),
+            'due_date': expense.due_date.isoformat(),
+            'paid': bool(expense.paid),
+            'category': expense.category.name if expense.category_id is not None else None,
+            'installment_origin': origin_id,
+            'is_recurring': pk < 0,
+            'is_installment': origin_id is not None,
+        }
+
+
 class InstallmentExpenseCreateSerializer(serializers.ModelSerializer):
     category_id = serializers.IntegerField(write_only=True)
 
@@ -178,3 +264,59 @@ class PaidRecurringExpenseSerializer(serializers.ModelSerializer):
             defaults={'day': date.day}
         )
         return obj
+
+
+class CategorySummarySerializer(serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    paid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    unpaid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    overdue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class ExpenseSummarySerializer(serializers.Serializer):
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    paid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    unpaid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    overdue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    categories = CategorySummarySerializer(many=True)
+
+
+class ForecastCategorySerializer(serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class ForecastMonthSerializer(serializers.Serializer):
+    year = serializers.IntegerField()
+    month = serializers.IntegerField()
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    paid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    unpaid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    categories = ForecastCategorySerializer(many=True)
+
+
+class ForecastSerializer(serializers.Serializer):
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    unpaid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    months = ForecastMonthSerializer(many=True)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'kind',
+            'status',
+            'progress',
+            'total',
+            'result',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
@@ -1,11 +1,49 @@
+import sqlite3
 from datetime import date
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.test import APIClient
 
 from finances.models import Category, Expense
+from finances.services.month_cache_service import get_month_cache
+from finances.services.rollup_service import RollupService
+
+
+@pytest.fixture(autouse=True)
+def clear_month_cache():
+    get_month_cache().clear()
+    yield
+    get_month_cache().clear()
+
+@pytest.fixture
+def file_database(transactional_db, tmp_path):
+    """Moves the default SQLite connection onto a file copy of the test database.
+
+    The in-memory test database has no WAL mode and its shared cache fails
+    lock waits instead of queueing them, so tests that open a connection per
+    thread run against a file instead.
+    """
+    if connection.vendor != 'sqlite' or not connection.is_in_memory_db():
+        yield
+        return
+
+    connection.ensure_connection()
+    in_memory, name = connection.connection, connection.settings_dict['NAME']
+    copy = sqlite3.connect(tmp_path / 'db.sqlite3')
+    in_memory.backup(copy)
+    copy.close()
+
+    connection.connection = None
+    connection.settings_dict['NAME'] = str(tmp_path / 'db.sqlite3')
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = name
+        connection.connection = in_memory
 
 @pytest.fixture
 def user(db):
@@ -54,7 +92,7 @@ def create_expense(user, create_category):
         if category_obj is None:
             category_obj = create_category()
 
-        return Expense.objects.create(
+        expense = Expense.objects.create(
             user=owner,
             name=name,
             amount=amount,
@@ -62,4 +100,6 @@ def create_expense(user, create_category):
             paid=paid,
             category=category_obj
         )
+        RollupService(owner).add_expenses([expense])
+        return expense
     return _create_expense
@@ -0,0 +1,74 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from finances.models import PaidRecurringExpense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+
+ASYNC_URL = '/api/v1/finances/async/'
+
+
+@pytest.fixture
+def async_get(user):
+    token = str(RefreshToken.for_user(user).access_token)
+
+    def _get(path, authenticated=True):
+        headers = {'Authorization': f'Bearer {token}'} if authenticated else {}
+        return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+    return _get
+
+
+@pytest.fixture
+def async_data(user, create_category, create_expense):
+    housing = create_category(name='Moradia')
+    create_category(name='Lazer')
+    create_expense(name='Luz', amount=80, due_date=date(2025, 7, 10), category_obj=housing)
+    create_expense(name='Água', amount=40, due_date=date(2025, 7, 2), category_obj=housing, paid=True)
+    rent = RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=31, category=housing, start_date=date(2025, 1, 1)
+    )
+    PaidRecurringExpense.objects.create(user=user, recurring_expense=rent, day=5, month=7, year=2025)
+
+
+@pytest.mark.django_db
+def test_afor_range_matches_for_range(user, async_data):
+    service = ExpenseListService(user)
+    expected = service.for_range((2025, 6), (2025, 8))
+    result = async_to_sync(service.afor_range)((2025, 6), (2025, 8))
+
+    assert [(e.id, e.due_date, e.paid) for e in result] == [
+        (e.id, e.due_date, e.paid) for e in expected
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'async_path, sync_path',
+    [
+        ('expenses/?year=2025&month=7', 'expenses/?year=2025&month=7'),
+        ('expenses/months/', 'expenses/months/'),
+        ('expenses/summary/?from=2025-01&to=2025-12', 'expenses/summary/?from=2025-01&to=2025-12'),
+        ('categories/', 'categories/'),
+    ],
+)
+def test_async_views_match_sync_views(auth_client, async_get, async_data, async_path, sync_path):
+    async_response = async_get(f'{ASYNC_URL}{async_path}')
+    sync_response = auth_client.get(f'/api/v1/finances/{sync_path}')
+
+    assert async_response.status_code == sync_response.status_code == HTTPStatus.OK
+    assert async_response['Content-Type'] == 'application/json'
+    assert async_response.content == sync_response.content
+
+
+@pytest.mark.django_db
+def test_async_views_require_authentication_and_validate(async_get):
+    assert async_get(f'{ASYNC_URL}categories/', authenticated=False).status_code == HTTPStatus.UNAUTHORIZED
+
+    response = async_get(f'{ASYNC_URL}expenses/?year=2025&month=13')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'error': 'Mês deve estar entre 1 e 12.'}
@@ -0,0 +1,82 @@
+import threading
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from finances.models import Category, Expense, PaidRecurringExpense, RecurringExpense
+from finances.services.rollup_service import RollupService
+
+THREADS = 8
+ROUNDS = 10
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='exercises the SQLite locking profile')
+@pytest.mark.django_db(transaction=True)
+def test_sqlite_profile_pragmas(file_database):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        assert cursor.fetchone()[0] == 'wal'
+        cursor.execute('PRAGMA synchronous')
+        assert cursor.fetchone()[0] == 1  # NORMAL
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_mark_paid_does_not_lock_or_drift(file_database, expenses_url):
+    user = User.objects.create_user(username='burst', password='12345678')
+    category = Category.objects.create(user=user, name='Contas')
+    expenses = Expense.objects.bulk_create(
+        Expense(user=user, name=f'Conta {i}', amount=10, due_date=date(2025, 7, 1 + i), category=category)
+        for i in range(THREADS)
+    )
+    RollupService(user).add_expenses(expenses)
+    rules = RecurringExpense.objects.bulk_create(
+        RecurringExpense(
+            user=user, name=f'Regra {i}', amount=5, due_day=5, category=category,
+            start_date=date(2025, 1, 1),
+        )
+        for i in range(THREADS)
+    )
+    token = str(RefreshToken.for_user(user).access_token)
+    errors = []
+    start = threading.Barrier(THREADS)
+
+    def hammer(index):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        # every thread touches a shared expense and rule plus its own
+        ids = [
+            {'type': 'e', 'id': expenses[0].id},
+            {'type': 'e', 'id': expenses[index].id},
+            {'type': 'r', 'id': rules[0].id},
+            {'type': 'r', 'id': rules[index].id},
+        ]
+        payload = {'ids': ids, 'month': 7, 'year': 2025}
+        try:
+            start.wait()
+            for round_ in range(ROUNDS):
+                path = 'mark-paid' if round_ % 2 == 0 or round_ == ROUNDS - 1 else 'unmark-paid'
+                response = client.post(f'{expenses_url}{path}/', payload, format='json')
+                if response.status_code != HTTPStatus.OK:
+                    errors.append((index, response.status_code, response.content))
+        except Exception as exc:  # noqa: BLE001 - surfaced through the assertion below
+            errors.append((index, exc))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=hammer, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert RollupService.diff([user.id]) == []
+    assert Expense.objects.filter(user=user, paid=True).exclude(id=expenses[0].id).count() == THREADS - 1
+    assert PaidRecurringExpense.objects.filter(user=user, month=7, year=2025).exclude(
+        recurring_expense=rules[0]
+    ).count() == THREADS - 1
@@ -0,0 +1,98 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from finances.models import RecurringExpense
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('path', ['?year=2025&month=7', 'months/'])
+def test_expense_endpoints_answer_not_modified(
+    auth_client, expenses_url, create_expense, django_assert_num_queries, path
+):
+    create_expense(due_date=date(2025, 7, 10))
+    first = auth_client.get(f'{expenses_url}{path}')
+    assert first.status_code == HTTPStatus.OK
+    assert first.has_header('ETag') and not first.has_header('Last-Modified')
+
+    # auth user + change marker, nothing from the listing service
+    with django_assert_num_queries(2):
+        second = auth_client.get(f'{expenses_url}{path}', HTTP_IF_NONE_MATCH=first['ETag'])
+
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_etag_changes_on_any_write(
+    auth_client, user, expenses_url, categories_url, create_expense, create_category
+):
+    url = f'{expenses_url}?year=2025&month=7'
+    category = create_category()
+    expense = create_expense(due_date=date(2025, 7, 10), category_obj=category)
+    etags = [auth_client.get(url)['ETag']]
+
+    auth_client.post(f'{expenses_url}mark-paid/', {'ids': [{'type': 'e', 'id': expense.id}]}, format='json')
+    etags.append(auth_client.get(url)['ETag'])
+
+    auth_client.patch(f'{categories_url}{category.id}/', {'name': 'Outra'}, format='json')
+    etags.append(auth_client.get(url)['ETag'])
+
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=category, start_date=date(2025, 1, 1)
+    )
+    etags.append(auth_client.get(url)['ETag'])
+
+    expense.delete()
+    etags.append(auth_client.get(url)['ETag'])
+
+    assert len(set(etags)) == len(etags)
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etags[0])
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_deletes_are_not_hidden_by_if_modified_since(
+    auth_client, expenses_url, create_expense, create_category
+):
+    url = f'{expenses_url}?year=2025&month=7'
+    category = create_category()
+    create_expense(name='Luz', due_date=date(2025, 7, 10), category_obj=category)
+    expense = create_expense(name='Água', due_date=date(2025, 7, 12), category_obj=category)
+    auth_client.get(url)
+
+    auth_client.delete(f'{expenses_url}{expense.id}/')
+    response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE='Sun, 18 Oct 2099 00:00:00 GMT')
+
+    assert response.status_code == HTTPStatus.OK
+    assert [e['name'] for e in response.data] == ['Luz']
+
+
+@pytest.mark.django_db
+def test_months_etag_moves_with_the_current_month(
+    auth_client, user, expenses_url, create_category, monkeypatch
+):
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=create_category(),
+        start_date=date(2025, 1, 1),
+    )
+    monkeypatch.setattr(timezone, 'localdate', lambda: date(2025, 7, 31))
+    first = auth_client.get(f'{expenses_url}months/')
+    assert first.data[0] == {'year': 2025, 'month': 7}
+
+    monkeypatch.setattr(timezone, 'localdate', lambda: date(2025, 8, 1))
+    response = auth_client.get(f'{expenses_url}months/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data[0] == {'year': 2025, 'month': 8}
+
+
+@pytest.mark.django_db
+def test_categories_list_answers_not_modified(auth_client, categories_url, create_category):
+    create_category()
+    first = auth_client.get(categories_url)
+
+    second = auth_client.get(categories_url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
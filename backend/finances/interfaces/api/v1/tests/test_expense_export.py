@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+
+from finances.models import PaidRecurringExpense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+
+
+@pytest.fixture
+def export_data(user, create_category, create_expense):
+    housing = create_category(name='Moradia')
+    create_expense(name='Luz', amount=80, due_date=date(2025, 1, 10), category_obj=housing)
+    create_expense(name='Água', amount=40, due_date=date(2025, 3, 5), category_obj=housing, paid=True)
+    create_expense(name='Fora', amount=10, due_date=date(2025, 5, 1), category_obj=housing)
+    rent = RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=housing, start_date=date(2024, 12, 1)
+    )
+    PaidRecurringExpense.objects.create(user=user, recurring_expense=rent, day=5, month=2, year=2025)
+    return rent
+
+
+def _content(response):
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_iter_range_matches_listing_order(user, export_data):
+    streamed = list(ExpenseListService(user).iter_range((2025, 1), (2025, 4), chunk_size=1))
+    listed = sorted(
+        ExpenseListService(user).for_range((2025, 1), (2025, 4)), key=lambda e: (e.due_date, e.id)
+    )
+    assert [(e.id, e.due_date, e.paid) for e in streamed] == [
+        (e.id, e.due_date, e.paid) for e in listed
+    ]
+
+
+@pytest.mark.django_db
+def test_export_csv(auth_client, expenses_url, export_data):
+    response = auth_client.get(f'{expenses_url}export/?from=2025-01&to=2025-03&format=csv')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    assert 'despesas-2025-01-2025-03.csv' in response['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+    assert [(r['name'], r['due_date'], r['paid']) for r in rows] == [
+        ('Aluguel', '2025-01-05', 'false'),
+        ('Luz', '2025-01-10', 'false'),
+        ('Aluguel', '2025-02-05', 'true'),
+        ('Aluguel', '2025-03-05', 'false'),
+        ('Água', '2025-03-05', 'true'),
+    ]
+    assert rows[0]['id'] == str(export_data.id)
+    assert rows[0]['is_recurring'] == 'true'
+    assert rows[1]['category'] == 'Moradia'
+    assert rows[1]['installment_origin'] == ''
+
+
+@pytest.mark.django_db
+def test_export_csv_without_rows_keeps_the_header(auth_client, expenses_url):
+    response = auth_client.get(f'{expenses_url}export/?from=2025-01&to=2025-03&format=csv')
+
+    assert response.status_code == HTTPStatus.OK
+    assert _content(response) == (
+        'id,name,amount,due_date,paid,category,installment_origin,is_recurring,is_installment\r\n'
+    )
+
+
+@pytest.mark.django_db
+def test_export_csv_escapes_formulas(auth_client, expenses_url, create_category, create_expense):
+    category = create_category(name='=HYPERLINK("http://x")')
+    create_expense(name='@SUM(A1:A2)', due_date=date(2025, 1, 10), category_obj=category)
+    create_expense(name='-1+2', due_date=date(2025, 1, 11), category_obj=category)
+
+    response = auth_client.get(f'{expenses_url}export/?from=2025-01&to=2025-01&format=csv')
+
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+    assert [(r['name'], r['category']) for r in rows] == [
+        ("'@SUM(A1:A2)", '\'=HYPERLINK("http://x")'),
+        ("'-1+2", '\'=HYPERLINK("http://x")'),
+    ]
+    assert rows[0]['amount'] == '100.00'
+
+
+@pytest.mark.django_db
+def test_export_ndjson(auth_client, expenses_url, export_data):
+    response = auth_client.get(f'{expenses_url}export/?from=2025-03&to=2025-03&format=ndjson')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == 'application/x-ndjson; charset=utf-8'
+    rows = [json.loads(line) for line in _content(response).splitlines()]
+    assert rows[1] == {
+        'id': rows[1]['id'],
+        'name': 'Água',
+        'amount': '40.00',
+        'due_date': '2025-03-05',
+        'paid': True,
+        'category': 'Moradia',
+        'installment_origin': None,
+        'is_recurring': False,
+        'is_installment': False,
+    }
+
+
+@pytest.mark.django_db
+def test_export_without_range_covers_the_whole_history(
+    auth_client, expenses_url, export_data, create_expense
+):
+    export_data.end_date = date(2025, 2, 28)
+    export_data.save()
+    create_expense(name='Antiga', amount=5, due_date=date(2009, 6, 1), category_obj=export_data.category)
+
+    response = auth_client.get(f'{expenses_url}export/?format=ndjson')
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'despesas-2009-06-2025-05.ndjson' in response['Content-Disposition']
+    rows = [json.loads(line) for line in _content(response).splitlines()]
+    assert [(r['name'], r['due_date']) for r in rows] == [
+        ('Antiga', '2009-06-01'),
+        ('Aluguel', '2024-12-05'),
+        ('Aluguel', '2025-01-05'),
+        ('Luz', '2025-01-10'),
+        ('Aluguel', '2025-02-05'),
+        ('Água', '2025-03-05'),
+        ('Fora', '2025-05-01'),
+    ]
+
+
+@pytest.mark.django_db
+def test_export_accepts_spans_longer_than_the_listing_cap(auth_client, expenses_url, export_data):
+    response = auth_client.get(f'{expenses_url}export/?from=2000-01&to=2025-01&format=ndjson')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(_content(response).splitlines()) == 3
+
+
+@pytest.mark.django_db
+def test_export_rejects_invalid_range(auth_client, expenses_url):
+    response = auth_client.get(f'{expenses_url}export/?from=2025-05&to=2025-01&format=ndjson')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert json.loads(response.content) == {'error': 'O início deve ser anterior ao fim.'}
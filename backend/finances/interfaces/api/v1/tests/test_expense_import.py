@@ -0,0 +1,125 @@
+import json
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from finances.models import Expense
+from finances.services.expense_import_service import ExpenseImportService
+
+
+@pytest.fixture
+def import_url(expenses_url):
+    return f'{expenses_url}import/'
+
+
+@pytest.mark.django_db
+def test_import_csv(auth_client, import_url, create_category):
+    category = create_category(name='Moradia')
+    body = (
+        'name,amount,due_date,paid,category\n'
+        'Luz,80.50,2025-07-10,true,Moradia\n'
+        f'Água,40,2025-07-12,false,{category.id}\n'
+        'Sem categoria,10,2025-07-13,,\n'
+        ',10,2025-07-14,false,Moradia\n'
+        'Internet,abc,2025-07-15,false,Moradia\n'
+        'Cinema,30,2025-07-16,false,Lazer\n'
+    )
+    response = auth_client.generic('POST', import_url, body, content_type='text/csv')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['created'] == 3
+    assert response.data['failed'] == 3
+    assert [error['row'] for error in response.data['errors']] == [4, 5, 6]
+    assert set(response.data['errors'][0]['errors']) == {'name'}
+    assert set(response.data['errors'][1]['errors']) == {'amount'}
+    assert response.data['errors'][2]['errors'] == {'category': 'Categoria não encontrada.'}
+
+    luz = Expense.objects.get(name='Luz')
+    assert luz.amount == Decimal('80.50') and luz.paid and luz.category == category
+    assert Expense.objects.get(name='Sem categoria').category is None
+
+
+@pytest.mark.django_db
+def test_import_ndjson(auth_client, import_url, create_category):
+    create_category(name='Moradia')
+    lines = [
+        json.dumps({'name': 'Aluguel', 'amount': '600', 'due_date': '2025-07-05', 'category': 'Moradia'}),
+        '',
+        '{invalido',
+    ]
+    response = auth_client.generic(
+        'POST', import_url, '\n'.join(lines), content_type='application/x-ndjson'
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['created'] == 1
+    assert response.data['errors'] == [{'row': 2, 'errors': {'non_field_errors': 'Linha inválida.'}}]
+
+
+@pytest.mark.django_db
+def test_import_multipart_file(auth_client, import_url):
+    upload = SimpleUploadedFile('extrato.csv', b'name,amount,due_date\nMercado,250,2025-07-20\n')
+    response = auth_client.post(import_url, {'file': upload}, format='multipart')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['created'] == 1
+    assert Expense.objects.get(name='Mercado').due_date == date(2025, 7, 20)
+
+
+@pytest.mark.django_db
+def test_import_multipart_matches_extension_case_insensitively(auth_client, import_url):
+    upload = SimpleUploadedFile('EXTRATO.CSV', b'name,amount,due_date\nMercado,250,2025-07-20\n')
+    response = auth_client.post(import_url, {'file': upload}, format='multipart')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['created'] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'body, content_type',
+    [
+        ('name,amount,due_date\nCafé,10,2025-07-20\n'.encode('latin-1'), 'text/csv'),
+        # longer than csv.field_size_limit()
+        (b'name,amount,due_date\n' + b'x' * 200_000 + b',10,2025-07-20\n', 'text/csv'),
+        ('{"name": "Café"}\n'.encode('latin-1'), 'application/x-ndjson'),
+    ],
+)
+def test_import_rejects_undecodable_bodies(auth_client, import_url, body, content_type):
+    response = auth_client.generic('POST', import_url, body, content_type=content_type)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'error' in response.data
+    assert not Expense.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_rejects_undecodable_upload(auth_client, import_url):
+    upload = SimpleUploadedFile('extrato.csv', 'name,amount,due_date\nCafé,10,2025-07-20\n'.encode('latin-1'))
+    response = auth_client.post(import_url, {'file': upload}, format='multipart')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.data == {'error': 'O arquivo deve estar codificado em UTF-8.'}
+
+
+@pytest.mark.django_db
+def test_import_queries_per_chunk_do_not_grow_with_rows(user, create_category):
+    create_category(name='Moradia')
+    rows = [
+        {'name': f'Despesa {i}', 'amount': '10', 'due_date': '2025-07-10', 'category': 'Moradia'}
+        for i in range(250)
+    ]
+    counts = []
+    for size in (50, 250):
+        with CaptureQueriesContext(connection) as ctx:
+            ExpenseImportService(user, chunk_size=50).run(rows[:size])
+        counts.append(len(ctx.captured_queries))
+
+    # the category lookup only happens for the first chunk, then inserts are per chunk
+    assert counts[1] - counts[0] < 250 - 50
+    assert Expense.objects.count() == 300
@@ -0,0 +1,39 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from finances.interfaces.api.v1.serializers import ExpenseSerializer, serialize_expense_list
+from finances.models import Expense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.installment_expense_service import InstallmentExpenseService
+
+
+@pytest.mark.django_db
+def test_fast_list_serializer_is_byte_identical(user, create_category, create_expense):
+    housing = create_category(name='Moradia')
+    leisure = create_category(name='Lazer')
+    create_expense(name='Luz', amount=Decimal('80.5'), due_date=date(2025, 7, 10), category_obj=housing)
+    create_expense(name='Água', amount=40, due_date=date(2025, 7, 12), category_obj=housing, paid=True)
+    Expense.objects.create(user=user, name='Avulsa', amount=15, due_date=date(2025, 7, 1))
+    InstallmentExpenseService(
+        user=user,
+        name='Geladeira',
+        total_amount=Decimal('1000.00'),
+        installments_quantity=3,
+        first_due_date=date(2025, 7, 20),
+        category_id=leisure.id,
+    ).create_installment_expense()
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=31, category=housing, start_date=date(2025, 1, 1)
+    )
+
+    expenses = ExpenseListService(user).for_range((2025, 7), (2025, 8))
+    expenses.append(Expense(id=999, user=user, name='Não salva', amount=7, due_date=date(2025, 8, 1)))
+    assert any(e.id < 0 for e in expenses)
+
+    renderer = JSONRenderer()
+    assert renderer.render(serialize_expense_list(expenses)) == renderer.render(
+        ExpenseSerializer(expenses, many=True).data
+    )
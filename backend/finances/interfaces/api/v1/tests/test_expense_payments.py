@@ -0,0 +1,95 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from finances.models import Category, Expense, PaidRecurringExpense, RecurringExpense
+
+
+@pytest.fixture
+def create_rules(user):
+    def _create_rules(quantity, owner=user):
+        category = Category.objects.create(user=owner, name=f'Recorrentes {owner.username}')
+        return RecurringExpense.objects.bulk_create(
+            RecurringExpense(
+                user=owner,
+                name=f'Recorrente {i}',
+                amount=10,
+                due_day=5,
+                category=category,
+                start_date=date(2025, 1, 1),
+            )
+            for i in range(quantity)
+        )
+    return _create_rules
+
+
+def _payload(rules, month=7, year=2025):
+    return {'ids': [{'type': 'r', 'id': rule.id} for rule in rules], 'month': month, 'year': year}
+
+
+@pytest.mark.django_db
+def test_mark_paid_query_count_does_not_grow_with_items(auth_client, expenses_url, create_rules):
+    rules = create_rules(100)
+    counts = []
+    for selected in (rules[:2], rules[2:]):
+        with CaptureQueriesContext(connection) as ctx:
+            response = auth_client.post(f'{expenses_url}mark-paid/', _payload(selected), format='json')
+        assert response.status_code == HTTPStatus.OK
+        counts.append(len(ctx.captured_queries))
+
+    assert counts[0] == counts[1]
+    assert PaidRecurringExpense.objects.filter(month=7, year=2025).count() == 100
+
+
+@pytest.mark.django_db
+def test_mark_paid_is_idempotent_and_unmark_deletes(auth_client, expenses_url, create_rules, create_expense):
+    rules = create_rules(3)
+    expense = create_expense(due_date=date(2025, 7, 10))
+    payload = _payload(rules)
+    payload['ids'].append({'type': 'e', 'id': expense.id})
+
+    auth_client.post(f'{expenses_url}mark-paid/', payload, format='json')
+    response = auth_client.post(f'{expenses_url}mark-paid/', payload, format='json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert PaidRecurringExpense.objects.count() == 3
+    expense.refresh_from_db()
+    assert expense.paid
+
+    response = auth_client.post(f'{expenses_url}unmark-paid/', payload, format='json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert not PaidRecurringExpense.objects.exists()
+    expense.refresh_from_db()
+    assert not expense.paid
+
+
+@pytest.mark.django_db
+def test_mark_paid_rejects_foreign_recurring_ids(auth_client, expenses_url, create_rules):
+    other = User.objects.create_user(username='maria', password='12345678')
+    own = create_rules(1)
+    foreign = create_rules(1, owner=other)
+
+    response = auth_client.post(f'{expenses_url}mark-paid/', _payload(own + foreign), format='json')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert not PaidRecurringExpense.objects.exists()
+
+
+@pytest.mark.django_db
+def test_mark_paid_rolls_back_concrete_changes_on_error(
+    auth_client, expenses_url, create_rules, create_expense
+):
+    other = User.objects.create_user(username='maria', password='12345678')
+    expense = create_expense(due_date=date(2025, 7, 10))
+    payload = _payload(create_rules(1, owner=other))
+    payload['ids'].append({'type': 'e', 'id': expense.id})
+
+    response = auth_client.post(f'{expenses_url}mark-paid/', payload, format='json')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert not Expense.objects.get(id=expense.id).paid
@@ -0,0 +1,148 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from finances.models import Expense, RecurringExpense
+from finances.services.expense_search_service import ExpenseSearchService
+
+
+@pytest.fixture
+def search_url(expenses_url):
+    return f'{expenses_url}search/'
+
+
+@pytest.fixture
+def search_data(user, create_category, create_expense):
+    streaming = create_category(name='Streaming')
+    housing = create_category(name='Moradia')
+    create_expense(name='Netflix', amount=40, due_date=date(2021, 3, 10), category_obj=streaming)
+    create_expense(name='NETFLIX família', amount=55, due_date=date(2024, 3, 10), category_obj=streaming, paid=True)
+    create_expense(name='Assinatura Netflix', amount=55, due_date=date(2024, 4, 10), category_obj=housing)
+    create_expense(name='Luz', amount=120, due_date=date(2024, 4, 15), category_obj=housing)
+    RecurringExpense.objects.create(
+        user=user, name='Netflix anual', amount=45, due_day=10, category=streaming,
+        start_date=date(2022, 1, 1),
+    )
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=900, due_day=5, category=housing, start_date=date(2022, 1, 1),
+    )
+    return streaming, housing
+
+
+@pytest.mark.django_db
+def test_search_matches_names_with_facets_and_rules(auth_client, search_url, search_data):
+    streaming, housing = search_data
+    response = auth_client.get(search_url, {'q': 'flix'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [e['name'] for e in response.data['results']] == [
+        'Netflix', 'NETFLIX família', 'Assinatura Netflix'
+    ]
+    assert response.data['next'] is None
+    assert response.data['facets'] == {
+        'categories': [
+            {'id': housing.id, 'name': 'Moradia', 'count': 1},
+            {'id': streaming.id, 'name': 'Streaming', 'count': 2},
+        ],
+        'months': [
+            {'year': 2024, 'month': 4, 'count': 1},
+            {'year': 2024, 'month': 3, 'count': 1},
+            {'year': 2021, 'month': 3, 'count': 1},
+        ],
+    }
+    assert [rule['name'] for rule in response.data['recurring']] == ['Netflix anual']
+
+
+@pytest.mark.django_db
+def test_search_combines_filters(auth_client, search_url, search_data):
+    streaming, _ = search_data
+    response = auth_client.get(
+        search_url,
+        {'q': 'netflix', 'category': streaming.id, 'min': '50', 'max': '60', 'paid': 'true',
+         'from': '2024-01', 'to': '2024-12'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [e['name'] for e in response.data['results']] == ['NETFLIX família']
+    assert response.data['recurring'] == []
+
+
+@pytest.mark.django_db
+def test_search_without_query_reads_facets_from_rollups(user, search_data, django_assert_num_queries):
+    _, housing = search_data
+    # results + category facet + month facet + rules
+    with django_assert_num_queries(4):
+        found = ExpenseSearchService(user).search(category_id=housing.id, start=(2024, 1))
+
+    assert [e.name for e in found['results']] == ['Assinatura Netflix', 'Luz']
+    assert found['facets']['months'] == [{'year': 2024, 'month': 4, 'count': 2}]
+    assert [rule.name for rule in found['recurring']] == ['Aluguel']
+
+
+@pytest.mark.django_db
+def test_search_is_keyset_paginated(auth_client, search_url, search_data):
+    first = auth_client.get(search_url, {'q': 'netflix', 'page_size': 2})
+    assert [e['name'] for e in first.data['results']] == ['Netflix', 'NETFLIX família']
+    assert 'facets' in first.data
+
+    second = auth_client.get(first.data['next'])
+    assert [e['name'] for e in second.data['results']] == ['Assinatura Netflix']
+    assert second.data['next'] is None
+    assert 'facets' not in second.data
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes(user, search_data):
+    service = ExpenseSearchService(user)
+    expense = Expense.objects.get(name='Luz')
+    expense.name = 'Conta de luz'
+    expense.save()
+    Expense.objects.filter(name='Netflix').delete()
+
+    assert [e.name for e in service.search(query='conta')['results']] == ['Conta de luz']
+    assert [e.name for e in service.search(query='netflix')['results']] == [
+        'NETFLIX família', 'Assinatura Netflix'
+    ]
+    # shorter than a trigram: falls back to a plain LIKE
+    assert [e.name for e in service.search(query='uz')['results']] == ['Conta de luz']
+
+
+@pytest.mark.django_db
+def test_fts_triggers_survive_migrations():
+    # Django remakes SQLite tables on most AlterField operations, dropping
+    # the triggers migration 0007 put on them
+    if connection.vendor != 'sqlite':
+        pytest.skip('FTS5 tables are SQLite specific.')
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tbl_name, name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = set(cursor.fetchall())
+
+    for table in (Expense._meta.db_table, RecurringExpense._meta.db_table):
+        for suffix in ('ai', 'ad', 'au'):
+            assert (table, f'{table}_fts_{suffix}') in triggers
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_to_user(auth_client, search_url, search_data):
+    other = User.objects.create_user(username='maria', password='12345678')
+    Expense.objects.create(user=other, name='Netflix da Maria', amount=30, due_date=date(2024, 1, 5))
+
+    response = auth_client.get(search_url, {'q': 'maria'})
+    assert response.data['results'] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'params',
+    [{'min': 'abc'}, {'paid': 'talvez'}, {'from': '2024-13'}, {'from': '2024-05', 'to': '2024-01'},
+     {'category': 'x'}],
+)
+def test_search_rejects_invalid_filters(auth_client, search_url, params):
+    response = auth_client.get(search_url, params)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'error' in response.data
@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+
+from finances.models import Expense, PaidRecurringExpense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.expense_summary_service import ExpenseSummaryService
+from finances.services.rollup_service import RollupService
+
+
+@pytest.fixture
+def summary_data(user, create_category, create_expense):
+    housing = create_category(name='Moradia')
+    leisure = create_category(name='Lazer')
+    create_expense(name='Luz', amount=80, due_date=date(2025, 6, 10), category_obj=housing)
+    create_expense(name='Água', amount=40, due_date=date(2025, 7, 10), category_obj=housing, paid=True)
+    create_expense(name='Cinema', amount=30, due_date=date(2025, 7, 25), category_obj=leisure)
+    Expense.objects.create(user=user, name='Avulsa', amount=15, due_date=date(2025, 7, 1), category=None)
+    RollupService(user).add_expenses(Expense.objects.filter(category=None))
+    rent = RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=housing, start_date=date(2025, 5, 1)
+    )
+    RecurringExpense.objects.create(
+        user=user,
+        name='Streaming',
+        amount=Decimal('39.90'),
+        due_day=20,
+        category=leisure,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 6, 30),
+    )
+    PaidRecurringExpense.objects.create(user=user, recurring_expense=rent, day=5, month=6, year=2025)
+    return housing, leisure
+
+
+@pytest.mark.django_db
+def test_summary_matches_expanded_listing(user, summary_data):
+    today = date(2025, 7, 15)
+    summary = ExpenseSummaryService(user, today=today).summarize((2025, 5), (2025, 8))
+    expenses = ExpenseListService(user).for_range((2025, 5), (2025, 8))
+
+    assert summary['total'] == sum(e.amount for e in expenses)
+    assert summary['paid'] == sum(e.amount for e in expenses if e.paid)
+    assert summary['unpaid'] == sum(e.amount for e in expenses if not e.paid)
+    assert summary['overdue'] == sum(
+        e.amount for e in expenses if not e.paid and e.due_date < today
+    )
+
+    by_category = {row['name']: row for row in summary['categories']}
+    assert by_category['Moradia']['total'] == Decimal('2520.00')
+    assert by_category['Lazer']['total'] == Decimal('109.80')
+    assert by_category[None]['total'] == Decimal('15.00')
+
+
+@pytest.mark.django_db
+def test_summary_endpoint(auth_client, expenses_url, summary_data, django_assert_num_queries):
+    # auth user + concrete aggregate + recurring aggregate
+    with django_assert_num_queries(3):
+        response = auth_client.get(f'{expenses_url}summary/?year=2025&month=7')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['total'] == '685.00'
+    assert response.data['paid'] == '40.00'
+    assert [row['name'] for row in response.data['categories']] == ['Lazer', 'Moradia', None]
+
+
+@pytest.mark.django_db
+def test_summary_endpoint_accepts_range(auth_client, expenses_url, summary_data):
+    response = auth_client.get(f'{expenses_url}summary/?from=2025-01&to=2025-12')
+
+    assert response.status_code == HTTPStatus.OK
+    assert Decimal(response.data['total']) == Decimal('4800.00') + Decimal('165.00') + Decimal('239.40')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', ['from=0-01&to=0-02', 'year=0&month=1', 'year=10000&month=1'])
+def test_summary_rejects_years_out_of_range(auth_client, expenses_url, query):
+    response = auth_client.get(f'{expenses_url}summary/?{query}')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'error' in response.data
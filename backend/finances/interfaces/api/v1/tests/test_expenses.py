@@ -2,8 +2,10 @@ from datetime import date
 from http import HTTPStatus
 
 import pytest
+from django.contrib.auth.models import User
 
-from finances.models import Expense
+from finances.models import Expense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
 
 
 @pytest.mark.django_db
@@ -39,6 +41,19 @@ def test_expense_not_found(auth_client, expenses_url):
     assert response.status_code == HTTPStatus.NOT_FOUND
 
 
+@pytest.mark.django_db
+def test_expenses_of_another_user_are_not_found(auth_client, expenses_url):
+    other = User.objects.create_user(username='maria', password='12345678')
+    expense = Expense.objects.create(user=other, name='Luz', amount=80, due_date=date(2025, 7, 10))
+
+    assert auth_client.get(f'{expenses_url}{expense.id}/').status_code == HTTPStatus.NOT_FOUND
+    response = auth_client.patch(f'{expenses_url}{expense.id}/', {'name': 'Invadido'}, format='json')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert auth_client.delete(f'{expenses_url}{expense.id}/').status_code == HTTPStatus.NOT_FOUND
+    expense.refresh_from_db()
+    assert expense.name == 'Luz'
+
+
 @pytest.mark.django_db
 def test_create_expense(auth_client, expenses_url, create_category):
     category = create_category(name='Moradia')
@@ -88,3 +103,130 @@ def test_update_expense(auth_client, expenses_url, create_category, create_expen
     assert response.status_code == HTTPStatus.OK
     assert response.data['name'] == new_name
     assert float(response.data['amount']) == 160.00
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('rows', [1, 30])
+def test_list_expenses_query_count_is_constant(
+    auth_client, expenses_url, user, create_category, django_assert_num_queries, rows
+):
+    for i in range(rows):
+        category = create_category(name=f'Categoria {i}')
+        Expense.objects.create(
+            user=user, name=f'Despesa {i}', amount=10, due_date=date(2025, 7, 10), category=category
+        )
+        RecurringExpense.objects.create(
+            user=user,
+            name=f'Recorrente {i}',
+            amount=20,
+            due_day=15,
+            category=category,
+            start_date=date(2025, 1, 1),
+        )
+
+    # auth user + change marker + concrete expenses + recurring rules + paid map
+    with django_assert_num_queries(5):
+        response = auth_client.get(f'{expenses_url}?year=2025&month=7')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.data) == rows * 2
+
+
+@pytest.mark.django_db
+def test_list_expenses_keyset_pagination(auth_client, expenses_url, user, create_category):
+    category = create_category(name='Moradia')
+    for day in (3, 10, 10, 20):
+        Expense.objects.create(
+            user=user, name=f'Dia {day}', amount=10, due_date=date(2025, 7, day), category=category
+        )
+    RecurringExpense.objects.create(
+        user=user, name='Academia', amount=90, due_day=10, category=category, start_date=date(2025, 1, 1)
+    )
+    full = auth_client.get(f'{expenses_url}?year=2025&month=7').data
+
+    seen = []
+    url = f'{expenses_url}?year=2025&month=7&page_size=2'
+    while url:
+        response = auth_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.data['results']) <= 2
+        seen.extend(response.data['results'])
+        url = response.data['next']
+
+    assert len(seen) == len(full) == 5
+    assert [e['due_date'] for e in seen] == sorted(e['due_date'] for e in seen)
+    assert {(e['id'], e['is_recurring']) for e in seen} == {(e['id'], e['is_recurring']) for e in full}
+    assert all('is_installment' in e for e in seen)
+
+
+@pytest.mark.django_db
+def test_list_expenses_invalid_cursor(auth_client, expenses_url):
+    response = auth_client.get(f'{expenses_url}?year=2025&month=7&cursor=invalido')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('to', ['2025-01', '2025-12'])
+def test_list_expenses_range_query_count_is_constant(
+    auth_client, expenses_url, user, create_category, django_assert_num_queries, to
+):
+    category = create_category(name='Moradia')
+    for month in range(1, 13):
+        Expense.objects.create(
+            user=user, name=f'Luz {month}', amount=80, due_date=date(2025, month, 10), category=category
+        )
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=31, category=category, start_date=date(2025, 1, 1)
+    )
+
+    with django_assert_num_queries(4):
+        response = auth_client.get(f'{expenses_url}range/?from=2025-01&to={to}')
+
+    months = int(to[-2:])
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.data) == months * 2
+    assert [e['due_date'] for e in response.data] == sorted(e['due_date'] for e in response.data)
+    assert {e['due_date'] for e in response.data if e['is_recurring']} >= {'2025-01-31'}
+    if months == 12:
+        assert '2025-02-28' in {e['due_date'] for e in response.data if e['is_recurring']}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'query',
+    ['', '?from=2025-01', '?from=2025-13&to=2025-12', '?from=2025-06&to=2025-01', '?from=0-01&to=0-02'],
+)
+def test_list_expenses_range_invalid_params(auth_client, expenses_url, query):
+    response = auth_client.get(f'{expenses_url}range/{query}')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_available_months_includes_unpaid_recurring_months(
+    user, create_category, create_expense, django_assert_num_queries
+):
+    category = create_category(name='Moradia')
+    create_expense(due_date=date(2024, 11, 10), category_obj=category)
+    create_expense(due_date=date(2024, 11, 20), category_obj=category)
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=category,
+        start_date=date(2025, 1, 1), end_date=date(2025, 2, 28),
+    )
+    RecurringExpense.objects.create(
+        user=user, name='Internet', amount=100, due_day=5, category=category, start_date=date(2025, 2, 1)
+    )
+    RecurringExpense.objects.create(
+        user=user, name='Inativa', amount=100, due_day=5, category=category,
+        start_date=date(2020, 1, 1), active=False,
+    )
+
+    with django_assert_num_queries(3):
+        months = ExpenseListService(user).available_months(today=date(2025, 4, 15))
+
+    assert months == [
+        {'month': 4, 'year': 2025},
+        {'month': 3, 'year': 2025},
+        {'month': 2, 'year': 2025},
+        {'month': 1, 'year': 2025},
+        {'month': 11, 'year': 2024},
+    ]
@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from finances.models import PaidRecurringExpense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.forecast_service import ForecastService
+from finances.services.installment_expense_service import InstallmentExpenseService
+
+
+@pytest.fixture
+def forecast_url():
+    return '/api/v1/finances/forecast/'
+
+
+@pytest.mark.django_db
+def test_forecast_matches_expanded_listing(user, create_category, create_expense):
+    housing = create_category(name='Moradia')
+    leisure = create_category(name='Lazer')
+    create_expense(name='IPTU', amount=300, due_date=date(2025, 9, 10), category_obj=housing)
+    create_expense(name='Show', amount=120, due_date=date(2025, 7, 2), category_obj=leisure, paid=True)
+    InstallmentExpenseService(
+        user=user,
+        name='Notebook',
+        total_amount=Decimal('3000.00'),
+        installments_quantity=10,
+        first_due_date=date(2025, 5, 20),
+        category_id=leisure.id,
+    ).create_installment_expense()
+    rent = RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=housing, start_date=date(2024, 1, 1)
+    )
+    RecurringExpense.objects.create(
+        user=user, name='Curso', amount=Decimal('199.90'), due_day=15, category=leisure,
+        start_date=date(2025, 8, 1), end_date=date(2025, 11, 30),
+    )
+    PaidRecurringExpense.objects.create(user=user, recurring_expense=rent, day=5, month=7, year=2025)
+    PaidRecurringExpense.objects.create(user=user, recurring_expense=rent, day=5, month=6, year=2025)
+
+    forecast = ForecastService(user, today=date(2025, 7, 15)).forecast(12)
+
+    assert len(forecast['months']) == 12
+    for row in forecast['months']:
+        year, month = row['year'], row['month']
+        expenses = ExpenseListService(user).for_range((year, month), (year, month))
+        assert row['total'] == sum((e.amount for e in expenses), Decimal('0'))
+        assert row['paid'] == sum((e.amount for e in expenses if e.paid), Decimal('0'))
+        by_category = {c['name']: c['total'] for c in row['categories']}
+        for name in ('Moradia', 'Lazer'):
+            expected = sum(
+                (e.amount for e in expenses if e.category and e.category.name == name), Decimal('0')
+            )
+            assert by_category.get(name, Decimal('0')) == expected
+    assert forecast['total'] == sum(row['total'] for row in forecast['months'])
+
+
+@pytest.mark.django_db
+def test_forecast_endpoint_is_cached_until_next_write(
+    auth_client, user, forecast_url, expenses_url, create_category, django_assert_num_queries
+):
+    category = create_category(name='Moradia')
+    today = timezone.localdate()
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=category, start_date=date(2020, 1, 1)
+    )
+
+    # auth user + change marker + rollups + rules + paid records
+    with django_assert_num_queries(5):
+        response = auth_client.get(f'{forecast_url}?months=60')
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.data['months']) == 60
+    assert response.data['total'] == '36000.00'
+
+    with django_assert_num_queries(2):
+        assert auth_client.get(f'{forecast_url}?months=60').data == response.data
+
+    payload = {'name': 'Luz', 'amount': 80, 'due_date': today.isoformat(), 'category_id': category.id}
+    auth_client.post(expenses_url, payload, format='json')
+
+    response = auth_client.get(f'{forecast_url}?months=60')
+    assert response.data['total'] == '36080.00'
+    assert response.data['months'][0]['categories'] == [
+        {'id': category.id, 'name': 'Moradia', 'total': '680.00'}
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('months', ['0', '121', 'abc'])
+def test_forecast_rejects_invalid_months(auth_client, forecast_url, months):
+    response = auth_client.get(f'{forecast_url}?months={months}')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
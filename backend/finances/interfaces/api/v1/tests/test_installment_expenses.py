@@ -0,0 +1,216 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from finances.models import Category, Expense, InstallmentExpense
+from finances.services.installment_expense_service import InstallmentExpenseService
+from finances.services.installment_plan_service import InstallmentPlanService
+from finances.services.rollup_service import RollupService
+
+
+def _create_plan(user, category, quantity, total_amount=Decimal('100.00')):
+    return InstallmentExpenseService(
+        user=user,
+        name='Notebook',
+        total_amount=total_amount,
+        installments_quantity=quantity,
+        first_due_date=date(2025, 1, 31),
+        category_id=category.id,
+    ).create_installment_expense()
+
+
+@pytest.mark.django_db
+def test_installments_sum_to_total_with_remainder_on_last(user, create_category):
+    plan = _create_plan(user, create_category(), quantity=3)
+
+    expenses = list(plan.expenses.order_by('due_date'))
+    assert [e.amount for e in expenses] == [Decimal('33.33'), Decimal('33.33'), Decimal('33.34')]
+    assert sum(e.amount for e in expenses) == plan.total_amount
+    assert [e.due_date for e in expenses] == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)]
+    assert expenses[-1].name == 'Notebook (3/3)'
+
+
+@pytest.mark.django_db
+def test_installments_query_count_does_not_grow_with_quantity(user, create_category):
+    counts = []
+    for quantity in (2, 48):
+        category = create_category(name=f'Categoria {quantity}')
+        with CaptureQueriesContext(connection) as ctx:
+            _create_plan(user, category, quantity=quantity)
+        counts.append(len(ctx.captured_queries))
+
+    assert counts[0] == counts[1]
+    assert Expense.objects.filter(installment_origin__isnull=False).count() == 50
+
+
+@pytest.mark.django_db
+def test_create_installment_expense_endpoint(auth_client, installment_expenses_url, create_category):
+    category = create_category()
+    payload = {
+        'name': 'Geladeira',
+        'total_amount': '1000.00',
+        'installments_quantity': 12,
+        'first_due_date': '2025-07-10',
+        'category_id': category.id,
+    }
+    response = auth_client.post(installment_expenses_url, payload, format='json')
+
+    assert response.status_code == HTTPStatus.CREATED
+    plan = InstallmentExpense.objects.get(name='Geladeira')
+    assert plan.expenses.count() == 12
+    assert sum(e.amount for e in plan.expenses.all()) == Decimal('1000.00')
+
+
+@pytest.mark.django_db
+def test_create_installment_expense_rejects_zero_installments(
+    auth_client, installment_expenses_url, create_category
+):
+    payload = {
+        'name': 'Geladeira',
+        'total_amount': '1000.00',
+        'installments_quantity': 0,
+        'first_due_date': '2025-07-10',
+        'category_id': create_category().id,
+    }
+    response = auth_client.post(installment_expenses_url, payload, format='json')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert not InstallmentExpense.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_delete_installment_plans(auth_client, installment_expenses_url, user, create_category):
+    category = create_category()
+    plans = [_create_plan(user, category, quantity=quantity) for quantity in (3, 12)]
+    kept = _create_plan(user, category, quantity=2)
+
+    response = auth_client.post(
+        f'{installment_expenses_url}bulk-delete/', {'ids': [p.id for p in plans]}, format='json'
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data == {'deleted_plans': 2, 'deleted_expenses': 15}
+    assert list(InstallmentExpense.objects.values_list('id', flat=True)) == [kept.id]
+    assert Expense.objects.count() == 2
+    assert RollupService.diff([user.id]) == []
+
+
+@pytest.mark.django_db
+def test_bulk_delete_is_atomic_when_a_plan_is_not_owned(
+    auth_client, installment_expenses_url, user, create_category
+):
+    plan = _create_plan(user, create_category(), quantity=3)
+    other = User.objects.create_user(username='outro', password='12345678')
+    foreign = _create_plan(other, Category.objects.create(user=other, name='Outra'), quantity=3)
+
+    response = auth_client.post(
+        f'{installment_expenses_url}bulk-delete/', {'ids': [plan.id, foreign.id]}, format='json'
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.data == {'error': 'Parcelamento não encontrado.'}
+    assert InstallmentExpense.objects.count() == 2
+    assert Expense.objects.count() == 6
+
+
+@pytest.mark.django_db
+def test_bulk_delete_query_count_does_not_grow(user, create_category):
+    counts = []
+    for plans, quantity in ((1, 2), (10, 48)):
+        category = create_category(name=f'Categoria {plans}')
+        ids = [_create_plan(user, category, quantity=quantity).id for _ in range(plans)]
+        with CaptureQueriesContext(connection) as ctx:
+            InstallmentPlanService(user).delete_plans(ids)
+        counts.append(len(ctx.captured_queries))
+
+    assert counts[0] == counts[1]
+    assert Expense.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('quantity', [4, 6, 8])
+def test_update_plan_diffs_schedule_and_keeps_paid(
+    auth_client, installment_expenses_url, user, create_category, quantity
+):
+    category = create_category()
+    plan = _create_plan(user, category, quantity=6, total_amount=Decimal('600.00'))
+    first_two = list(plan.expenses.order_by('due_date').values_list('id', flat=True)[:2])
+    Expense.objects.filter(id__in=first_two).update(paid=True)
+    RollupService.rebuild([user.id])
+
+    payload = {
+        'name': 'Notebook novo',
+        'total_amount': '1000.00',
+        'installments_quantity': quantity,
+        'first_due_date': '2025-01-31',
+        'category_id': category.id,
+    }
+    response = auth_client.put(f'{installment_expenses_url}{plan.id}/', payload, format='json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['installments_quantity'] == quantity
+    expenses = list(plan.expenses.order_by('due_date'))
+    assert len(expenses) == quantity
+    assert sum(e.amount for e in expenses) == Decimal('1000.00')
+    assert [e.name for e in expenses] == [f'Notebook novo ({i}/{quantity})' for i in range(1, quantity + 1)]
+    assert [e.id for e in expenses[:2]] == first_two
+    assert [e.paid for e in expenses] == [True, True] + [False] * (quantity - 2)
+    assert expenses[1].due_date == date(2025, 2, 28)
+    assert RollupService.diff([user.id]) == []
+
+
+@pytest.mark.django_db
+def test_update_plan_moves_dates_and_category(auth_client, installment_expenses_url, user, create_category):
+    plan = _create_plan(user, create_category(), quantity=3)
+    other = create_category(name='Eletrônicos')
+
+    response = auth_client.patch(
+        f'{installment_expenses_url}{plan.id}/',
+        {'first_due_date': '2025-03-10', 'category_id': other.id},
+        format='json',
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    expenses = list(plan.expenses.order_by('due_date'))
+    assert [e.due_date for e in expenses] == [date(2025, 3, 10), date(2025, 4, 10), date(2025, 5, 10)]
+    assert {e.category_id for e in expenses} == {other.id}
+    assert RollupService.diff([user.id]) == []
+
+
+@pytest.mark.django_db
+def test_update_plan_rejects_foreign_category(auth_client, installment_expenses_url, user, create_category):
+    plan = _create_plan(user, create_category(), quantity=3)
+    other = User.objects.create_user(username='outro', password='12345678')
+    foreign = Category.objects.create(user=other, name='Outra')
+
+    response = auth_client.patch(
+        f'{installment_expenses_url}{plan.id}/', {'category_id': foreign.id}, format='json'
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    plan.refresh_from_db()
+    assert plan.category_id != foreign.id
+
+
+@pytest.mark.django_db
+def test_update_plan_of_another_user_is_not_found(auth_client, installment_expenses_url, user, create_category):
+    other = User.objects.create_user(username='outro', password='12345678')
+    plan = _create_plan(other, Category.objects.create(user=other, name='Outra'), quantity=3)
+
+    response = auth_client.patch(
+        f'{installment_expenses_url}{plan.id}/',
+        {'name': 'Invadido', 'category_id': create_category().id},
+        format='json',
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert set(plan.expenses.values_list('user_id', flat=True)) == {other.id}
+    with pytest.raises(ValueError):
+        InstallmentPlanService(user).update_plan(plan, name='Invadido')
+    plan.refresh_from_db()
+    assert plan.name != 'Invadido'
@@ -0,0 +1,216 @@
+import datetime
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connections
+from django.utils import timezone
+
+from finances.models import Category, Expense, InstallmentExpense, Job
+from finances.services.expense_import_service import ExpenseImportService
+from finances.services.job_service import JobRunner, JobService
+
+
+@pytest.fixture
+def jobs_url():
+    return '/api/v1/finances/jobs/'
+
+
+@pytest.fixture
+def small_inline_limits(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.FINANCES_JOBS = {
+        **settings.FINANCES_JOBS, 'INLINE_IMPORT_ROWS': 2, 'INLINE_INSTALLMENTS': 3
+    }
+
+
+def _import(client, expenses_url, count):
+    body = 'name,amount,due_date\n' + ''.join(f'Conta {i},10.00,2025-07-10\n' for i in range(count))
+    return client.generic('POST', f'{expenses_url}import/', body, content_type='text/csv')
+
+
+@pytest.mark.django_db
+def test_small_import_still_runs_inline(auth_client, expenses_url, small_inline_limits):
+    response = _import(auth_client, expenses_url, 2)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['created'] == 2
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_large_import_is_queued_and_polled(
+    auth_client, user, expenses_url, jobs_url, small_inline_limits
+):
+    response = _import(auth_client, expenses_url, 5)
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.data['status'] == 'pending'
+    assert response.data['total'] == 5
+    assert response['Location'].endswith(f'{jobs_url}{response.data["id"]}/')
+    assert not Expense.objects.exists()
+    spooled = Job.objects.get(pk=response.data['id']).payload['file']
+    assert len(list(ExpenseImportService.iter_spooled(spooled))) == 5
+
+    JobRunner().run_next()
+
+    polled = auth_client.get(f'{jobs_url}{response.data["id"]}/')
+    assert polled.data['status'] == 'succeeded'
+    assert polled.data['progress'] == 5
+    assert polled.data['result'] == {'created': 5, 'failed': 0, 'errors': []}
+    assert Expense.objects.filter(user=user).count() == 5
+    assert not default_storage.exists(spooled)
+
+
+@pytest.mark.django_db
+def test_large_installment_plan_is_queued(
+    auth_client, user, installment_expenses_url, create_category, small_inline_limits
+):
+    payload = {
+        'name': 'Geladeira',
+        'total_amount': '1200.00',
+        'installments_quantity': 12,
+        'first_due_date': '2025-08-10',
+        'category_id': create_category(name='Casa').id,
+    }
+    response = auth_client.post(installment_expenses_url, payload, format='json')
+    assert response.status_code == HTTPStatus.ACCEPTED
+
+    job = JobRunner().run_next()
+    job.refresh_from_db()
+    plan = InstallmentExpense.objects.get(user=user)
+    assert job.result == {'id': plan.id}
+    assert plan.expenses.count() == 12
+
+    foreign = Category.objects.create(
+        user=User.objects.create_user(username='maria', password='12345678'), name='Outra'
+    )
+    response = auth_client.post(
+        installment_expenses_url, {**payload, 'category_id': foreign.id}, format='json'
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_claims_respect_per_user_concurrency(user, settings):
+    settings.FINANCES_JOBS = {**settings.FINANCES_JOBS, 'MAX_RUNNING_PER_USER': 1}
+    other = User.objects.create_user(username='maria', password='12345678')
+    first = JobService(user).enqueue('rebuild_rollups', {})
+    JobService(user).enqueue('rebuild_rollups', {})
+    theirs = JobService(other).enqueue('rebuild_rollups', {})
+
+    runner = JobRunner()
+    assert runner.claim().pk == first.pk
+    assert runner.claim().pk == theirs.pk
+    assert runner.claim() is None
+
+    first.refresh_from_db()
+    assert (first.status, first.attempts) == ('running', 1)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_limits_hold_under_concurrent_enqueues_and_claims(file_database, settings):
+    settings.FINANCES_JOBS = {
+        **settings.FINANCES_JOBS, 'MAX_PENDING_PER_USER': 3, 'MAX_RUNNING_PER_USER': 1
+    }
+    users = [User.objects.create_user(username=f'fila{i}', password='12345678') for i in range(2)]
+    threads = 8
+    start = threading.Barrier(threads)
+    rejected = []
+
+    def in_threads(target):
+        def run(index):
+            try:
+                start.wait()
+                target(index)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def enqueue(index):
+        try:
+            JobService(users[index % 2]).enqueue('rebuild_rollups', {})
+        except ValueError:
+            rejected.append(index)
+
+    in_threads(enqueue)
+    in_threads(lambda index: JobRunner().claim())
+
+    assert len(rejected) == 2
+    for user in users:
+        assert Job.objects.filter(user=user).count() == 3
+        assert Job.objects.filter(user=user, status='running').count() == 1
+
+
+@pytest.mark.django_db
+def test_pending_limit_answers_429(auth_client, user, expenses_url, settings, small_inline_limits):
+    settings.FINANCES_JOBS = {**settings.FINANCES_JOBS, 'MAX_PENDING_PER_USER': 1}
+    JobService(user).enqueue('rebuild_rollups', {})
+
+    response = _import(auth_client, expenses_url, 5)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert 'error' in response.data
+    assert default_storage.listdir('imports')[1] == []
+
+
+@pytest.mark.django_db
+def test_failures_are_recorded(user, create_category):
+    category = create_category(name='Casa')
+    job = JobService(user).enqueue(
+        'create_installments',
+        {
+            'name': 'Sofá', 'total_amount': '900.00', 'installments_quantity': 3,
+            'first_due_date': '2025-08-10', 'category_id': category.id,
+        },
+    )
+    category.delete()
+
+    JobRunner().run_next()
+
+    job.refresh_from_db()
+    assert job.status == 'failed'
+    assert job.error == 'Categoria não encontrada.'
+
+
+@pytest.mark.django_db
+def test_stale_jobs_are_requeued_or_failed(user):
+    rebuild = JobService(user).enqueue('rebuild_rollups', {})
+    plan = JobService(user).enqueue('create_installments', {})
+    Job.objects.update(
+        status=Job.Status.RUNNING, updated_at=timezone.now() - datetime.timedelta(hours=1)
+    )
+
+    assert JobRunner.recover_stale(stale_after=60) == 2
+
+    rebuild.refresh_from_db()
+    plan.refresh_from_db()
+    assert rebuild.status == 'pending'
+    assert (plan.status, plan.error) == ('failed', 'Tarefa interrompida.')
+
+
+@pytest.mark.django_db
+def test_jobs_are_private(auth_client, jobs_url):
+    other = User.objects.create_user(username='maria', password='12345678')
+    job = JobService(other).enqueue('rebuild_rollups', {})
+
+    assert auth_client.get(f'{jobs_url}{job.pk}/').status_code == HTTPStatus.NOT_FOUND
+    assert auth_client.get(jobs_url).data == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_command_drains_queue_with_threads(file_database):
+    users = [User.objects.create_user(username=f'worker{i}', password='12345678') for i in range(4)]
+    jobs = [JobService(user).enqueue('rebuild_rollups', {}) for user in users for _ in range(2)]
+
+    call_command('run_jobs', once=True, threads=3, poll_interval=0.01)
+
+    assert Job.objects.filter(pk__in=[job.pk for job in jobs], status='succeeded').count() == 8
@@ -0,0 +1,82 @@
+import json
+import logging
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from finances.services.metrics_service import get_metrics_registry
+
+METRICS_ON = {'ENABLED': True, 'TOKEN': 's3cret'}
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    get_metrics_registry().clear()
+    yield
+    get_metrics_registry().clear()
+
+
+@pytest.fixture
+def metrics_log(caplog):
+    logger = logging.getLogger('finances.metrics')
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger='finances.metrics')
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+def test_request_metrics_are_reported(auth_client, expenses_url, create_expense, metrics_log):
+    create_expense(due_date=date(2025, 7, 10))
+
+    with override_settings(FINANCES_METRICS=METRICS_ON):
+        response = auth_client.get(f'{expenses_url}?year=2025&month=7')
+        metrics = APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+
+    assert response.status_code == HTTPStatus.OK
+    timing = response['Server-Timing']
+    assert 'sql;desc="5 queries";dur=' in timing
+    assert 'serialize;dur=' in timing and 'total;dur=' in timing
+
+    line = json.loads(metrics_log.records[0].getMessage())
+    assert line['view'] == 'ExpenseViewSet.list'
+    assert (line['status'], line['sql_count']) == (200, 5)
+
+    assert metrics.status_code == HTTPStatus.OK
+    body = metrics.content.decode()
+    assert 'finances_request_sql_queries_bucket{view="ExpenseViewSet.list",le="5"} 1' in body
+    assert 'finances_request_duration_seconds_count{view="ExpenseViewSet.list"} 1' in body
+    assert 'finances_month_cache_misses_total 1' in body
+
+
+@pytest.mark.django_db
+def test_metrics_are_off_by_default(auth_client, expenses_url):
+    response = auth_client.get(f'{expenses_url}?year=2025&month=7')
+
+    assert 'Server-Timing' not in response
+    assert APIClient().get('/metrics').status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_token_or_staff(client):
+    with override_settings(FINANCES_METRICS=METRICS_ON):
+        assert client.get('/metrics').status_code == HTTPStatus.FORBIDDEN
+        assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer errado').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        client.force_login(User.objects.create_user(username='ana', password='12345678'))
+        assert client.get('/metrics').status_code == HTTPStatus.FORBIDDEN
+        client.force_login(
+            User.objects.create_user(username='admin', password='12345678', is_staff=True)
+        )
+        assert client.get('/metrics').status_code == HTTPStatus.OK
+
+    client.logout()
+    with override_settings(FINANCES_METRICS={**METRICS_ON, 'TOKEN': ''}):
+        assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
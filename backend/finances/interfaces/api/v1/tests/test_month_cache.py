@@ -0,0 +1,111 @@
+from datetime import date
+
+import pytest
+from django.core.cache import caches
+
+from finances.models import Expense, RecurringExpense
+from finances.services.month_cache_service import (
+    DjangoMonthCacheBackend,
+    MonthCacheService,
+    get_month_cache,
+)
+
+
+@pytest.fixture
+def month_url(expenses_url):
+    return f'{expenses_url}?year=2025&month=7'
+
+
+@pytest.mark.django_db
+def test_month_listing_is_served_from_cache(auth_client, month_url, create_expense, django_assert_num_queries):
+    create_expense(name='Internet', due_date=date(2025, 7, 10))
+    auth_client.get(month_url)
+
+    # only the JWT user lookup and the change marker remain
+    with django_assert_num_queries(2):
+        response = auth_client.get(month_url)
+
+    assert response.data[0]['name'] == 'Internet'
+    assert get_month_cache().stats() == {'hits': 1, 'misses': 1}
+
+
+@pytest.mark.django_db
+def test_expense_writes_invalidate_affected_months(auth_client, expenses_url, month_url, create_category):
+    category = create_category()
+    august_url = f'{expenses_url}?year=2025&month=8'
+    assert auth_client.get(month_url).data == []
+    assert auth_client.get(august_url).data == []
+
+    payload = {'name': 'Luz', 'amount': 80, 'due_date': '2025-07-10', 'category_id': category.id}
+    auth_client.post(expenses_url, payload, format='json')
+    expense_id = Expense.objects.get(name='Luz').id
+    assert [e['name'] for e in auth_client.get(month_url).data] == ['Luz']
+
+    payload['due_date'] = '2025-08-10'
+    auth_client.put(f'{expenses_url}{expense_id}/', payload, format='json')
+    assert auth_client.get(month_url).data == []
+    assert [e['name'] for e in auth_client.get(august_url).data] == ['Luz']
+
+    auth_client.post(
+        f'{expenses_url}mark-paid/', {'ids': [{'type': 'e', 'id': expense_id}]}, format='json'
+    )
+    assert auth_client.get(august_url).data[0]['paid'] is True
+
+    auth_client.delete(f'{expenses_url}{expense_id}/')
+    assert auth_client.get(august_url).data == []
+
+
+@pytest.mark.django_db
+def test_recurring_and_category_writes_invalidate_user(
+    auth_client, user, month_url, categories_url, recurring_expenses_url, create_category
+):
+    category = create_category(name='Moradia')
+    rule = RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=category, start_date=date(2025, 1, 1)
+    )
+    assert auth_client.get(month_url).data[0]['category']['name'] == 'Moradia'
+
+    auth_client.patch(f'{categories_url}{category.id}/', {'name': 'Casa'}, format='json')
+    assert auth_client.get(month_url).data[0]['category']['name'] == 'Casa'
+
+    # amount edits only apply from the current month on; the name shows everywhere
+    auth_client.patch(f'{recurring_expenses_url}{rule.id}/', {'name': 'Aluguel novo'}, format='json')
+    assert auth_client.get(month_url).data[0]['name'] == 'Aluguel novo'
+
+
+def test_django_backend_versions_are_shared(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    first = MonthCacheService(DjangoMonthCacheBackend())
+    second = MonthCacheService(DjangoMonthCacheBackend())
+    first.clear()
+
+    assert first.get_or_build(1, 2025, 7, lambda: ['cached']) == ['cached']
+    assert second.get_or_build(1, 2025, 7, lambda: ['rebuilt']) == ['cached']
+
+    second.invalidate_months(1, [(2025, 7)])
+    assert first.get_or_build(1, 2025, 7, lambda: ['rebuilt']) == ['rebuilt']
+
+
+@pytest.mark.django_db
+def test_marker_keeps_other_processes_from_serving_stale_months(
+    auth_client, expenses_url, month_url, create_expense
+):
+    expense = create_expense(name='Internet', due_date=date(2025, 7, 10))
+    assert [e['name'] for e in auth_client.get(month_url).data] == ['Internet']
+
+    # a write made by another worker: this process's version counters never move
+    Expense.objects.filter(pk=expense.pk).delete()
+
+    assert auth_client.get(month_url).data == []
+
+
+def test_clear_leaves_the_rest_of_the_cache_alone(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    service = MonthCacheService(DjangoMonthCacheBackend())
+    caches['default'].set('session:1', 'kept')
+    service.get_or_build(1, 2025, 7, lambda: ['cached'])
+
+    service.clear()
+
+    assert caches['default'].get('session:1') == 'kept'
+    assert service.get_or_build(1, 2025, 7, lambda: ['rebuilt']) == ['rebuilt']
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from finances.models import PaidRecurringExpense, RecurringExpense
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.expense_search_service import ExpenseSearchService
+
+
+def _query_plans(queries):
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+            plans.append(' '.join(row[-1] for row in cursor.fetchall()))
+    return plans
+
+
+@pytest.mark.django_db
+def test_month_listing_uses_composite_indexes(user, create_expense, create_category):
+    if connection.vendor != 'sqlite':
+        pytest.skip('EXPLAIN QUERY PLAN is SQLite specific.')
+
+    category = create_category(name='Moradia')
+    create_expense(name='Internet', due_date=date(2025, 7, 10), category_obj=category)
+    rule = RecurringExpense.objects.create(
+        user=user,
+        name='Academia',
+        amount=90,
+        due_day=5,
+        category=category,
+        start_date=date(2025, 1, 1),
+    )
+    PaidRecurringExpense.objects.create(
+        user=user, recurring_expense=rule, day=5, month=7, year=2025
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        ExpenseListService(user).all_for_month(2025, 7)
+
+    plans = ' | '.join(_query_plans(ctx.captured_queries))
+
+    assert 'expense_user_due_date_idx' in plans
+    assert 'recurring_user_active_idx' in plans
+    assert 'paid_recurring_user_ym_idx' in plans
+
+
+@pytest.mark.django_db
+def test_name_search_uses_trigram_indexes_on_postgresql(user, create_expense, create_category):
+    if connection.vendor != 'postgresql':
+        pytest.skip('pg_trgm indexes only exist on PostgreSQL.')
+
+    category = create_category(name='Moradia')
+    create_expense(name='Internet', due_date=date(2025, 7, 10), category_obj=category)
+    RecurringExpense.objects.create(
+        user=user, name='Internet fibra', amount=90, due_day=5, category=category,
+        start_date=date(2025, 1, 1),
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = ExpenseSearchService(user).search(query='inter')
+
+    plans = []
+    with connection.cursor() as cursor:
+        # a handful of rows would otherwise always be read sequentially
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        for query in ctx.captured_queries:
+            if 'ILIKE' not in query['sql']:
+                continue
+            cursor.execute(f'EXPLAIN {query["sql"]}')
+            plans.append(' '.join(row[0] for row in cursor.fetchall()))
+    plans = ' | '.join(plans)
+
+    assert [e.name for e in result['results']] == ['Internet']
+    assert [r.name for r in result['recurring']] == ['Internet fibra']
+    assert 'finances_expense_name_trgm_idx' in plans
+    assert 'finances_recurringexpense_name_trgm_idx' in plans
@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+
+from finances.interfaces.api.v1.serializers import ExpenseSerializer
+from finances.models import Expense, RecurringExpense
+from finances.services.recurring_expansion_service import RecurringExpansionService
+
+
+@pytest.fixture
+def rules(user, create_category):
+    category = create_category(name='Moradia')
+    return [
+        RecurringExpense.objects.create(
+            user=user, name='Aluguel', amount=600, due_day=31, category=category,
+            start_date=date(2024, 1, 1),
+        ),
+        RecurringExpense.objects.create(
+            user=user, name='Academia', amount=Decimal('89.90'), due_day=10, category=category,
+            start_date=date(2024, 2, 15), end_date=date(2024, 3, 1),
+        ),
+    ]
+
+
+@pytest.mark.django_db
+def test_expand_clamps_due_day_and_respects_windows(rules):
+    aluguel, academia = rules
+    records = RecurringExpansionService(rules).expand(
+        (2024, 1), (2024, 4), paid={(aluguel.id, 2, 2024)}
+    )
+
+    assert [(r.rule_id, r.due_date, r.paid) for r in records] == [
+        (aluguel.id, date(2024, 1, 31), False),
+        (aluguel.id, date(2024, 2, 29), True),
+        (academia.id, date(2024, 2, 10), False),
+        (aluguel.id, date(2024, 3, 31), False),
+        (academia.id, date(2024, 3, 10), False),
+        (aluguel.id, date(2024, 4, 30), False),
+    ]
+
+
+@pytest.mark.django_db
+def test_records_serialize_like_unsaved_expenses(user, rules):
+    for rule in rules:
+        record = RecurringExpansionService([rule]).expand_month(2024, 2, paid={(rule.id, 2, 2024)})[0]
+        expense = Expense(
+            id=-rule.id,
+            user=user,
+            name=rule.name,
+            amount=rule.amount,
+            due_date=record.due_date,
+            category=rule.category,
+            paid=True,
+        )
+        assert ExpenseSerializer(record).data == ExpenseSerializer(expense).data
+
+
+@pytest.mark.django_db
+def test_listing_clamps_legacy_due_days(auth_client, expenses_url, user, create_category):
+    # rules stored before due days were validated on write
+    RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=40,
+        category=create_category(name='Moradia'), start_date=date(2024, 1, 1),
+    )
+
+    response = auth_client.get(f'{expenses_url}?year=2024&month=2')
+
+    assert response.status_code == HTTPStatus.OK
+    assert [e['due_date'] for e in response.data] == ['2024-02-29']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('due_day', [0, 32])
+def test_api_rejects_due_days_out_of_range(auth_client, recurring_expenses_url, due_day):
+    payload = {'name': 'Aluguel', 'amount': 600, 'due_day': due_day, 'start_date': '2024-01-01'}
+    response = auth_client.post(recurring_expenses_url, payload, format='json')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'due_day' in response.data
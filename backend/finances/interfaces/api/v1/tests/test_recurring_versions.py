@@ -0,0 +1,158 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from finances.models import Category, PaidRecurringExpense, RecurringExpense, RecurringExpenseVersion
+from finances.services.expense_list_service import ExpenseListService
+from finances.services.expense_summary_service import ExpenseSummaryService
+from finances.services.forecast_service import ForecastService
+from finances.services.recurring_expansion_service import RuleHistory
+from finances.services.recurring_expense_service import RecurringExpenseService
+
+
+@pytest.fixture
+def rent(user, create_category):
+    return RecurringExpense.objects.create(
+        user=user, name='Aluguel', amount=600, due_day=5, category=create_category(name='Moradia'),
+        start_date=date(2025, 1, 10),
+    )
+
+
+@pytest.fixture
+def edited_rent(user, rent):
+    RecurringExpenseService(user, today=date(2025, 4, 20)).update_rule(rent, amount=Decimal('650.00'))
+    RecurringExpenseService(user, today=date(2025, 7, 3)).update_rule(rent, due_day=31)
+    RecurringExpenseService(user, today=date(2025, 7, 28)).update_rule(rent, amount=Decimal('700.00'))
+    return rent
+
+
+def test_rule_history_bisects_segments():
+    history = RuleHistory([
+        (date(2025, 4, 1), date(2025, 6, 30), Decimal('650.00'), 5),
+        (date(2025, 1, 1), date(2025, 3, 31), Decimal('600.00'), 5),
+    ])
+
+    assert history.at(2024 * 12 + 11) is None
+    assert history.at(2025 * 12) == (Decimal('600.00'), 5)
+    assert history.at(2025 * 12 + 3) == (Decimal('650.00'), 5)
+    assert history.at(2025 * 12 + 5) == (Decimal('650.00'), 5)
+    assert history.at(2025 * 12 + 6) is None
+
+
+@pytest.mark.django_db
+def test_edits_keep_past_months(edited_rent):
+    versions = list(
+        RecurringExpenseVersion.objects.filter(recurring_expense=edited_rent).values_list(
+            'effective_from', 'effective_to', 'amount', 'due_day'
+        )
+    )
+    assert versions == [
+        (date(2025, 1, 1), date(2025, 3, 31), Decimal('600.00'), 5),
+        (date(2025, 4, 1), date(2025, 6, 30), Decimal('650.00'), 5),
+    ]
+    edited_rent.refresh_from_db()
+    assert edited_rent.versioned_until == date(2025, 6, 30)
+
+    expenses = ExpenseListService(edited_rent.user).for_range((2025, 2), (2025, 8))
+    assert [(e.due_date, e.amount) for e in expenses] == [
+        (date(2025, 2, 5), Decimal('600.00')),
+        (date(2025, 3, 5), Decimal('600.00')),
+        (date(2025, 4, 5), Decimal('650.00')),
+        (date(2025, 5, 5), Decimal('650.00')),
+        (date(2025, 6, 5), Decimal('650.00')),
+        (date(2025, 7, 31), Decimal('700.00')),
+        (date(2025, 8, 31), Decimal('700.00')),
+    ]
+
+
+@pytest.mark.django_db
+def test_versions_cost_one_query_and_only_when_needed(user, edited_rent, django_assert_num_queries):
+    service = ExpenseListService(user)
+    # expenses + rules + paid records + versions
+    with django_assert_num_queries(4):
+        service.for_range((2024, 1), (2026, 12))
+    with django_assert_num_queries(3):
+        service.for_range((2025, 7), (2026, 12))
+
+
+@pytest.mark.django_db
+def test_streamed_and_paged_listings_use_versions(user, edited_rent):
+    streamed = list(ExpenseListService(user).iter_range((2025, 3), (2025, 7)))
+    assert [e.amount for e in streamed] == [600, 650, 650, 650, 700]
+
+    page, _ = ExpenseListService(user).page_for_month(2025, 5, limit=10)
+    assert [(e.due_date, e.amount) for e in page] == [(date(2025, 5, 5), Decimal('650.00'))]
+
+
+@pytest.mark.django_db
+def test_summary_and_forecast_follow_versions(user, edited_rent):
+    PaidRecurringExpense.objects.create(
+        user=user, recurring_expense=edited_rent, day=5, month=4, year=2025
+    )
+    today = date(2025, 7, 15)
+    summary = ExpenseSummaryService(user, today=today).summarize((2025, 1), (2025, 8))
+    expenses = ExpenseListService(user).for_range((2025, 1), (2025, 8))
+
+    assert summary['total'] == sum(e.amount for e in expenses) == Decimal('5150.00')
+    assert summary['paid'] == Decimal('650.00')
+    assert summary['overdue'] == sum(
+        e.amount for e in expenses if not e.paid and e.due_date < today
+    )
+
+    forecast = ForecastService(user, today=date(2025, 2, 1)).forecast(7)
+    assert [row['total'] for row in forecast['months']] == [
+        Decimal('600.00'), Decimal('600.00'), Decimal('650.00'), Decimal('650.00'),
+        Decimal('650.00'), Decimal('700.00'), Decimal('700.00'),
+    ]
+    assert forecast['months'][2]['paid'] == Decimal('650.00')
+
+
+@pytest.mark.django_db
+def test_update_endpoint_versions_amount_changes(auth_client, recurring_expenses_url, rent):
+    today = timezone.localdate()
+    response = auth_client.patch(
+        f'{recurring_expenses_url}{rent.id}/', {'amount': '720.00'}, format='json'
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data['amount'] == '720.00'
+    version = RecurringExpenseVersion.objects.get(recurring_expense=rent)
+    assert (version.amount, version.effective_from) == (Decimal('600.00'), date(2025, 1, 1))
+
+    past = ExpenseListService(rent.user).for_month(2025, 1)
+    current = ExpenseListService(rent.user).for_month(today.year, today.month)
+    assert [e.amount for e in past] == [Decimal('600.00')]
+    assert [e.amount for e in current] == [Decimal('720.00')]
+
+
+@pytest.mark.django_db
+def test_update_endpoint_rejects_foreign_category(auth_client, recurring_expenses_url, rent):
+    other = User.objects.create_user(username='maria', password='12345678')
+    foreign = Category.objects.create(name='Outra', user=other)
+
+    response = auth_client.patch(
+        f'{recurring_expenses_url}{rent.id}/', {'category_id': foreign.id}, format='json'
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert not RecurringExpenseVersion.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rules_of_another_user_cannot_be_edited(auth_client, recurring_expenses_url, rent):
+    other = User.objects.create_user(username='maria', password='12345678')
+
+    with pytest.raises(ValueError):
+        RecurringExpenseService(other).update_rule(rent, amount=Decimal('1.00'))
+
+    auth_client.force_authenticate(other)
+    response = auth_client.patch(f'{recurring_expenses_url}{rent.id}/', {'amount': '1.00'}, format='json')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    rent.refresh_from_db()
+    assert rent.amount == Decimal('600.00')
+    assert not RecurringExpenseVersion.objects.exists()
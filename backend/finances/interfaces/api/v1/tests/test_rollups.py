@@ -0,0 +1,119 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+
+from finances.models import Expense, MonthlyCategoryRollup
+from finances.services.expense_summary_service import ExpenseSummaryService
+from finances.services.rollup_service import RollupService
+
+
+@pytest.mark.django_db
+def test_api_writes_keep_rollups_in_step(
+    auth_client, expenses_url, categories_url, installment_expenses_url, create_category, user
+):
+    housing = create_category(name='Moradia')
+    leisure = create_category(name='Lazer')
+
+    auth_client.post(
+        expenses_url,
+        {'name': 'Luz', 'amount': '120.00', 'due_date': '2025-07-10', 'category_id': housing.id},
+        format='json',
+    )
+    auth_client.post(
+        installment_expenses_url,
+        {
+            'name': 'Geladeira',
+            'total_amount': '1000.00',
+            'installments_quantity': 6,
+            'first_due_date': '2025-06-15',
+            'category_id': leisure.id,
+        },
+        format='json',
+    )
+    assert RollupService.diff([user.id]) == []
+
+    expense = Expense.objects.get(name='Luz')
+    response = auth_client.put(
+        f'{expenses_url}{expense.id}/',
+        {'name': 'Luz', 'amount': '150.00', 'due_date': '2025-08-10', 'category_id': leisure.id},
+        format='json',
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert RollupService.diff([user.id]) == []
+
+    installment_ids = list(
+        Expense.objects.filter(installment_origin__isnull=False).values_list('id', flat=True)[:3]
+    )
+    response = auth_client.post(
+        f'{expenses_url}mark-paid/',
+        {'ids': [{'type': 'i', 'id': pk} for pk in installment_ids]},
+        format='json',
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert RollupService.diff([user.id]) == []
+
+    auth_client.delete(f'{categories_url}{leisure.id}/')
+    assert RollupService.diff([user.id]) == []
+
+    auth_client.delete(f'{expenses_url}{expense.id}/')
+    assert RollupService.diff([user.id]) == []
+    assert MonthlyCategoryRollup.objects.filter(user=user, year=2025, month=8).count() == 0
+
+
+@pytest.mark.django_db
+def test_first_write_of_a_month_adds_to_a_concurrently_inserted_rollup(user, monkeypatch):
+    expense = Expense(user=user, name='Luz', amount=80, due_date=date(2025, 7, 10))
+    # another request stored the uncategorized rollup after this one looked for it
+    RollupService(user).add_expenses([expense])
+    locked_rows = RollupService._locked_rows
+    calls = []
+
+    def stale_first_read(self, deltas):
+        calls.append(deltas)
+        return {} if len(calls) == 1 else locked_rows(self, deltas)
+
+    monkeypatch.setattr(RollupService, '_locked_rows', stale_first_read)
+    RollupService(user).add_expenses([expense])
+
+    rollup = MonthlyCategoryRollup.objects.get(user=user, year=2025, month=7, category=None)
+    assert (rollup.amount, rollup.count) == (Decimal('160.00'), 2)
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        MonthlyCategoryRollup.objects.create(user=user, year=2025, month=7, count=1)
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_command_repairs_drift(user, create_category, create_expense):
+    category = create_category()
+    create_expense(amount=100, due_date=date(2025, 7, 5), category_obj=category)
+    Expense.objects.create(
+        user=user, name='Sem hook', amount=50, due_date=date(2025, 7, 6), category=category
+    )
+
+    with pytest.raises(CommandError):
+        call_command('rebuild_rollups', '--check', '--user', str(user.id))
+
+    call_command('rebuild_rollups', '--user', str(user.id))
+    call_command('rebuild_rollups', '--check')
+
+    rollup = MonthlyCategoryRollup.objects.get(user=user, year=2025, month=7)
+    assert (rollup.amount, rollup.count) == (Decimal('150.00'), 2)
+
+
+@pytest.mark.django_db
+def test_summary_splits_current_month_overdue_by_due_date(user, create_category, create_expense):
+    category = create_category()
+    create_expense(amount=100, due_date=date(2025, 6, 5), category_obj=category)
+    create_expense(amount=40, due_date=date(2025, 7, 5), category_obj=category)
+    create_expense(amount=30, due_date=date(2025, 7, 25), category_obj=category)
+    create_expense(amount=20, due_date=date(2025, 7, 1), paid=True, category_obj=category)
+
+    summary = ExpenseSummaryService(user, today=date(2025, 7, 15)).summarize((2025, 6), (2025, 8))
+
+    assert summary['total'] == Decimal('190.00')
+    assert summary['paid'] == Decimal('20.00')
+    assert summary['overdue'] == Decimal('140.00')
@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import (
     CategoryViewSet,
     ExpenseViewSet,
+    ForecastViewSet,
     InstallmentExpenseViewSet,
+    JobViewSet,
     RecurringExpenseViewSet,
 )
 
@@ -12,7 +15,13 @@ router.register(r'expenses', ExpenseViewSet, basename='expense')
 router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'installment-expenses', InstallmentExpenseViewSet, basename='installment-expense')
 router.register(r'recurring-expenses', RecurringExpenseViewSet, basename='recurring-expense')
+router.register(r'forecast', ForecastViewSet, basename='forecast')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
+    path('async/expenses/', async_views.expense_list, name='async-expense-list'),
+    path('async/expenses/months/', async_views.expense_months, name='async-expense-months'),
+    path('async/expenses/summary/', async_views.expense_summary, name='async-expense-summary'),
+    path('async/categories/', async_views.category_list, name='async-category-list'),
     path('', include(router.urls)),
 ]
@@ -1,73 +1,317 @@
+import copy
+from itertools import chain, islice
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets, permissions, mixins, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
 from . import serializers
-from .mixins import BaseUserQuerysetMixin, MarkPaidActionMixin
+from .mixins import (
+    BaseUserQuerysetMixin,
+    MarkPaidActionMixin,
+    UserCacheInvalidationMixin,
+    conditional_on_user_data,
+    conditional_on_user_data_and_month,
+    user_data_marker,
+)
+from .pagination import ExpenseKeysetPagination
+from .renderers import CSVRowRenderer, NDJSONRowRenderer
+from .parsers import (
+    CSVRowParser,
+    NDJSONRowParser,
+    decode_stream,
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
 from finances.services.installment_expense_service import InstallmentExpenseService
+from finances.services.installment_plan_service import InstallmentPlanService
+from finances.services.expense_import_service import ExpenseImportService
 from finances.services.expense_list_service import ExpenseListService
 from finances.services.expense_payment_service import ExpensePaymentService
-from finances.models import Category, Expense, PaidRecurringExpense, InstallmentExpense, RecurringExpense
+from finances.services.expense_search_service import ExpenseSearchService
+from finances.services.expense_summary_service import ExpenseSummaryService
+from finances.services.forecast_service import ForecastService
+from finances.services.job_service import JobService
+from finances.services.metrics_service import timer
+from finances.services.month_cache_service import get_month_cache
+from finances.services.recurring_expense_service import RecurringExpenseService
+from finances.services.rollup_service import RollupService
+from finances.models import (
+    Category,
+    Expense,
+    InstallmentExpense,
+    Job,
+    PaidRecurringExpense,
+    RecurringExpense,
+)
 from finances.utils.validations import FinancesValidations
 
 
+def enqueue_job(request, kind, payload, total=None) -> Response:
+    """Queues a job for the run_jobs worker and answers 202 pointing at its status."""
+    try:
+        job = JobService(request.user).enqueue(kind, payload, total=total)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    return Response(
+        serializers.JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': reverse('job-detail', kwargs={'pk': job.pk}, request=request)},
+    )
+
+
 class ExpenseViewSet(
+    BaseUserQuerysetMixin,
+    MarkPaidActionMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.UpdateModelMixin,
     viewsets.ReadOnlyModelViewSet,
-    BaseUserQuerysetMixin,
-    MarkPaidActionMixin
 ):
     queryset = Expense.objects.all()
     serializer_class = serializers.ExpenseSerializer
     permission_classes = [permissions.IsAuthenticated]
     payment_service_class = ExpensePaymentService
+    keyset_pagination_class = ExpenseKeysetPagination
+    export_chunk_size = 2000
 
     def _get_year_month(self):
         year = self.request.query_params.get('year')
         month = self.request.query_params.get('month')
         return FinancesValidations.validate_month_year(year=year, month=month)
 
+    def _get_month_range(self):
+        params = self.request.query_params
+        if 'from' in params or 'to' in params:
+            return FinancesValidations.validate_month_range(params.get('from'), params.get('to'))
+        year, month = self._get_year_month()
+        return (year, month), (year, month)
+
+    @conditional_on_user_data
     def list(self, request, *args, **kwargs):
         year, month = self._get_year_month()
-        all_expenses = ExpenseListService(request.user).all_for_month(year, month)
+        service = ExpenseListService(request.user)
+
+        paginator = self.keyset_pagination_class()
+        if paginator.is_requested(request):
+            page, next_key = service.page_for_month(
+                year,
+                month,
+                limit=paginator.get_page_size(request),
+                after=paginator.decode_cursor(request),
+            )
+            return paginator.get_paginated_response(
+                serializers.serialize_expense_list(page), request, next_key
+            )
+
+        def build():
+            all_expenses = service.all_for_month(year, month)
+            return serializers.serialize_expense_list(all_expenses)
+
+        return Response(
+            get_month_cache().get_or_build(
+                request.user.id, year, month, build, marker=user_data_marker(request)
+            )
+        )
 
-        page = self.paginate_queryset(all_expenses)
-        serializer = self.get_serializer(page or all_expenses, many=True)
-        return self.get_paginated_response(serializer.data) if page else Response(serializer.data)
+    @transaction.atomic
+    def perform_create(self, serializer):
+        expense = serializer.save()
+        RollupService(expense.user).add_expenses([expense])
+        get_month_cache().invalidate_dates(expense.user_id, [expense.due_date])
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous = copy.copy(serializer.instance)
+        expense = serializer.save()
+        rollups = RollupService(expense.user)
+        rollups.remove_expenses([previous])
+        rollups.add_expenses([expense])
+        get_month_cache().invalidate_dates(expense.user_id, [previous.due_date, expense.due_date])
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        RollupService(instance.user).remove_expenses([instance])
+        get_month_cache().invalidate_dates(instance.user_id, [instance.due_date])
 
     def get_serializer_class(self):
         if self.action == 'create':
             return serializers.ExpenseCreateSerializer
         return serializers.ExpenseSerializer
 
+    @action(detail=False, methods=['get'], url_path='range')
+    def list_range(self, request, *args, **kwargs):
+        start, end = FinancesValidations.validate_month_range(
+            request.query_params.get('from'), request.query_params.get('to')
+        )
+        expenses = ExpenseListService(request.user).for_range(start, end)
+        return Response(serializers.serialize_expense_list(expenses))
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='export',
+        renderer_classes=[CSVRowRenderer, NDJSONRowRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        """Streams expenses as CSV or NDJSON; a missing from/to extends to the whole history.
+
+        Unlike /range/, the span is not capped at MAX_RANGE_MONTHS: rows are
+        streamed, so memory does not grow with the range.
+        """
+        start, end = FinancesValidations.validate_export_range(
+            request.query_params.get('from'), request.query_params.get('to')
+        )
+        service = ExpenseListService(request.user)
+        if start is None or end is None:
+            today = timezone.localdate()
+            first, last = service.history_bounds(today) or ((today.year, today.month),) * 2
+            start = start or (min(first, end) if end else first)
+            end = end or max(last, start)
+
+        renderer = request.accepted_renderer
+        expenses = service.iter_range(start, end, chunk_size=self.export_chunk_size)
+        response = StreamingHttpResponse(
+            renderer.iter_rows(
+                serializers.iter_expense_export_rows(expenses),
+                fields=serializers.EXPENSE_EXPORT_FIELDS,
+            ),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        filename = f'despesas-{start[0]}-{start[1]:02d}-{end[0]}-{end[1]:02d}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request, *args, **kwargs):
+        start, end = self._get_month_range()
+        summary = ExpenseSummaryService(request.user).summarize(start, end)
+        with timer('serialize'):
+            return Response(serializers.ExpenseSummarySerializer(summary).data)
+
+    @action(detail=False, methods=['get'], url_path='search')
+    @conditional_on_user_data
+    def search(self, request, *args, **kwargs):
+        filters = FinancesValidations.validate_search_params(request.query_params)
+        paginator = self.keyset_pagination_class()
+        after = paginator.decode_cursor(request)
+        found = ExpenseSearchService(request.user).search(
+            **filters,
+            limit=paginator.get_page_size(request),
+            after=after,
+            with_facets=after is None,
+        )
+
+        extra = {}
+        if 'facets' in found:
+            with timer('serialize'):
+                extra['facets'] = found['facets']
+                extra['recurring'] = serializers.RecurringExpenseSerializer(
+                    found['recurring'], many=True
+                ).data
+        return paginator.get_paginated_response(
+            serializers.serialize_expense_list(found['results']),
+            request,
+            found['next_key'],
+            **extra,
+        )
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[CSVRowParser, NDJSONRowParser, MultiPartParser],
+    )
+    def import_expenses(self, request, *args, **kwargs):
+        rows = request.data
+        if request.content_type.startswith('multipart/'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                raise ValidationError({'file': 'Arquivo obrigatório.'})
+            stream = decode_stream(upload)
+            rows = iter_csv_rows(stream) if upload.name.lower().endswith('.csv') else iter_ndjson_rows(stream)
+
+        rows = iter(rows)
+        head = list(islice(rows, settings.FINANCES_JOBS['INLINE_IMPORT_ROWS'] + 1))
+        if len(head) <= settings.FINANCES_JOBS['INLINE_IMPORT_ROWS']:
+            return Response(ExpenseImportService(request.user).run(head))
+
+        name, total = ExpenseImportService.spool(chain(head, rows))
+        response = enqueue_job(request, 'import_expenses', {'file': name}, total=total)
+        if response.status_code != status.HTTP_202_ACCEPTED:
+            default_storage.delete(name)
+        return response
+
     @action(detail=False, methods=['get'], url_path='months')
+    # open-ended rules reach up to the current month
+    @conditional_on_user_data_and_month
     def get_months(self, request, *args, **kwargs):
         months = ExpenseListService(request.user).available_months()
         return Response(months)
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(UserCacheInvalidationMixin, viewsets.ModelViewSet):
     serializer_class = serializers.CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Category.objects.filter(user=self.request.user)
 
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        rollups = RollupService(instance.user)
+        # installment plans cascade with their category, taking their expenses along
+        rollups.remove_queryset(
+            Expense.objects.filter(user=instance.user, installment_origin__category=instance)
+        )
+        rollups.reassign_category(instance.id)
+        super().perform_destroy(instance)
+
 
 class InstallmentExpenseViewSet(
-    viewsets.GenericViewSet,
+    BaseUserQuerysetMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
-    BaseUserQuerysetMixin,
+    viewsets.GenericViewSet,
 ):
     serializer_class = serializers.InstallmentExpenseCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
     queryset = InstallmentExpense.objects.all()
 
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if data['installments_quantity'] <= settings.FINANCES_JOBS['INLINE_INSTALLMENTS']:
+            self.perform_create(serializer)
+            headers = self.get_success_headers(serializer.data)
+            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+        if not Category.objects.filter(id=data['category_id'], user=request.user).exists():
+            raise ValidationError('Categoria não encontrada.')
+        payload = {
+            **data,
+            'total_amount': str(data['total_amount']),
+            'first_due_date': data['first_due_date'].isoformat(),
+        }
+        return enqueue_job(
+            request, 'create_installments', payload, total=data['installments_quantity']
+        )
+
     def perform_create(self, serializer):
         try:
             service = InstallmentExpenseService(
@@ -78,16 +322,48 @@ class InstallmentExpenseViewSet(
         except ValueError as e:
             raise ValidationError(str(e))
 
+    def perform_update(self, serializer):
+        try:
+            InstallmentPlanService(self.request.user).update_plan(
+                serializer.instance, **serializer.validated_data
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
     def perform_destroy(self, instance):
-        instance.expenses.all().delete()
-        instance.delete()
+        InstallmentPlanService(instance.user).delete_plans([instance.id])
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request, *args, **kwargs):
+        ids = request.data.get('ids')
+        if not isinstance(ids, list):
+            return Response({'error': 'Formato de dados inválido'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = InstallmentPlanService(request.user).delete_plans(ids)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
 
 
-class RecurringExpenseViewSet(viewsets.ModelViewSet, BaseUserQuerysetMixin):
+class RecurringExpenseViewSet(
+    UserCacheInvalidationMixin, BaseUserQuerysetMixin, viewsets.ModelViewSet
+):
     serializer_class = serializers.RecurringExpenseSerializer
     permission_classes = [permissions.IsAuthenticated]
     queryset = RecurringExpense.objects.all()
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        get_month_cache().invalidate_user(self.request.user.id)
+
+    def perform_update(self, serializer):
+        try:
+            RecurringExpenseService(self.request.user).update_rule(
+                serializer.instance, **serializer.validated_data
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
     @action(detail=True, methods=['post'])
     def mark_paid(self, request, pk=None):
         month = request.data.get('month')
@@ -105,5 +381,33 @@ class RecurringExpenseViewSet(viewsets.ModelViewSet, BaseUserQuerysetMixin):
             year=year,
         )
 
+        get_month_cache().invalidate_months(request.user.id, [(int(year), int(month))])
+
         serializer = serializers.PaidRecurringExpenseSerializer(obj)
         return Response(serializer.data, status=201 if created else 200)
+
+
+class ForecastViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        months = FinancesValidations.validate_months_ahead(request.query_params.get('months'))
+        today = timezone.localdate()
+
+        def build():
+            forecast = ForecastService(request.user, today=today).forecast(months)
+            with timer('serialize'):
+                return serializers.ForecastSerializer(forecast).data
+
+        name = f'forecast:{months}:{today.year}:{today.month}'
+        return Response(
+            get_month_cache().get_or_build_user(
+                request.user.id, name, build, marker=user_data_marker(request)
+            )
+        )
+
+
+class JobViewSet(BaseUserQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = serializers.JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    queryset = Job.objects.all()
@@ -0,0 +1,92 @@
+import hmac
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+from finances.services.metrics_service import RequestRecorder, get_metrics_registry
+
+logger = logging.getLogger('finances.metrics')
+
+
+def view_label(view_func, method: str) -> str:
+    """``ViewClass.action`` for DRF views, the function name otherwise."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method.lower(), method.lower())}'
+
+
+class RequestMetricsMiddleware:
+    """Records SQL count and time, serializer time and total time per request.
+
+    Opt-in through ``FINANCES_METRICS['ENABLED']``; when disabled Django drops
+    the middleware at startup, so requests pay nothing. Results go out as a
+    ``Server-Timing`` header, one JSON log line on ``finances.metrics`` and
+    the histograms served by ``metrics_view``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.FINANCES_METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.registry = get_metrics_registry()
+
+    def __call__(self, request):
+        recorder = RequestRecorder()
+        token = recorder.activate()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            RequestRecorder.deactivate(token)
+        total = time.perf_counter() - started
+
+        view = getattr(request, '_metrics_view', 'unresolved')
+        serialize = recorder.timers.get('serialize', 0.0)
+        self.registry.observe(view, recorder, total)
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;desc="{recorder.sql_count} queries";dur={recorder.sql_seconds * 1000:.2f}',
+            f'serialize;dur={serialize * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+        logger.info(json.dumps({
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'sql_count': recorder.sql_count,
+            'sql_ms': round(recorder.sql_seconds * 1000, 2),
+            'serialize_ms': round(serialize * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_label(view_func, request.method)
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request histograms.
+
+    Served to requests bearing ``FINANCES_METRICS['TOKEN']`` and to staff
+    sessions. The counters live in the process that answers, so with several
+    workers each scrape sees only that worker's share.
+    """
+    if not settings.FINANCES_METRICS['ENABLED']:
+        raise Http404
+    token = settings.FINANCES_METRICS['TOKEN']
+    authorization = request.headers.get('Authorization', '')
+    authorized = bool(token) and hmac.compare_digest(authorization, f'Bearer {token}')
+    if not (authorized or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        get_metrics_registry().render(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from finances.services.job_service import JobService
+from finances.services.rollup_service import RollupService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula MonthlyCategoryRollup a partir das despesas e mostra as diferenças.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='ID do usuário')
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas compara, sem regravar; falha se houver diferenças.',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Enfileira um recálculo por usuário para o run_jobs em vez de executar agora.',
+        )
+
+    def handle(self, *args, users=None, check=False, enqueue=False, **options):
+        if enqueue:
+            if not users:
+                raise CommandError('--enqueue exige ao menos um --user.')
+            for user in User.objects.filter(id__in=users):
+                job = JobService(user).enqueue('rebuild_rollups', {})
+                self.stdout.write(f'user={user.id}: tarefa {job.id} enfileirada.')
+            return
+
+        differences = RollupService.diff(users)
+        for difference in differences:
+            user_id, year, month, category_id = difference['key']
+            self.stdout.write(
+                f'user={user_id} {year}-{month:02d} category={category_id}: '
+                f'esperado {difference["expected"]}, encontrado {difference["found"]}'
+            )
+
+        if check:
+            if differences:
+                raise CommandError(f'{len(differences)} rollup(s) divergente(s).')
+            self.stdout.write(self.style.SUCCESS('Rollups consistentes.'))
+            return
+
+        RollupService.rebuild(users)
+        self.stdout.write(self.style.SUCCESS(f'Rollups recalculados ({len(differences)} corrigido(s)).'))
@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from finances.services.job_service import JobRunner
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em fila (importações, parcelamentos, recálculo de rollups).'
+
+    def add_arguments(self, parser):
+        config = settings.FINANCES_JOBS
+        parser.add_argument(
+            '--threads', type=int, default=config['THREADS'], help='Tarefas executadas em paralelo.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=config['POLL_INTERVAL'],
+            help='Segundos de espera quando a fila está vazia.',
+        )
+        parser.add_argument(
+            '--once', action='store_true', help='Esvazia a fila e encerra em vez de aguardar.'
+        )
+
+    def handle(self, *args, threads=1, poll_interval=1.0, once=False, **options):
+        runner = JobRunner()
+        recovered = runner.recover_stale()
+        if recovered:
+            self.stdout.write(f'{recovered} tarefa(s) interrompida(s) recuperada(s).')
+
+        done = 0
+        running = set()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='finances-job') as pool:
+            try:
+                while True:
+                    while len(running) < threads:
+                        job = runner.claim()
+                        if job is None:
+                            break
+                        running.add(pool.submit(self._run, runner, job))
+
+                    if running:
+                        finished, running = wait(
+                            running, timeout=poll_interval, return_when=FIRST_COMPLETED
+                        )
+                        done += len(finished)
+                        for future in finished:
+                            future.result()
+                    elif once:
+                        break
+                    else:
+                        time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                self.stdout.write('Encerrando após as tarefas em andamento...')
+
+        self.stdout.write(self.style.SUCCESS(f'{done} tarefa(s) executada(s).'))
+
+    @staticmethod
+    def _run(runner: JobRunner, job):
+        try:
+            runner.run(job)
+        finally:
+            # each pool thread holds its own connection
+            connections.close_all()
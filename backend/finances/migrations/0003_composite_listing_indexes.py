@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0002_paidrecurringexpense'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'due_date'], name='expense_user_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paidrecurringexpense',
+            index=models.Index(fields=['user', 'year', 'month'], name='paid_recurring_user_ym_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringexpense',
+            index=models.Index(condition=models.Q(('active', True)), fields=['user', 'start_date', 'end_date'], name='recurring_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def populate_rollups(apps, schema_editor):
+    Expense = apps.get_model('finances', 'Expense')
+    MonthlyCategoryRollup = apps.get_model('finances', 'MonthlyCategoryRollup')
+
+    rows = (
+        Expense.objects.order_by()
+        .values(
+            'user_id',
+            'category_id',
+            year=ExtractYear('due_date'),
+            month=ExtractMonth('due_date'),
+        )
+        .annotate(
+            total_amount=Sum('amount'),
+            total_paid=Sum('amount', filter=Q(paid=True)),
+            total_count=Count('id'),
+        )
+    )
+    MonthlyCategoryRollup.objects.bulk_create(
+        (
+            MonthlyCategoryRollup(
+                user_id=row['user_id'],
+                category_id=row['category_id'],
+                year=row['year'],
+                month=row['month'],
+                amount=row['total_amount'],
+                paid_amount=row['total_paid'] or 0,
+                count=row['total_count'],
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0004_expense_user_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_rollups', to='finances.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Resumo Mensal por Categoria',
+                'verbose_name_plural': 'Resumos Mensais por Categoria',
+                'ordering': ['year', 'month'],
+                'unique_together': {('user', 'year', 'month', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0005_monthlycategoryrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurringexpense',
+            name='versioned_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RecurringExpenseVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('due_day', models.PositiveIntegerField()),
+                ('effective_from', models.DateField()),
+                ('effective_to', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recurring_expense', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='finances.recurringexpense')),
+            ],
+            options={
+                'verbose_name': 'Versão de Despesa Recorrente',
+                'verbose_name_plural': 'Versões de Despesas Recorrentes',
+                'ordering': ['effective_from'],
+                'unique_together': {('recurring_expense', 'effective_from')},
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+SEARCHABLE_TABLES = ('finances_expense', 'finances_recurringexpense')
+
+# FTS5 trigram tables mirror the name column through triggers. Django rebuilds
+# SQLite tables on most AlterField operations, which drops these triggers, so
+# any later migration that remakes these tables must recreate them;
+# test_fts_triggers_survive_migrations fails until it does.
+SQLITE_FORWARD = (
+    '''CREATE VIRTUAL TABLE {table}_fts USING fts5(
+        name, content='{table}', content_rowid='id', tokenize='trigram'
+    )''',
+    '''CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {table}_fts(rowid, name) VALUES (new.id, new.name);
+    END''',
+    '''CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {table}_fts({table}_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END''',
+    '''CREATE TRIGGER {table}_fts_au AFTER UPDATE OF name ON {table} BEGIN
+        INSERT INTO {table}_fts({table}_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO {table}_fts(rowid, name) VALUES (new.id, new.name);
+    END''',
+    "INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+)
+
+SQLITE_REVERSE = (
+    'DROP TRIGGER IF EXISTS {table}_fts_ai',
+    'DROP TRIGGER IF EXISTS {table}_fts_ad',
+    'DROP TRIGGER IF EXISTS {table}_fts_au',
+    'DROP TABLE IF EXISTS {table}_fts',
+)
+
+POSTGRESQL_FORWARD = (
+    'CREATE INDEX IF NOT EXISTS {table}_name_trgm_idx ON {table} USING gin (name gin_trgm_ops)',
+)
+
+POSTGRESQL_REVERSE = ('DROP INDEX IF EXISTS {table}_name_trgm_idx',)
+
+
+def _run(schema_editor, statements):
+    for table in SEARCHABLE_TABLES:
+        for statement in statements:
+            schema_editor.execute(statement.format(table=table))
+
+
+def create_name_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        _run(schema_editor, POSTGRESQL_FORWARD)
+
+
+def drop_name_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRESQL_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0006_recurringexpenseversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'amount'], name='expense_user_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'category', 'due_date'], name='expense_user_category_due_idx'),
+        ),
+        migrations.RunPython(create_name_search, drop_name_search),
+    ]
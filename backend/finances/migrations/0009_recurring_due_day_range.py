@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:29
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def clamp_due_days(apps, schema_editor):
+    # rules stored before due days were validated on write
+    for model_name in ('RecurringExpense', 'RecurringExpenseVersion'):
+        model = apps.get_model('finances', model_name)
+        model.objects.filter(due_day__lt=1).update(due_day=1)
+        model.objects.filter(due_day__gt=31).update(due_day=31)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0008_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_due_days, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='recurringexpense',
+            name='due_day',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1, message='O dia de vencimento deve estar entre 1 e 31.'), django.core.validators.MaxValueValidator(31, message='O dia de vencimento deve estar entre 1 e 31.')]),
+        ),
+        migrations.AlterField(
+            model_name='recurringexpenseversion',
+            name='due_day',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1, message='O dia de vencimento deve estar entre 1 e 31.'), django.core.validators.MaxValueValidator(31, message='O dia de vencimento deve estar entre 1 e 31.')]),
+        ),
+    ]
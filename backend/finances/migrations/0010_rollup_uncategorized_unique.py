@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_uncategorized_rollups(apps, schema_editor):
+    MonthlyCategoryRollup = apps.get_model('finances', 'MonthlyCategoryRollup')
+    uncategorized = MonthlyCategoryRollup.objects.filter(category__isnull=True)
+    duplicated = (
+        uncategorized.order_by()
+        .values('user_id', 'year', 'month')
+        .annotate(
+            rows=Count('id'),
+            total_amount=Sum('amount'),
+            total_paid=Sum('paid_amount'),
+            total_count=Sum('count'),
+        )
+        .filter(rows__gt=1)
+    )
+    for group in duplicated:
+        rows = uncategorized.filter(
+            user_id=group['user_id'], year=group['year'], month=group['month']
+        ).order_by('id')
+        keep = rows.first()
+        rows.exclude(id=keep.id).delete()
+        keep.amount = group['total_amount']
+        keep.paid_amount = group['total_paid']
+        keep.count = group['total_count']
+        keep.save(update_fields=['amount', 'paid_amount', 'count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0009_recurring_due_day_range'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_uncategorized_rollups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='monthlycategoryrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'year', 'month'), name='rollup_user_month_uncategorized_uniq'),
+        ),
+    ]
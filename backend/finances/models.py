@@ -1,5 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+DUE_DAY_MESSAGE = 'O dia de vencimento deve estar entre 1 e 31.'
+DUE_DAY_VALIDATORS = [
+    MinValueValidator(1, message=DUE_DAY_MESSAGE),
+    MaxValueValidator(31, message=DUE_DAY_MESSAGE),
+]
 
 
 class Category(models.Model):
@@ -24,13 +31,15 @@ class RecurringExpense(models.Model):
     )
     name = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    due_day = models.PositiveIntegerField()
+    due_day = models.PositiveIntegerField(validators=DUE_DAY_VALIDATORS)
     category = models.ForeignKey(
         Category, on_delete=models.CASCADE, related_name='recurring_expenses'
     )
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True)
     active = models.BooleanField(default=True)
+    # last day covered by a RecurringExpenseVersion; later months use the fields above
+    versioned_until = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -38,11 +47,40 @@ class RecurringExpense(models.Model):
         verbose_name = 'Despesa Recorrente'
         verbose_name_plural = 'Despesas Recorrentes'
         ordering = ['name']
+        indexes = [
+            models.Index(
+                fields=['user', 'start_date', 'end_date'],
+                condition=models.Q(active=True),
+                name='recurring_user_active_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class RecurringExpenseVersion(models.Model):
+    """Values a recurring rule had between two dates, before it was edited."""
+
+    recurring_expense = models.ForeignKey(
+        RecurringExpense, on_delete=models.CASCADE, related_name='versions'
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    due_day = models.PositiveIntegerField(validators=DUE_DAY_VALIDATORS)
+    effective_from = models.DateField()
+    effective_to = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Versão de Despesa Recorrente'
+        verbose_name_plural = 'Versões de Despesas Recorrentes'
+        ordering = ['effective_from']
+        unique_together = [['recurring_expense', 'effective_from']]
+
+    def __str__(self):
+        return f'{self.recurring_expense_id} {self.effective_from} - {self.effective_to}'
+
+
 class PaidRecurringExpense(models.Model):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='paid_recurring_expenses'
@@ -62,6 +100,12 @@ class PaidRecurringExpense(models.Model):
         unique_together = [['recurring_expense', 'month', 'year']]
         verbose_name = 'Pagamento de Despesa Recorrente'
         verbose_name_plural = 'Pagamentos de Despesas Recorrentes'
+        indexes = [
+            models.Index(
+                fields=['user', 'year', 'month'],
+                name='paid_recurring_user_ym_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.recurring_expense.name} {self.date.strftime('%m-%Y')}'
@@ -117,6 +161,87 @@ class Expense(models.Model):
         verbose_name = 'Despesa'
         verbose_name_plural = 'Despesas'
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='expense_user_due_date_idx'),
+            models.Index(fields=['user', 'updated_at'], name='expense_user_updated_idx'),
+            models.Index(fields=['user', 'amount'], name='expense_user_amount_idx'),
+            models.Index(
+                fields=['user', 'category', 'due_date'], name='expense_user_category_due_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class MonthlyCategoryRollup(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='monthly_rollups'
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        related_name='monthly_rollups',
+        blank=True,
+        null=True,
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Resumo Mensal por Categoria'
+        verbose_name_plural = 'Resumos Mensais por Categoria'
+        ordering = ['year', 'month']
+        unique_together = [['user', 'year', 'month', 'category']]
+        constraints = [
+            # unique_together treats every NULL category as distinct
+            models.UniqueConstraint(
+                fields=['user', 'year', 'month'],
+                condition=models.Q(category__isnull=True),
+                name='rollup_user_month_uncategorized_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.month:02d}-{self.year} {self.category_id}'
+
+
+class Job(models.Model):
+    """Heavy operation queued by a request and run by the run_jobs worker."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendente'
+        RUNNING = 'running', 'Em execução'
+        SUCCEEDED = 'succeeded', 'Concluída'
+        FAILED = 'failed', 'Falhou'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, default='')
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='job_status_created_idx'),
+            models.Index(fields=['user', 'status'], name='job_user_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
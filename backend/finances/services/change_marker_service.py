@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+
+from finances.models import Category, Expense, PaidRecurringExpense, RecurringExpense
+
+TRACKED_MODELS = (Expense, RecurringExpense, PaidRecurringExpense, Category)
+
+
+class ChangeMarkerService:
+    """Cheap per-user marker that changes whenever finance data changes.
+
+    Combines row counts and the latest ``updated_at`` of every tracked table
+    in a single query, so deletes are caught by the counts and inserts or
+    updates by the timestamps. Nothing is serialized to compute it.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def marker(self) -> str:
+        annotations = {}
+        for model in TRACKED_MODELS:
+            name = model._meta.model_name
+            rows = model.objects.filter(user=OuterRef('pk')).order_by().values('user')
+            annotations[f'{name}_count'] = Subquery(
+                rows.annotate(value=Count('id')).values('value'), output_field=IntegerField()
+            )
+            annotations[f'{name}_updated'] = Subquery(
+                rows.annotate(value=Max('updated_at')).values('value')
+            )
+
+        values = User.objects.filter(pk=self.user.pk).values(**annotations).get()
+        return ':'.join(str(values[name]) for name in sorted(values))
@@ -0,0 +1,175 @@
+import json
+import tempfile
+import uuid
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+
+from finances.models import Category, Expense
+from finances.services.month_cache_service import get_month_cache
+from finances.services.rollup_service import RollupService
+
+
+class ExpenseImportService:
+    """Validates and bulk-inserts expense rows in fixed-size chunks.
+
+    Each chunk resolves its category ids/names with a single query and is
+    inserted with one bulk_create inside its own transaction, so a bad row
+    only costs its own entry in the error report.
+    """
+
+    chunk_size = 1000
+    max_errors = 1000
+    PAID_VALUES = {
+        'true': True, '1': True, 'sim': True, 's': True, 'yes': True,
+        'false': False, '0': False, 'não': False, 'nao': False, 'n': False, 'no': False,
+    }
+
+    def __init__(self, user: User, chunk_size: Optional[int] = None):
+        self.user = user
+        self.chunk_size = chunk_size or self.chunk_size
+        self._categories_by_id: Dict[int, Category] = {}
+        self._categories_by_name: Dict[str, Category] = {}
+        self._fields = {
+            name: Expense._meta.get_field(name)
+            for name in ('name', 'amount', 'due_date')
+        }
+
+    def run(self, rows: Iterable, progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Imports ``rows``; ``progress`` gets the count of rows processed after each chunk."""
+        created = 0
+        failed = 0
+        errors: List[Dict] = []
+        numbered = enumerate(rows, start=1)
+
+        while chunk := list(islice(numbered, self.chunk_size)):
+            expenses, chunk_errors = self._validate_chunk(chunk)
+            if expenses:
+                with transaction.atomic():
+                    Expense.objects.bulk_create(expenses, batch_size=self.chunk_size)
+                    RollupService(self.user).add_expenses(expenses)
+                get_month_cache().invalidate_dates(self.user.id, (e.due_date for e in expenses))
+            created += len(expenses)
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[: self.max_errors - len(errors)])
+            if progress is not None:
+                progress(created + failed)
+
+        return {'created': created, 'failed': failed, 'errors': errors}
+
+    @staticmethod
+    def spool(rows: Iterable) -> Tuple[str, int]:
+        """Writes ``rows`` to the default storage as NDJSON; returns the file name and row count.
+
+        Queued imports keep only this name in their payload, so the upload is
+        streamed through a temporary file instead of being held in memory.
+        """
+        count = 0
+        with tempfile.TemporaryFile() as spooled:
+            for row in rows:
+                spooled.write(json.dumps(row).encode() + b'\n')
+                count += 1
+            spooled.seek(0)
+            name = default_storage.save(f'imports/{uuid.uuid4().hex}.ndjson', File(spooled))
+        return name, count
+
+    @staticmethod
+    def iter_spooled(name: str) -> Iterator:
+        """Reads back, one row at a time, a file written by :meth:`spool`."""
+        with default_storage.open(name, 'rb') as spooled:
+            for line in spooled:
+                yield json.loads(line)
+
+    def _validate_chunk(self, chunk) -> Tuple[List[Expense], List[Dict]]:
+        cleaned_rows = []
+        errors = []
+        for number, raw in chunk:
+            cleaned, row_errors = self._clean_row(raw)
+            if row_errors:
+                errors.append({'row': number, 'errors': row_errors})
+            else:
+                cleaned_rows.append((number, cleaned))
+
+        self._load_categories(cleaned['category'] for _, cleaned in cleaned_rows)
+
+        expenses = []
+        for number, cleaned in cleaned_rows:
+            reference = cleaned.pop('category')
+            category = None
+            if reference is not None:
+                category = self._resolve_category(reference)
+                if category is None:
+                    errors.append(
+                        {'row': number, 'errors': {'category': 'Categoria não encontrada.'}}
+                    )
+                    continue
+            expenses.append(Expense(user=self.user, category=category, **cleaned))
+
+        errors.sort(key=lambda error: error['row'])
+        return expenses, errors
+
+    def _clean_row(self, raw) -> Tuple[Dict, Dict]:
+        if not isinstance(raw, dict):
+            return {}, {'non_field_errors': 'Linha inválida.'}
+
+        cleaned = {}
+        errors = {}
+        for name, field in self._fields.items():
+            try:
+                cleaned[name] = field.clean(raw.get(name), None)
+            except ValidationError as e:
+                errors[name] = ' '.join(e.messages)
+
+        paid = self._clean_paid(raw.get('paid'))
+        if paid is None:
+            errors['paid'] = 'Valor inválido para pago.'
+        cleaned['paid'] = paid
+
+        category = raw.get('category', raw.get('category_id'))
+        cleaned['category'] = self._category_reference(category)
+        return cleaned, errors
+
+    @staticmethod
+    def _clean_paid(value) -> Optional[bool]:
+        if value in (None, ''):
+            return False
+        if isinstance(value, bool):
+            return value
+        return ExpenseImportService.PAID_VALUES.get(str(value).strip().lower())
+
+    @staticmethod
+    def _category_reference(value):
+        if value in (None, ''):
+            return None
+        if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+            return int(value)
+        return str(value).strip()
+
+    def _resolve_category(self, reference) -> Optional[Category]:
+        if isinstance(reference, int):
+            return self._categories_by_id.get(reference)
+        return self._categories_by_name.get(reference)
+
+    def _load_categories(self, references):
+        ids, names = set(), set()
+        for reference in references:
+            if isinstance(reference, int):
+                if reference not in self._categories_by_id:
+                    ids.add(reference)
+            elif reference is not None and reference not in self._categories_by_name:
+                names.add(reference)
+
+        if not ids and not names:
+            return
+
+        for category in Category.objects.filter(user=self.user).filter(
+            Q(id__in=ids) | Q(name__in=names)
+        ):
+            self._categories_by_id[category.id] = category
+            self._categories_by_name[category.name] = category
@@ -1,98 +1,315 @@
-import calendar
 import datetime
-from typing import List, Dict
-from django.db.models import Q
-from django.db.models.functions import ExtractMonth, ExtractYear
+import heapq
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max, Min, Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 
-from finances.models import Expense, RecurringExpense, PaidRecurringExpense
+from finances.models import (
+    Expense,
+    MonthlyCategoryRollup,
+    PaidRecurringExpense,
+    RecurringExpense,
+    RecurringExpenseVersion,
+)
+from finances.services.recurring_expansion_service import (
+    RecurringExpansionService,
+    RuleHistory,
+    VirtualExpense,
+    edited_since,
+)
 from finances.utils.validations import FinancesValidations
 
+YearMonth = Tuple[int, int]
+ListedExpense = Union[Expense, VirtualExpense]
+
 
 class ExpenseListService:
     def __init__(self, user: User):
         self.user = user
 
-    def for_month(self, year: int, month: int) -> List[Expense]:
-        FinancesValidations.validate_month_year(year, month)
-        concrete = list(
-            Expense.objects.filter(
-                user=self.user, due_date__year=year, due_date__month=month
-            )
-        )
-        rules = self._get_recurring_rules(year, month)
-        paid_map = self._get_paid_map(year, month)
-        virtual = self._generate_virtual_expenses(rules, paid_map, year, month)
+    def for_month(self, year: int, month: int) -> List[ListedExpense]:
+        year, month = FinancesValidations.validate_month_year(year, month)
+        return self.for_range((year, month), (year, month))
+
+    def all_for_month(self, year: int, month: int) -> List[ListedExpense]:
+        return self.for_range((year, month), (year, month))
+
+    def for_range(self, start: YearMonth, end: YearMonth) -> List[ListedExpense]:
+        """Concrete and virtual expenses for every month in [start, end].
+
+        Costs one query each for expenses, recurring rules and paid records,
+        however many months the range covers, plus one for rule versions
+        when a rule was edited after the range starts.
+        """
+        first_day = FinancesValidations.month_bounds(*start)[0]
+        last_day = FinancesValidations.month_bounds(*end)[1]
+
+        concrete = list(self._get_concrete_expenses(first_day, last_day))
+        rules = list(self._get_recurring_rules(first_day, last_day))
+        paid_map = self._get_paid_map(start, end)
+
+        virtual = self._expansion(rules, first_day, last_day).expand(start, end, paid_map)
+
         return sorted(concrete + virtual, key=lambda e: e.due_date)
 
-    def all_for_month(self, year: int, month: int) -> List[Expense]:
-        concrete = list(
-            Expense.objects.filter(
-                user=self.user,
-                due_date__year=year,
-                due_date__month=month,
+    async def afor_range(self, start: YearMonth, end: YearMonth) -> List[ListedExpense]:
+        """Async for_range, for ASGI views.
+
+        Runs the sync path in one sync_to_async hop. Django's async ORM sends
+        every query to the same thread-sensitive executor, so awaiting the
+        queries separately would not overlap them and would only add hops.
+        """
+        return await sync_to_async(self.for_range)(start, end)
+
+    async def aall_for_month(self, year: int, month: int) -> List[ListedExpense]:
+        return await self.afor_range((year, month), (year, month))
+
+    def iter_range(
+        self, start: YearMonth, end: YearMonth, chunk_size: int = 2000
+    ) -> Iterator[ListedExpense]:
+        """Streams [start, end] in (due_date, id) order without materializing it.
+
+        Concrete expenses are read with a chunked iterator and paid records
+        are consumed month by month alongside the expansion, so memory stays
+        bounded by one chunk plus one month of recurring occurrences.
+        """
+        first_day = FinancesValidations.month_bounds(*start)[0]
+        last_day = FinancesValidations.month_bounds(*end)[1]
+
+        concrete = (
+            self._get_concrete_expenses(first_day, last_day)
+            .order_by('due_date', 'id')
+            .iterator(chunk_size=chunk_size)
+        )
+        rules = list(self._get_recurring_rules(first_day, last_day))
+        return heapq.merge(
+            concrete,
+            self._iter_virtual_range(rules, start, end, first_day, last_day, chunk_size),
+            key=self._sort_key,
+        )
+
+    def history_bounds(
+        self, today: Optional[datetime.date] = None
+    ) -> Optional[Tuple[YearMonth, YearMonth]]:
+        """First and last month with any expense, or None when there is none.
+
+        Open-ended rules reach the current month, as in available_months.
+        Two aggregate queries, served by the (user, due_date) index and the
+        user's rules.
+        """
+        today = today or timezone.localdate()
+        concrete = Expense.objects.filter(user=self.user).aggregate(
+            first=Min('due_date'), last=Max('due_date')
+        )
+        rules = RecurringExpense.objects.filter(user=self.user, active=True).aggregate(
+            first=Min('start_date'),
+            last=Max('end_date'),
+            open_ended=Count('id', filter=Q(end_date__isnull=True)),
+        )
+
+        firsts = [day for day in (concrete['first'], rules['first']) if day]
+        if not firsts:
+            return None
+        first = min(firsts)
+        lasts = [day for day in (concrete['last'], rules['last']) if day]
+        if rules['open_ended']:
+            lasts.append(today)
+        last = max(lasts, default=first)
+        return (first.year, first.month), max((last.year, last.month), (first.year, first.month))
+
+    def page_for_month(
+        self,
+        year: int,
+        month: int,
+        limit: int,
+        after: Optional[Tuple[datetime.date, int]] = None,
+    ) -> Tuple[List[ListedExpense], Optional[Tuple[datetime.date, int]]]:
+        """Keyset page of the month ordered by (due_date, id).
+
+        Virtual expenses keep their negative ids, so the ordering is total
+        across both sources. Returns the page and the key to resume after,
+        or None when the month is exhausted.
+        """
+        first_day, last_day = FinancesValidations.month_bounds(year, month)
+        concrete = self._get_concrete_expenses(first_day, last_day).order_by('due_date', 'id')
+        if after is not None:
+            due_date, pk = after
+            concrete = concrete.filter(
+                Q(due_date__gt=due_date) | Q(due_date=due_date, id__gt=pk)
             )
+
+        merged = heapq.merge(
+            concrete[: limit + 1],
+            self._iter_virtual_expenses(year, month, after),
+            key=self._sort_key,
         )
-        virtual = self.get_virtual_expenses(year, month)
-        return sorted(concrete + virtual, key=lambda e: e.due_date)
+        page = list(islice(merged, limit + 1))
 
-    def available_months(self) -> List[Dict[str, int]]:
-        concrete = (
-            Expense.objects.filter(user=self.user)
-            .annotate(m=ExtractMonth('due_date'), y=ExtractYear('due_date'))
-            .values('m', 'y')
+        if len(page) <= limit:
+            return page, None
+        page = page[:limit]
+        return page, self._sort_key(page[-1])
+
+    def available_months(self, today: Optional[datetime.date] = None) -> List[Dict[str, int]]:
+        """Months with any expense, newest first.
+
+        Concrete months come from the rollup table and paid recurring months
+        from an indexed DISTINCT, so neither reads individual rows. Active
+        rules add every month between their start and end date (or the
+        current month when open-ended), merged as intervals.
+        """
+        today = today or timezone.localdate()
+        return self._merge_months(
+            self._concrete_months(), self._paid_months(), self._rule_spans(), today
         )
 
-        recurring = recurring = PaidRecurringExpense.objects.filter(
-            user=self.user
-        ).values('month', 'year')
+    async def aavailable_months(self, today: Optional[datetime.date] = None) -> List[Dict[str, int]]:
+        return await sync_to_async(self.available_months)(today)
 
-        combined = {(c['m'], c['y']) for c in concrete} | {
-            (r['month'], r['year']) for r in recurring
-        }
+    def _concrete_months(self):
+        return (
+            MonthlyCategoryRollup.objects.filter(user=self.user)
+            .order_by()
+            .values_list('year', 'month')
+            .distinct()
+        )
+
+    def _paid_months(self):
+        return (
+            PaidRecurringExpense.objects.filter(user=self.user)
+            .order_by()
+            .values_list('year', 'month')
+            .distinct()
+        )
+
+    def _rule_spans(self):
+        return (
+            RecurringExpense.objects.filter(user=self.user, active=True)
+            .order_by()
+            .values_list('start_date', 'end_date')
+            .distinct()
+        )
+
+    def _merge_months(self, concrete, paid, spans, today: datetime.date) -> List[Dict[str, int]]:
+        combined: Set[YearMonth] = set(concrete)
+        combined.update(paid)
+        for first, last in self._rule_month_intervals(spans, today):
+            combined.update(map(FinancesValidations.month_of, range(first, last + 1)))
 
         return [
             {'month': m, 'year': y}
-            for m, y in sorted(combined, key=lambda x: (x[1], x[0]), reverse=True)
+            for y, m in sorted(combined, reverse=True)
         ]
 
-    def get_virtual_expenses(self, year: int, month: int) -> List[Expense]:
-        FinancesValidations.validate_month_year(year, month)
-        rules = self._get_recurring_rules(year, month)
-        paid_map = self._get_paid_map(year, month)
-        return self._generate_virtual_expenses(rules, paid_map, year, month)
+    @staticmethod
+    def _rule_month_intervals(spans, today: datetime.date) -> List[Tuple[int, int]]:
+        current = FinancesValidations.date_month_index(today)
+        intervals = []
+        for start_date, end_date in spans:
+            first = FinancesValidations.date_month_index(start_date)
+            last = FinancesValidations.date_month_index(end_date) if end_date else current
+            if first <= last:
+                intervals.append((first, last))
+
+        merged: List[Tuple[int, int]] = []
+        for first, last in sorted(intervals):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        return merged
+
+    def get_virtual_expenses(self, year: int, month: int) -> List[VirtualExpense]:
+        year, month = FinancesValidations.validate_month_year(year, month)
+        first_day, last_day = FinancesValidations.month_bounds(year, month)
+        rules = list(self._get_recurring_rules(first_day, last_day))
+        paid_map = self._get_paid_map((year, month), (year, month))
+        return self._expansion(rules, first_day, last_day).expand_month(year, month, paid_map)
+
+    def _get_concrete_expenses(self, first_day: datetime.date, last_day: datetime.date):
+        return Expense.objects.select_related('category').filter(
+            user=self.user, due_date__range=(first_day, last_day)
+        )
 
-    def _get_recurring_rules(self, year: int, month: int):
-        first_day = datetime.date(year, month, 1)
-        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-        return RecurringExpense.objects.filter(
+    def _get_recurring_rules(self, first_day: datetime.date, last_day: datetime.date):
+        return RecurringExpense.objects.select_related('category').filter(
             user=self.user,
             active=True,
             start_date__lte=last_day,
         ).filter(Q(end_date__gte=first_day) | Q(end_date__isnull=True))
 
-    def _get_paid_map(self, year: int, month: int):
-        return {
-            (p.recurring_expense_id, p.month, p.year): True
-            for p in PaidRecurringExpense.objects.filter(
-                user=self.user, month=month, year=year
-            )
-        }
-
-    def _generate_virtual_expenses(self, rules, paid_map, year, month):
-        virtual_expenses = []
-        for rule in rules:
-            due_date = FinancesValidations.safe_due_date(year, month, rule.due_day)
-            is_paid = paid_map.get((rule.id, month, year), False)
-            virtual_expenses.append(
-                Expense(
-                    id=rule.id * -1,
-                    user=self.user,
-                    name=rule.name,
-                    amount=rule.amount,
-                    due_date=due_date,
-                    category=rule.category,
-                    paid=is_paid,
-                )
-            )
-        return virtual_expenses
+    @staticmethod
+    def _get_rule_versions(rules, first_day: datetime.date, last_day: datetime.date):
+        """Versions overlapping the range; no query unless a rule was edited since first_day."""
+        edited = [rule.id for rule in rules if edited_since(rule.versioned_until, first_day)]
+        if not edited:
+            return RecurringExpenseVersion.objects.none()
+        return RuleHistory.versions_in_range(edited, first_day, last_day)
+
+    def _expansion(self, rules, first_day: datetime.date, last_day: datetime.date):
+        histories = RuleHistory.group(self._get_rule_versions(rules, first_day, last_day))
+        return RecurringExpansionService(rules, histories)
+
+    def _get_paid_records(self, start: YearMonth, end: YearMonth):
+        return PaidRecurringExpense.objects.filter(
+            user=self.user, year__range=(start[0], end[0])
+        ).filter(FinancesValidations.month_range_q(start, end))
+
+    def _get_paid_map(self, start: YearMonth, end: YearMonth) -> Set[Tuple[int, int, int]]:
+        paid = self._get_paid_records(start, end)
+        return set(paid.values_list('recurring_expense_id', 'month', 'year'))
+
+    def _iter_virtual_range(
+        self,
+        rules,
+        start: YearMonth,
+        end: YearMonth,
+        first_day: datetime.date,
+        last_day: datetime.date,
+        chunk_size: int,
+    ) -> Iterator[VirtualExpense]:
+        if not rules:
+            return
+
+        engine = self._expansion(rules, first_day, last_day)
+        paid_rows = (
+            self._get_paid_records(start, end)
+            .order_by('year', 'month')
+            .values_list('year', 'month', 'recurring_expense_id')
+            .iterator(chunk_size=chunk_size)
+        )
+        pending = next(paid_rows, None)
+        for year, month in FinancesValidations.iter_months(start, end):
+            paid = set()
+            while pending is not None and (pending[0], pending[1]) <= (year, month):
+                if (pending[0], pending[1]) == (year, month):
+                    paid.add((pending[2], month, year))
+                pending = next(paid_rows, None)
+            yield from sorted(engine.expand_month(year, month, paid), key=self._sort_key)
+
+    def _iter_virtual_expenses(
+        self, year: int, month: int, after: Optional[Tuple[datetime.date, int]]
+    ) -> Iterator[VirtualExpense]:
+        first_day, last_day = FinancesValidations.month_bounds(year, month)
+        rules = list(self._get_recurring_rules(first_day, last_day))
+        records = sorted(
+            self._expansion(rules, first_day, last_day).expand_month(year, month),
+            key=self._sort_key,
+        )
+        if after is not None:
+            records = [record for record in records if self._sort_key(record) > after]
+        if not records:
+            return
+
+        paid_map = self._get_paid_map((year, month), (year, month))
+        for record in records:
+            record.paid = (record.rule_id, month, year) in paid_map
+            yield record
+
+    @staticmethod
+    def _sort_key(expense: ListedExpense) -> Tuple[datetime.date, int]:
+        return expense.due_date, expense.id
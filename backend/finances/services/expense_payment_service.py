@@ -1,4 +1,9 @@
-from finances.models import Expense, PaidRecurringExpense
+from django.db import transaction
+from django.utils import timezone
+
+from finances.models import Expense, PaidRecurringExpense, RecurringExpense
+from finances.services.month_cache_service import get_month_cache
+from finances.services.rollup_service import RollupService
 
 
 class ExpensePaymentService:
@@ -8,7 +13,7 @@ class ExpensePaymentService:
         self.month = month
         self.year = year
         self.concrete_ids = []
-        self.recurring_payloads = []
+        self.recurring_ids = []
 
         self._validate_and_extract()
 
@@ -25,33 +30,87 @@ class ExpensePaymentService:
             elif typ == 'r':
                 if not self.month or not self.year:
                     raise ValueError('Mês e ano são obrigatórios para recorrentes')
-                self.recurring_payloads.append({
-                    'recurring_expense_id': raw_id,
-                    'month': self.month,
-                    'year': self.year
-                })
+                try:
+                    self.recurring_ids.append(int(raw_id))
+                except (TypeError, ValueError):
+                    raise ValueError('Formato de dados inválido')
+
+        if self.recurring_ids:
+            try:
+                self.month, self.year = int(self.month), int(self.year)
+            except (TypeError, ValueError):
+                raise ValueError('Ano e mês devem ser números inteiros.')
+
+    def _check_recurring_ownership(self):
+        owned = set(
+            RecurringExpense.objects.filter(
+                user=self.user, id__in=self.recurring_ids
+            ).values_list('id', flat=True)
+        )
+        if owned != set(self.recurring_ids):
+            raise ValueError('Despesa recorrente não encontrada.')
+
+    def _set_concrete_paid(self, paid: bool):
+        flipping = list(
+            Expense.objects.select_for_update()
+            .filter(user=self.user, id__in=self.concrete_ids)
+            .exclude(paid=paid)
+            .only('id', 'amount', 'due_date', 'category_id')
+        )
+        if not flipping:
+            return
+
+        Expense.objects.filter(id__in=[e.id for e in flipping]).update(
+            paid=paid, updated_at=timezone.now()
+        )
+        RollupService(self.user).change_paid(flipping, paid)
 
     def mark(self):
-        if self.concrete_ids:
-            Expense.objects.filter(user=self.user, id__in=self.concrete_ids).update(paid=True)
-
-        for payload in self.recurring_payloads:
-            PaidRecurringExpense.objects.get_or_create(
-                user=self.user,
-                recurring_expense_id=payload['recurring_expense_id'],
-                month=payload['month'],
-                year=payload['year'],
-                defaults={'day': 1},
-            )
+        with transaction.atomic():
+            if self.concrete_ids:
+                self._set_concrete_paid(True)
+
+            if self.recurring_ids:
+                self._check_recurring_ownership()
+                PaidRecurringExpense.objects.bulk_create(
+                    [
+                        PaidRecurringExpense(
+                            user=self.user,
+                            recurring_expense_id=recurring_id,
+                            month=self.month,
+                            year=self.year,
+                            day=1,
+                        )
+                        for recurring_id in set(self.recurring_ids)
+                    ],
+                    ignore_conflicts=True,
+                )
+
+            self._invalidate_cache()
 
     def unmark(self):
+        with transaction.atomic():
+            if self.concrete_ids:
+                self._set_concrete_paid(False)
+
+            if self.recurring_ids:
+                PaidRecurringExpense.objects.filter(
+                    user=self.user,
+                    recurring_expense_id__in=self.recurring_ids,
+                    month=self.month,
+                    year=self.year,
+                ).delete()
+
+            self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        cache = get_month_cache()
         if self.concrete_ids:
-            Expense.objects.filter(user=self.user, id__in=self.concrete_ids).update(paid=False)
-
-        for payload in self.recurring_payloads:
-            PaidRecurringExpense.objects.filter(
-                user=self.user,
-                recurring_expense_id=payload['recurring_expense_id'],
-                month=payload['month'],
-                year=payload['year'],
-            ).delete()
+            cache.invalidate_dates(
+                self.user.id,
+                Expense.objects.filter(user=self.user, id__in=self.concrete_ids).dates(
+                    'due_date', 'month'
+                ),
+            )
+        if self.recurring_ids:
+            cache.invalidate_months(self.user.id, [(self.year, self.month)])
@@ -0,0 +1,194 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Count, F, Lookup, Q, Sum
+from django.db.models.expressions import RawSQL
+
+from finances.models import Expense, MonthlyCategoryRollup, RecurringExpense
+from finances.utils.validations import FinancesValidations
+
+YearMonth = Tuple[int, int]
+
+# the FTS5 trigram tokenizer cannot match anything shorter than one trigram
+MIN_INDEXED_QUERY = 3
+
+
+class ILikeContains(Lookup):
+    """``lhs ILIKE rhs``, with the ``%`` wildcards already in ``rhs``.
+
+    Django compiles ``icontains`` to ``UPPER(name::text) LIKE UPPER(...)`` on
+    PostgreSQL, which a ``gin_trgm_ops`` index on the bare column cannot
+    serve; pg_trgm answers ILIKE directly.
+    """
+
+    lookup_name = 'ilike_contains'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', (*lhs_params, *rhs_params)
+
+
+class ExpenseSearchService:
+    """Filtered, keyset-paginated search over expenses and recurring rules.
+
+    Names are matched through the FTS5 trigram tables on SQLite and through
+    the pg_trgm indexes on PostgreSQL, both created by migration 0007; the
+    other filters ride on the (user, amount) and (user, category, due_date)
+    indexes. Facets count the concrete expenses matching every filter,
+    straight from MonthlyCategoryRollup when no filter needs the rows
+    themselves. Recurring rules are matched by name, category, amount and
+    active window; ``paid`` is per month for them and is not applied.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def search(
+        self,
+        query: str = '',
+        category_id: Optional[int] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        paid: Optional[bool] = None,
+        start: Optional[YearMonth] = None,
+        end: Optional[YearMonth] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime.date, int]] = None,
+        with_facets: bool = True,
+    ) -> Dict:
+        """Page of matches ordered by (due_date, id) and the key to resume after.
+
+        Facets and recurring matches describe the whole result set, so they
+        are only computed when ``with_facets`` is set, i.e. for the first page.
+        """
+        first_day = FinancesValidations.month_bounds(*start)[0] if start else None
+        last_day = FinancesValidations.month_bounds(*end)[1] if end else None
+
+        expenses = Expense.objects.filter(user=self.user)
+        expenses = self._match_name(expenses, query)
+        if category_id is not None:
+            expenses = expenses.filter(category_id=category_id)
+        if min_amount is not None:
+            expenses = expenses.filter(amount__gte=min_amount)
+        if max_amount is not None:
+            expenses = expenses.filter(amount__lte=max_amount)
+        if paid is not None:
+            expenses = expenses.filter(paid=paid)
+        if first_day is not None:
+            expenses = expenses.filter(due_date__gte=first_day)
+        if last_day is not None:
+            expenses = expenses.filter(due_date__lte=last_day)
+
+        page = expenses.select_related('category').order_by('due_date', 'id')
+        if after is not None:
+            due_date, pk = after
+            page = page.filter(Q(due_date__gt=due_date) | Q(due_date=due_date, id__gt=pk))
+        results = list(page[: limit + 1])
+        next_key = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_key = (results[-1].due_date, results[-1].id)
+
+        result = {'results': results, 'next_key': next_key}
+        if not with_facets:
+            return result
+
+        if query or min_amount is not None or max_amount is not None or paid is not None:
+            result['facets'] = self._row_facets(expenses)
+        else:
+            result['facets'] = self._rollup_facets(category_id, start, end)
+        result['recurring'] = self._match_rules(
+            query, category_id, min_amount, max_amount, first_day, last_day
+        )
+        return result
+
+    def _match_name(self, queryset, query: str):
+        if not query:
+            return queryset
+        connection = connections[queryset.db]
+        if connection.vendor == 'sqlite' and len(query) >= MIN_INDEXED_QUERY:
+            table = queryset.model._meta.db_table
+            phrase = '"{}"'.format(query.replace('"', '""'))
+            return queryset.filter(
+                id__in=RawSQL(f'SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s', [phrase])
+            )
+        if connection.vendor == 'postgresql':
+            pattern = '%{}%'.format(connection.ops.prep_for_like_query(query))
+            return queryset.filter(ILikeContains(F('name'), pattern))
+        return queryset.filter(name__icontains=query)
+
+    def _match_rules(
+        self, query, category_id, min_amount, max_amount, first_day, last_day
+    ) -> List[RecurringExpense]:
+        rules = RecurringExpense.objects.filter(user=self.user, active=True)
+        rules = self._match_name(rules, query)
+        if category_id is not None:
+            rules = rules.filter(category_id=category_id)
+        if min_amount is not None:
+            rules = rules.filter(amount__gte=min_amount)
+        if max_amount is not None:
+            rules = rules.filter(amount__lte=max_amount)
+        if last_day is not None:
+            rules = rules.filter(start_date__lte=last_day)
+        if first_day is not None:
+            rules = rules.filter(Q(end_date__gte=first_day) | Q(end_date__isnull=True))
+        return list(rules.order_by('name', 'id'))
+
+    @staticmethod
+    def _row_facets(expenses) -> Dict[str, List[Dict]]:
+        by_category = (
+            expenses.order_by()
+            .values('category_id', 'category__name')
+            .annotate(count=Count('id'))
+        )
+        # grouping on the raw date keeps SQLite off its Python date-extract
+        # functions; a decade has a few thousand days to fold into months
+        by_month: Dict[YearMonth, int] = defaultdict(int)
+        for row in expenses.order_by().values('due_date').annotate(count=Count('id')):
+            by_month[row['due_date'].year, row['due_date'].month] += row['count']
+        months = (
+            {'year': year, 'month': month, 'count': count}
+            for (year, month), count in by_month.items()
+        )
+        return ExpenseSearchService._facets(by_category, months)
+
+    def _rollup_facets(self, category_id, start, end) -> Dict[str, List[Dict]]:
+        rollups = MonthlyCategoryRollup.objects.filter(user=self.user)
+        if category_id is not None:
+            rollups = rollups.filter(category_id=category_id)
+        rollups = rollups.filter(FinancesValidations.month_range_q(start, end))
+
+        by_category = (
+            rollups.order_by()
+            .values('category_id', 'category__name')
+            .annotate(count=Sum('count'))
+        )
+        by_month = rollups.order_by().values('year', 'month').annotate(count=Sum('count'))
+        return ExpenseSearchService._facets(by_category, by_month)
+
+    @staticmethod
+    def _facets(by_category, by_month) -> Dict[str, List[Dict]]:
+        categories = sorted(
+            (
+                {'id': row['category_id'], 'name': row['category__name'], 'count': row['count']}
+                for row in by_category
+                if row['count']
+            ),
+            key=lambda c: (c['name'] is None, c['name'] or ''),
+        )
+        months = sorted(
+            (
+                {'year': row['year'], 'month': row['month'], 'count': row['count']}
+                for row in by_month
+                if row['count']
+            ),
+            key=lambda m: (m['year'], m['month']),
+            reverse=True,
+        )
+        return {'categories': categories, 'months': months}
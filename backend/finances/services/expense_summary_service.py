@@ -0,0 +1,199 @@
+import datetime
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from finances.models import Expense, MonthlyCategoryRollup, PaidRecurringExpense, RecurringExpense
+from finances.services.recurring_expansion_service import RuleHistory, edited_since
+from finances.utils.validations import FinancesValidations
+
+YearMonth = Tuple[int, int]
+ZERO = Decimal('0.00')
+
+
+class ExpenseSummaryService:
+    """Totals per category and paid/unpaid/overdue sums for a month range.
+
+    Concrete expenses are read from MonthlyCategoryRollup, one row per month
+    and category; only the month in progress goes back to Expense to split
+    overdue amounts by due date. Recurring rules come from one aggregate query
+    annotated with their paid counts, and their months are counted
+    arithmetically instead of being expanded. Rules edited inside the range
+    are walked month by month against their RuleHistory instead.
+    """
+
+    def __init__(self, user: User, today: Optional[datetime.date] = None):
+        self.user = user
+        self.today = today or timezone.localdate()
+
+    def summarize(self, start: YearMonth, end: YearMonth) -> Dict:
+        first_day = FinancesValidations.month_bounds(*start)[0]
+        last_day = FinancesValidations.month_bounds(*end)[1]
+
+        categories: Dict[Optional[int], Dict] = {}
+        self._add_concrete(categories, start, end)
+        self._add_recurring(categories, start, end, first_day, last_day)
+
+        rows = sorted(
+            categories.values(), key=lambda c: (c['name'] is None, c['name'] or '')
+        )
+        for row in rows:
+            row['unpaid'] = row['total'] - row['paid']
+
+        totals = {
+            key: sum((row[key] for row in rows), ZERO)
+            for key in ('total', 'paid', 'unpaid', 'overdue')
+        }
+        return {**totals, 'categories': rows}
+
+    def _bucket(self, categories, category_id, name) -> Dict:
+        if category_id not in categories:
+            categories[category_id] = {
+                'id': category_id,
+                'name': name,
+                'total': ZERO,
+                'paid': ZERO,
+                'overdue': ZERO,
+            }
+        return categories[category_id]
+
+    def _add_concrete(self, categories, start, end):
+        in_range = FinancesValidations.month_range_q(start, end)
+        rows = (
+            MonthlyCategoryRollup.objects.filter(in_range, user=self.user)
+            .order_by()
+            .values('year', 'month', 'category_id', 'category__name', 'amount', 'paid_amount')
+        )
+
+        today_month = (self.today.year, self.today.month)
+        for row in rows:
+            bucket = self._bucket(categories, row['category_id'], row['category__name'])
+            bucket['total'] += row['amount']
+            bucket['paid'] += row['paid_amount']
+            if (row['year'], row['month']) < today_month:
+                bucket['overdue'] += row['amount'] - row['paid_amount']
+
+        if start <= today_month <= end:
+            self._add_current_month_overdue(categories)
+
+    def _add_current_month_overdue(self, categories):
+        """Rollups are monthly, so the month in progress is split by due date in SQL."""
+        first_day = self.today.replace(day=1)
+        rows = (
+            Expense.objects.filter(
+                user=self.user, paid=False, due_date__gte=first_day, due_date__lt=self.today
+            )
+            .order_by()
+            .values('category_id', 'category__name')
+            .annotate(overdue_amount=Sum('amount'))
+        )
+        for row in rows:
+            bucket = self._bucket(categories, row['category_id'], row['category__name'])
+            bucket['overdue'] += row['overdue_amount'] or ZERO
+
+    def _add_recurring(self, categories, start, end, first_day, last_day):
+        today_year, today_month = self.today.year, self.today.month
+
+        paid_in_range = Q(
+            paid_recurring_expenses__year__range=(start[0], end[0])
+        ) & FinancesValidations.month_range_q(start, end, prefix='paid_recurring_expenses__')
+        before_today_month = Q(paid_recurring_expenses__year__lt=today_year) | Q(
+            paid_recurring_expenses__year=today_year,
+            paid_recurring_expenses__month__lt=today_month,
+        )
+        in_today_month = Q(
+            paid_recurring_expenses__year=today_year,
+            paid_recurring_expenses__month=today_month,
+        )
+
+        rules = (
+            RecurringExpense.objects.filter(
+                user=self.user, active=True, start_date__lte=last_day
+            )
+            .filter(Q(end_date__gte=first_day) | Q(end_date__isnull=True))
+            .order_by()
+            .values(
+                'id',
+                'amount',
+                'due_day',
+                'start_date',
+                'end_date',
+                'versioned_until',
+                'category_id',
+                'category__name',
+            )
+            .annotate(
+                paid_months=Count('paid_recurring_expenses', filter=paid_in_range),
+                paid_before_today=Count(
+                    'paid_recurring_expenses', filter=paid_in_range & before_today_month
+                ),
+                paid_today_month=Count(
+                    'paid_recurring_expenses', filter=paid_in_range & in_today_month
+                ),
+            )
+        )
+
+        range_start = FinancesValidations.month_index(*start)
+        range_end = FinancesValidations.month_index(*end)
+        today_index = FinancesValidations.month_index(today_year, today_month)
+
+        edited = []
+        for rule in rules:
+            window_start = max(range_start, FinancesValidations.date_month_index(rule['start_date']))
+            window_end = range_end
+            if rule['end_date'] is not None:
+                window_end = min(window_end, FinancesValidations.date_month_index(rule['end_date']))
+            months = window_end - window_start + 1
+            if months <= 0:
+                continue
+            if edited_since(rule['versioned_until'], first_day):
+                edited.append((window_start, window_end, rule))
+                continue
+
+            past_months = max(min(window_end, today_index - 1) - window_start + 1, 0)
+            overdue_months = max(past_months - rule['paid_before_today'], 0)
+            if window_start <= today_index <= window_end and not rule['paid_today_month']:
+                due_date = FinancesValidations.safe_due_date(
+                    today_year, today_month, rule['due_day']
+                )
+                overdue_months += due_date < self.today
+
+            amount = rule['amount']
+            bucket = self._bucket(categories, rule['category_id'], rule['category__name'])
+            bucket['total'] += amount * months
+            bucket['paid'] += amount * min(rule['paid_months'], months)
+            bucket['overdue'] += amount * overdue_months
+
+        if edited:
+            self._add_edited_recurring(categories, edited, start, end, first_day, last_day)
+
+    def _add_edited_recurring(self, categories, edited, start, end, first_day, last_day):
+        """Per-month totals for rules whose amount or due day changed within the range."""
+        rule_ids = [rule['id'] for _, _, rule in edited]
+        histories = RuleHistory.group(RuleHistory.versions_in_range(rule_ids, first_day, last_day))
+        paid = set(
+            PaidRecurringExpense.objects.filter(
+                FinancesValidations.month_range_q(start, end), recurring_expense_id__in=rule_ids
+            ).values_list('recurring_expense_id', 'year', 'month')
+        )
+        today_index = FinancesValidations.month_index(self.today.year, self.today.month)
+
+        for window_start, window_end, rule in edited:
+            history = histories.get(rule['id'])
+            bucket = self._bucket(categories, rule['category_id'], rule['category__name'])
+            for index in range(window_start, window_end + 1):
+                amount, due_day = rule['amount'], rule['due_day']
+                if history is not None:
+                    amount, due_day = history.at(index) or (amount, due_day)
+                year, month = FinancesValidations.month_of(index)
+                bucket['total'] += amount
+                if (rule['id'], year, month) in paid:
+                    bucket['paid'] += amount
+                elif index < today_index or (
+                    index == today_index
+                    and FinancesValidations.safe_due_date(year, month, due_day) < self.today
+                ):
+                    bucket['overdue'] += amount
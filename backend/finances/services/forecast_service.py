@@ -0,0 +1,161 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils import timezone
+
+from finances.models import MonthlyCategoryRollup, PaidRecurringExpense, RecurringExpense
+from finances.services.recurring_expansion_service import RuleHistory, edited_since
+from finances.utils.validations import FinancesValidations
+
+ZERO = Decimal('0.00')
+
+
+class ForecastService:
+    """Projected obligations per month and category, starting this month.
+
+    Concrete expenses, installments included, come from the rollup table.
+    Each recurring rule adds its amount to a per-category difference array at
+    the first month of its window and subtracts it after the last, so one
+    prefix sum yields every month's recurring total without expanding
+    occurrences; past versions of edited rules are applied the same way, as
+    corrections over their segments. At most three queries regardless of the
+    horizon, four when a rule's history reaches into it.
+    """
+
+    def __init__(self, user: User, today: Optional[datetime.date] = None):
+        self.user = user
+        self.today = today or timezone.localdate()
+
+    def forecast(self, months: int) -> Dict:
+        first = FinancesValidations.month_index(self.today.year, self.today.month)
+        last = first + months - 1
+
+        names: Dict[Optional[int], Optional[str]] = {}
+        totals: Dict[Optional[int], List[Decimal]] = defaultdict(lambda: [ZERO] * months)
+        paid = [ZERO] * months
+
+        self._add_concrete(first, last, names, totals, paid)
+        self._add_recurring(first, last, names, totals, paid)
+
+        category_ids = sorted(names, key=lambda c: (names[c] is None, names[c] or ''))
+        rows = []
+        for offset in range(months):
+            year, month = FinancesValidations.month_of(first + offset)
+            categories = [
+                {'id': category_id, 'name': names[category_id], 'total': totals[category_id][offset]}
+                for category_id in category_ids
+                if totals[category_id][offset]
+            ]
+            total = sum((category['total'] for category in categories), ZERO)
+            rows.append({
+                'year': year,
+                'month': month,
+                'total': total,
+                'paid': paid[offset],
+                'unpaid': total - paid[offset],
+                'categories': categories,
+            })
+
+        return {
+            'total': sum((row['total'] for row in rows), ZERO),
+            'unpaid': sum((row['unpaid'] for row in rows), ZERO),
+            'months': rows,
+        }
+
+    def _add_concrete(self, first, last, names, totals, paid):
+        in_range = FinancesValidations.month_range_q(
+            FinancesValidations.month_of(first), FinancesValidations.month_of(last)
+        )
+        rows = (
+            MonthlyCategoryRollup.objects.filter(in_range, user=self.user)
+            .order_by()
+            .values('year', 'month', 'category_id', 'category__name', 'amount', 'paid_amount')
+        )
+        for row in rows:
+            offset = FinancesValidations.month_index(row['year'], row['month']) - first
+            names[row['category_id']] = row['category__name']
+            totals[row['category_id']][offset] += row['amount']
+            paid[offset] += row['paid_amount']
+
+    def _add_recurring(self, first, last, names, totals, paid):
+        months = last - first + 1
+        first_day = FinancesValidations.month_bounds(*FinancesValidations.month_of(first))[0]
+        last_day = FinancesValidations.month_bounds(*FinancesValidations.month_of(last))[1]
+
+        rules = (
+            RecurringExpense.objects.filter(user=self.user, active=True, start_date__lte=last_day)
+            .filter(Q(end_date__gte=first_day) | Q(end_date__isnull=True))
+            .order_by()
+            .values(
+                'id',
+                'amount',
+                'start_date',
+                'end_date',
+                'versioned_until',
+                'category_id',
+                'category__name',
+            )
+        )
+
+        windows = {}
+        edited = {}
+        deltas: Dict[Optional[int], List[Decimal]] = defaultdict(lambda: [ZERO] * (months + 1))
+        for rule in rules:
+            start = max(FinancesValidations.date_month_index(rule['start_date']), first)
+            end = last
+            if rule['end_date'] is not None:
+                end = min(FinancesValidations.date_month_index(rule['end_date']), last)
+            windows[rule['id']] = (start, end, rule['amount'], None)
+            names[rule['category_id']] = rule['category__name']
+            deltas[rule['category_id']][start - first] += rule['amount']
+            deltas[rule['category_id']][end - first + 1] -= rule['amount']
+            if edited_since(rule['versioned_until'], first_day):
+                edited[rule['id']] = rule
+
+        if edited:
+            histories = RuleHistory.group(
+                RuleHistory.versions_in_range(edited, first_day, last_day)
+            )
+            for rule_id, history in histories.items():
+                rule = edited[rule_id]
+                start, end, amount, _ = windows[rule_id]
+                windows[rule_id] = (start, end, amount, history)
+                for segment_start, (segment_end, segment_amount, _) in zip(
+                    history.starts, history.segments
+                ):
+                    segment_start, segment_end = max(segment_start, start), min(segment_end, end)
+                    if segment_start > segment_end:
+                        continue
+                    correction = segment_amount - amount
+                    deltas[rule['category_id']][segment_start - first] += correction
+                    deltas[rule['category_id']][segment_end - first + 1] -= correction
+
+        for category_id, delta in deltas.items():
+            running = ZERO
+            category_totals = totals[category_id]
+            for offset in range(months):
+                running += delta[offset]
+                category_totals[offset] += running
+
+        if not windows:
+            return
+
+        in_range = FinancesValidations.month_range_q(
+            FinancesValidations.month_of(first), FinancesValidations.month_of(last)
+        )
+        records = PaidRecurringExpense.objects.filter(in_range, user=self.user).values_list(
+            'recurring_expense_id', 'year', 'month'
+        )
+        for rule_id, year, month in records:
+            window = windows.get(rule_id)
+            index = FinancesValidations.month_index(year, month)
+            if window is None or not window[0] <= index <= window[1]:
+                continue
+            start, end, amount, history = window
+            if history is not None:
+                amount = (history.at(index) or (amount,))[0]
+            paid[index - first] += amount
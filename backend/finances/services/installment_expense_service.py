@@ -1,10 +1,14 @@
 import datetime
-from decimal import Decimal
+from decimal import ROUND_DOWN, Decimal
+from typing import List, Tuple
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.auth.models import User
+from django.db import transaction
 
 from finances.models import InstallmentExpense, Expense, Category
+from finances.services.month_cache_service import get_month_cache
+from finances.services.rollup_service import RollupService
 
 
 class InstallmentExpenseService:
@@ -25,19 +29,24 @@ class InstallmentExpenseService:
         self.category_id = category_id
 
     def create_installment_expense(self) -> InstallmentExpense:
-        category = self._get_category()
+        if self.installments_quantity < 1:
+            raise ValueError('Quantidade de parcelas deve ser maior que zero.')
 
-        installment_expense = InstallmentExpense.objects.create(
-            user=self.user,
-            name=self.name,
-            total_amount=self.total_amount,
-            installments_quantity=self.installments_quantity,
-            first_due_date=self.first_due_date,
-            category=category
-        )
+        category = self._get_category()
 
-        self._create_expenses(installment_expense, category)
+        with transaction.atomic():
+            installment_expense = InstallmentExpense.objects.create(
+                user=self.user,
+                name=self.name,
+                total_amount=self.total_amount,
+                installments_quantity=self.installments_quantity,
+                first_due_date=self.first_due_date,
+                category=category
+            )
+            expenses = self._create_expenses(installment_expense, category)
+            RollupService(self.user).add_expenses(expenses)
 
+        get_month_cache().invalidate_dates(self.user.id, (e.due_date for e in expenses))
         return installment_expense
 
     def _get_category(self) -> Category:
@@ -46,18 +55,43 @@ class InstallmentExpenseService:
         except Category.DoesNotExist:
             raise ValueError('Categoria não encontrada.')
 
-    def _create_expenses(self, installment_expense: InstallmentExpense, category: Category):
-        installment_amount = round(self.total_amount / self.installments_quantity, 2)
+    def _build_schedule(self) -> List[Tuple[datetime.date, Decimal]]:
+        return self.build_schedule(self.total_amount, self.installments_quantity, self.first_due_date)
 
-        for i in range(self.installments_quantity):
-            due_date = self.first_due_date + relativedelta(months=i)
-            expense_name = f'{self.name} ({i+1}/{self.installments_quantity})'
+    @staticmethod
+    def build_schedule(
+        total_amount, installments_quantity: int, first_due_date: datetime.date
+    ) -> List[Tuple[datetime.date, Decimal]]:
+        """(due_date, amount) per installment; the rounding remainder goes on the last one."""
+        total_amount = Decimal(total_amount)
+        installment_amount = (total_amount / installments_quantity).quantize(
+            Decimal('0.01'), rounding=ROUND_DOWN
+        )
+        last_amount = total_amount - installment_amount * (installments_quantity - 1)
+
+        return [
+            (
+                first_due_date + relativedelta(months=i),
+                last_amount if i == installments_quantity - 1 else installment_amount,
+            )
+            for i in range(installments_quantity)
+        ]
 
-            Expense.objects.create(
+    @staticmethod
+    def installment_name(name: str, index: int, installments_quantity: int) -> str:
+        return f'{name} ({index + 1}/{installments_quantity})'
+
+    def _create_expenses(
+        self, installment_expense: InstallmentExpense, category: Category
+    ) -> List[Expense]:
+        return Expense.objects.bulk_create(
+            Expense(
                 user=self.user,
-                name=expense_name,
-                amount=installment_amount,
+                name=self.installment_name(self.name, i, self.installments_quantity),
+                amount=amount,
                 due_date=due_date,
                 category=category,
                 installment_origin=installment_expense
             )
+            for i, (due_date, amount) in enumerate(self._build_schedule())
+        )
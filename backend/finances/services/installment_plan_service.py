@@ -0,0 +1,136 @@
+import copy
+from typing import Dict, Iterable
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from finances.models import Category, Expense, InstallmentExpense
+from finances.services.installment_expense_service import InstallmentExpenseService
+from finances.services.month_cache_service import get_month_cache
+from finances.services.rollup_service import RollupService
+
+
+def _delete_rows(queryset) -> int:
+    """QuerySet.delete() returning the count for the queryset's own model.
+
+    Expense has no dependents, so with no delete signal connected Django's
+    collector removes it with a single DELETE, without loading the rows.
+    """
+    return queryset.delete()[1].get(queryset.model._meta.label, 0)
+
+
+class InstallmentPlanService:
+    """Operations on existing installment plans, set-based across many plans."""
+
+    SCHEDULE_FIELDS = ('name', 'amount', 'due_date', 'category_id')
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def update_plan(self, plan: InstallmentExpense, **changes) -> InstallmentExpense:
+        """Applies plan edits and propagates them to the installments.
+
+        The new schedule is diffed against the current installments in due
+        date order: rows that changed go through one bulk_update, surplus
+        rows through one DELETE and missing ones through one bulk_create.
+        Installments that survive keep their ``paid`` flag.
+        """
+        if 'category_id' in changes and not Category.objects.filter(
+            id=changes['category_id'], user=self.user
+        ).exists():
+            raise ValueError('Categoria não encontrada.')
+        if changes.get('installments_quantity', plan.installments_quantity) < 1:
+            raise ValueError('Quantidade de parcelas deve ser maior que zero.')
+
+        with transaction.atomic():
+            if not InstallmentExpense.objects.select_for_update().filter(
+                pk=plan.pk, user=self.user
+            ).exists():
+                raise ValueError('Parcelamento não encontrado.')
+            for attr, value in changes.items():
+                setattr(plan, attr, value)
+            plan.save()
+
+            installments = list(plan.expenses.order_by('due_date', 'id'))
+            previous = [copy.copy(expense) for expense in installments]
+            schedule = InstallmentExpenseService.build_schedule(
+                plan.total_amount, plan.installments_quantity, plan.first_due_date
+            )
+
+            now = timezone.now()
+            changed = []
+            for index, (expense, (due_date, amount)) in enumerate(zip(installments, schedule)):
+                target = {
+                    'name': InstallmentExpenseService.installment_name(
+                        plan.name, index, plan.installments_quantity
+                    ),
+                    'amount': amount,
+                    'due_date': due_date,
+                    'category_id': plan.category_id,
+                }
+                if all(getattr(expense, field) == value for field, value in target.items()):
+                    continue
+                for field, value in target.items():
+                    setattr(expense, field, value)
+                expense.updated_at = now
+                changed.append(expense)
+
+            if changed:
+                Expense.objects.bulk_update(changed, [*self.SCHEDULE_FIELDS, 'updated_at'])
+
+            surplus = installments[len(schedule):]
+            if surplus:
+                _delete_rows(Expense.objects.filter(id__in=[expense.id for expense in surplus]))
+
+            created = Expense.objects.bulk_create(
+                Expense(
+                    user=self.user,
+                    name=InstallmentExpenseService.installment_name(
+                        plan.name, index, plan.installments_quantity
+                    ),
+                    amount=amount,
+                    due_date=due_date,
+                    category_id=plan.category_id,
+                    installment_origin=plan,
+                )
+                for index, (due_date, amount) in enumerate(
+                    schedule[len(installments):], start=len(installments)
+                )
+            )
+
+            RollupService(self.user).replace_expenses(previous, installments[: len(schedule)] + created)
+            get_month_cache().invalidate_dates(
+                self.user.id,
+                [e.due_date for e in previous] + [e.due_date for e in installments + created],
+            )
+
+        return plan
+
+    def delete_plans(self, plan_ids: Iterable) -> Dict[str, int]:
+        """Deletes the plans and their installments in one transaction.
+
+        Installments are deleted before the plans, so the collector finds no
+        dependents left when it removes the plan rows. The query count does
+        not depend on how many plans or installments are removed.
+        """
+        try:
+            plan_ids = {int(plan_id) for plan_id in plan_ids}
+        except (TypeError, ValueError):
+            raise ValueError('Formato de dados inválido')
+        if not plan_ids:
+            raise ValueError('Informe ao menos um parcelamento.')
+
+        with transaction.atomic():
+            plans = InstallmentExpense.objects.filter(user=self.user, id__in=plan_ids)
+            if plans.count() != len(plan_ids):
+                raise ValueError('Parcelamento não encontrado.')
+
+            expenses = Expense.objects.filter(user=self.user, installment_origin_id__in=plan_ids)
+            months = list(expenses.dates('due_date', 'month'))
+            RollupService(self.user).remove_queryset(expenses)
+            deleted_expenses = _delete_rows(expenses)
+            deleted_plans = _delete_rows(plans)
+            get_month_cache().invalidate_dates(self.user.id, months)
+
+        return {'deleted_plans': deleted_plans, 'deleted_expenses': deleted_expenses}
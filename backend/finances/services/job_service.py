@@ -0,0 +1,199 @@
+import datetime
+import logging
+import os
+import socket
+import threading
+from decimal import Decimal
+from typing import Callable, Dict, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from finances.models import Job
+from finances.services.expense_import_service import ExpenseImportService
+from finances.services.installment_expense_service import InstallmentExpenseService
+from finances.services.rollup_service import RollupService
+
+logger = logging.getLogger('finances.jobs')
+
+
+class JobHandler(NamedTuple):
+    run: Callable
+    # safe to start over after a worker died mid-run
+    retryable: bool = False
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, retryable: bool = False):
+    """Registers ``func(job, progress)`` as the runner of ``kind`` jobs."""
+    def decorator(func):
+        JOB_HANDLERS[kind] = JobHandler(func, retryable)
+        return func
+    return decorator
+
+
+def _setting(name: str):
+    return settings.FINANCES_JOBS[name]
+
+
+class JobService:
+    """Queues jobs for one user, within the per-user pending limit."""
+
+    def __init__(self, user: User):
+        self.user = user
+
+    @transaction.atomic
+    def enqueue(self, kind: str, payload: Dict, total: Optional[int] = None) -> Job:
+        if kind not in JOB_HANDLERS:
+            raise ValueError('Tipo de tarefa desconhecido.')
+        # concurrent enqueues for the user wait here, so each count sees the others' jobs
+        User.objects.select_for_update().filter(pk=self.user.pk).first()
+        pending = Job.objects.filter(user=self.user, status=Job.Status.PENDING).count()
+        if pending >= _setting('MAX_PENDING_PER_USER'):
+            raise ValueError('Limite de tarefas pendentes atingido.')
+        return Job.objects.create(user=self.user, kind=kind, payload=payload, total=total)
+
+
+class JobRunner:
+    """Claims queued jobs and runs them, one job per call.
+
+    A job is claimed with a compare-and-swap ``UPDATE`` that only succeeds
+    while it is still pending and its user runs fewer than
+    MAX_RUNNING_PER_USER jobs, so one user's backlog cannot occupy every
+    worker thread. SQLite serializes those writes; where the database
+    supports ``SELECT ... FOR UPDATE SKIP LOCKED`` the claim first locks the
+    user's row, skipping users another worker is claiming for, so the
+    running count only ever races against committed claims.
+    """
+
+    claim_batch = 10
+
+    def __init__(self, worker: Optional[str] = None):
+        self.worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+
+    def _candidates(self):
+        saturated = (
+            Job.objects.filter(status=Job.Status.RUNNING)
+            .order_by()
+            .values('user_id')
+            .annotate(running=Count('id'))
+            .filter(running__gte=_setting('MAX_RUNNING_PER_USER'))
+            .values('user_id')
+        )
+        return (
+            Job.objects.filter(status=Job.Status.PENDING)
+            .exclude(user_id__in=saturated)
+            .order_by('created_at', 'id')
+        )
+
+    def claim(self) -> Optional[Job]:
+        claimed = {
+            'status': Job.Status.RUNNING,
+            'worker': f'{self.worker}:{threading.get_ident()}',
+            'attempts': F('attempts') + 1,
+            'started_at': timezone.now(),
+            'updated_at': timezone.now(),
+        }
+
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        candidates = self._candidates().values_list('id', 'user_id')[: self.claim_batch]
+        for pk, user_id in candidates:
+            with transaction.atomic():
+                if skip_locked:
+                    user = User.objects.select_for_update(skip_locked=True).filter(pk=user_id)
+                    if user.first() is None:
+                        continue
+                # re-checks the per-user limit in the same statement that takes the job
+                if self._candidates().filter(pk=pk).update(**claimed):
+                    return Job.objects.get(pk=pk)
+        return None
+
+    def run_next(self) -> Optional[Job]:
+        job = self.claim()
+        if job is not None:
+            self.run(job)
+        return job
+
+    def run(self, job: Job) -> Job:
+        handler = JOB_HANDLERS.get(job.kind)
+
+        def progress(done: int):
+            Job.objects.filter(pk=job.pk).update(progress=done, updated_at=timezone.now())
+
+        try:
+            if handler is None:
+                raise ValueError('Tipo de tarefa desconhecido.')
+            result = handler.run(job, progress)
+        except Exception as e:
+            logger.exception('job %s (%s) failed', job.pk, job.kind)
+            self._finish(job, Job.Status.FAILED, error=str(e))
+        else:
+            self._finish(job, Job.Status.SUCCEEDED, result=result)
+        return job
+
+    @staticmethod
+    def _finish(job: Job, status: str, result=None, error: str = ''):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = timezone.now()
+        if status == Job.Status.SUCCEEDED and job.total is not None:
+            job.progress = job.total
+        job.save(update_fields=['status', 'result', 'error', 'finished_at', 'progress', 'updated_at'])
+
+    @staticmethod
+    def recover_stale(stale_after: Optional[int] = None) -> int:
+        """Requeues retryable jobs whose worker stopped reporting and fails the rest."""
+        cutoff = timezone.now() - datetime.timedelta(
+            seconds=stale_after if stale_after is not None else _setting('STALE_AFTER')
+        )
+        stale = Job.objects.filter(status=Job.Status.RUNNING, updated_at__lt=cutoff)
+        retryable = [kind for kind, handler in JOB_HANDLERS.items() if handler.retryable]
+        requeued = stale.filter(kind__in=retryable).update(
+            status=Job.Status.PENDING, worker='', updated_at=timezone.now()
+        )
+        failed = stale.update(
+            status=Job.Status.FAILED,
+            error='Tarefa interrompida.',
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return requeued + failed
+
+
+@job_handler('import_expenses')
+def _import_expenses(job: Job, progress: Callable[[int], None]) -> Dict:
+    name = job.payload['file']
+    try:
+        return ExpenseImportService(job.user).run(
+            ExpenseImportService.iter_spooled(name), progress=progress
+        )
+    finally:
+        default_storage.delete(name)
+
+
+@job_handler('create_installments')
+def _create_installments(job: Job, progress: Callable[[int], None]) -> Dict:
+    payload = job.payload
+    plan = InstallmentExpenseService(
+        user=job.user,
+        name=payload['name'],
+        total_amount=Decimal(payload['total_amount']),
+        installments_quantity=payload['installments_quantity'],
+        first_due_date=datetime.date.fromisoformat(payload['first_due_date']),
+        category_id=payload['category_id'],
+    ).create_installment_expense()
+    return {'id': plan.id}
+
+
+@job_handler('rebuild_rollups', retryable=True)
+def _rebuild_rollups(job: Job, progress: Callable[[int], None]) -> Dict:
+    differences = RollupService.diff([job.user_id])
+    RollupService.rebuild([job.user_id])
+    return {'fixed': len(differences)}
@@ -0,0 +1,157 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from finances.services.month_cache_service import get_month_cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+_current_recorder: ContextVar[Optional['RequestRecorder']] = ContextVar(
+    'finances_request_recorder', default=None
+)
+
+
+class RequestRecorder:
+    """Per-request SQL counter and named timers.
+
+    Installed as a ``connection.execute_wrapper`` for the duration of the
+    request and published through a context variable so code paths can add
+    their own timings with ``timer``.
+    """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.timers: Dict[str, float] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.sql_count += 1
+
+    def add(self, name: str, seconds: float):
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def activate(self):
+        return _current_recorder.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current_recorder.reset(token)
+
+
+@contextmanager
+def timer(name: str):
+    """Adds the block's wall time to the active request, if any is recorded."""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a single ``view`` label."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series: Dict[str, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, view: str, value: float):
+        counts, totals = self._series.setdefault(view, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+
+    def clear(self):
+        self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for view in sorted(self._series):
+            counts, totals = self._series[view]
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{view="{view}",le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{view="{view}"}} {totals[0]}')
+            lines.append(f'{self.name}_count{{view="{view}"}} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local request histograms in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {
+            'duration': Histogram(
+                'finances_request_duration_seconds', 'Total request time.', DURATION_BUCKETS
+            ),
+            'sql_duration': Histogram(
+                'finances_request_sql_duration_seconds', 'Time spent in SQL per request.', DURATION_BUCKETS
+            ),
+            'sql_queries': Histogram(
+                'finances_request_sql_queries', 'SQL queries per request.', QUERY_BUCKETS
+            ),
+            'serialize_duration': Histogram(
+                'finances_request_serialize_duration_seconds',
+                'Time spent serializing per request.',
+                DURATION_BUCKETS,
+            ),
+        }
+
+    def observe(self, view: str, recorder: RequestRecorder, total_seconds: float):
+        with self._lock:
+            self.histograms['duration'].observe(view, total_seconds)
+            self.histograms['sql_duration'].observe(view, recorder.sql_seconds)
+            self.histograms['sql_queries'].observe(view, recorder.sql_count)
+            self.histograms['serialize_duration'].observe(
+                view, recorder.timers.get('serialize', 0.0)
+            )
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [line for histogram in self.histograms.values() for line in histogram.render()]
+
+        cache = get_month_cache().stats()
+        for name, value in (('hits', cache['hits']), ('misses', cache['misses'])):
+            metric = f'finances_month_cache_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            for histogram in self.histograms.values():
+                histogram.clear()
+
+
+@lru_cache(maxsize=None)
+def get_metrics_registry() -> MetricsRegistry:
+    return MetricsRegistry()
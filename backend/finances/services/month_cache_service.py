@@ -0,0 +1,215 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+
+class LocalMemoryMonthCacheBackend:
+    """Per-process LRU store for month payloads and their version counters."""
+
+    def __init__(self, max_entries: int = 1024, timeout: int = 300):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, names: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(name, 0) for name in names]
+
+    def incr_versions(self, names: Iterable[str]):
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+
+class DjangoMonthCacheBackend:
+    """Stores month payloads and version counters in a Django cache alias."""
+
+    def __init__(self, alias: str = 'default', timeout: int = 300, key_prefix: str = 'finances'):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def _key(self, name: str) -> str:
+        return f'{self.key_prefix}:{name}'
+
+    def get(self, key: str):
+        return self.cache.get(self._key(key))
+
+    def set(self, key: str, value):
+        self.cache.set(self._key(key), value, self.timeout)
+
+    def get_versions(self, names: List[str]) -> List[int]:
+        found = self.cache.get_many([self._key(name) for name in names])
+        return [found.get(self._key(name), 0) for name in names]
+
+    def incr_versions(self, names: Iterable[str]):
+        for name in names:
+            key = self._key(name)
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+
+class MonthCacheService:
+    """Caches serialized month listings keyed by (user, year, month, version).
+
+    Writes never delete entries: they bump a per-user or per-month version
+    counter, so stale payloads simply stop being addressed. Every month bump
+    also bumps a per-user write counter, which keys payloads that depend on
+    all of the user's data. Bumps are repeated on commit so a read racing an
+    open transaction cannot pin stale data.
+
+    Version counters only travel as far as the backend: with the per-process
+    default, another worker never sees them. Callers therefore pass the
+    request's change marker (see ChangeMarkerService), which is read from the
+    database and ends up in every key. ``clear()`` bumps a generation counter
+    that is also in every key, leaving the rest of a shared cache alone.
+    """
+
+    _generation_name = 'g'
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> 'MonthCacheService':
+        config = settings.FINANCES_MONTH_CACHE
+        backend_class = import_string(config['BACKEND'])
+        return cls(backend_class(**config.get('OPTIONS', {})))
+
+    @staticmethod
+    def _user_version_name(user_id: int) -> str:
+        return f'v:{user_id}'
+
+    @staticmethod
+    def _month_version_name(user_id: int, year: int, month: int) -> str:
+        return f'v:{user_id}:{year}:{month}'
+
+    @staticmethod
+    def _writes_version_name(user_id: int) -> str:
+        return f'w:{user_id}'
+
+    def _key(self, prefix: str, version_names: List[str], marker: str) -> str:
+        versions = self.backend.get_versions([self._generation_name, *version_names])
+        digest = hashlib.sha1(marker.encode()).hexdigest() if marker else ''
+        return ':'.join([prefix, *map(str, versions), digest])
+
+    def month_key(self, user_id: int, year: int, month: int, marker: str = '') -> str:
+        return self._key(
+            f'month:{user_id}:{year}:{month}',
+            [self._user_version_name(user_id), self._month_version_name(user_id, year, month)],
+            marker,
+        )
+
+    def user_key(self, user_id: int, name: str, marker: str = '') -> str:
+        return self._key(
+            f'{name}:{user_id}',
+            [self._user_version_name(user_id), self._writes_version_name(user_id)],
+            marker,
+        )
+
+    def get_or_build(self, user_id: int, year: int, month: int, build: Callable, marker: str = ''):
+        return self._get_or_build(self.month_key(user_id, year, month, marker), build)
+
+    def get_or_build_user(self, user_id: int, name: str, build: Callable, marker: str = ''):
+        """Caches a payload that any write to the user's data invalidates."""
+        return self._get_or_build(self.user_key(user_id, name, marker), build)
+
+    async def aget_or_build(
+        self, user_id: int, year: int, month: int, build: Callable, marker: str = ''
+    ):
+        """get_or_build for async views; ``build`` is a coroutine function."""
+        key = await sync_to_async(self.month_key)(user_id, year, month, marker)
+        payload = await sync_to_async(self.backend.get)(key)
+        if payload is not None:
+            self._count(hit=True)
+            return payload
+
+        self._count(hit=False)
+        payload = await build()
+        await sync_to_async(self.backend.set)(key, payload)
+        return payload
+
+    def _get_or_build(self, key: str, build: Callable):
+        payload = self.backend.get(key)
+        if payload is not None:
+            self._count(hit=True)
+            return payload
+
+        self._count(hit=False)
+        payload = build()
+        self.backend.set(key, payload)
+        return payload
+
+    def invalidate_months(self, user_id: int, months: Iterable[Tuple[int, int]]):
+        names = [self._month_version_name(user_id, y, m) for y, m in set(months)]
+        if names:
+            names.append(self._writes_version_name(user_id))
+        self._bump(names)
+
+    def invalidate_dates(self, user_id: int, dates: Iterable):
+        self.invalidate_months(user_id, ((d.year, d.month) for d in dates))
+
+    def invalidate_user(self, user_id: int):
+        self._bump([self._user_version_name(user_id)])
+
+    def _bump(self, names: List[str]):
+        if not names:
+            return
+        self.backend.incr_versions(names)
+        if connection.in_atomic_block:
+            transaction.on_commit(partial(self.backend.incr_versions, names))
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        self.backend.incr_versions([self._generation_name])
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+@lru_cache(maxsize=None)
+def get_month_cache() -> MonthCacheService:
+    return MonthCacheService.from_settings()
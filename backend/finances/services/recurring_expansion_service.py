@@ -0,0 +1,166 @@
+import datetime
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from finances.models import RecurringExpense, RecurringExpenseVersion
+from finances.utils.validations import FinancesValidations
+
+YearMonth = Tuple[int, int]
+PaidKey = Tuple[int, int, int]
+
+# month index used for rules without an end date
+OPEN_ENDED = 10 ** 9
+
+
+class VirtualExpense:
+    """Expense occurrence generated from a recurring rule.
+
+    Carries the attributes ExpenseSerializer reads and nothing else. The id
+    is the negated rule id, as the listing has always exposed it.
+    """
+
+    __slots__ = ('id', 'rule_id', 'name', 'amount', 'due_date', 'paid', 'category', 'category_id')
+
+    installment_origin = None
+    installment_origin_id = None
+
+    def __init__(self, rule_id, name, amount, due_date, paid, category, category_id):
+        self.id = -rule_id
+        self.rule_id = rule_id
+        self.name = name
+        self.amount = amount
+        self.due_date = due_date
+        self.paid = paid
+        self.category = category
+        self.category_id = category_id
+
+    def serializable_value(self, field_name: str):
+        # DRF's PrimaryKeyRelatedField reads foreign keys through this Model API.
+        try:
+            return getattr(self, f'{field_name}_id')
+        except AttributeError:
+            return getattr(self, field_name)
+
+    def __repr__(self):
+        return f'<VirtualExpense rule={self.rule_id} due_date={self.due_date}>'
+
+
+class RuleHistory:
+    """Past segments of one rule, as sorted month-index intervals.
+
+    Segments never overlap, so the one covering a month is found with a
+    bisect over their start indexes.
+    """
+
+    __slots__ = ('starts', 'segments')
+
+    def __init__(self, versions: Iterable[Tuple]):
+        ordered = sorted(versions)
+        self.starts = [
+            FinancesValidations.date_month_index(effective_from) for effective_from, *_ in ordered
+        ]
+        self.segments = [
+            (FinancesValidations.date_month_index(effective_to), amount, due_day)
+            for _, effective_to, amount, due_day in ordered
+        ]
+
+    def at(self, index: int) -> Optional[Tuple]:
+        """(amount, due_day) in force at a month index, or None for the rule's own."""
+        position = bisect_right(self.starts, index) - 1
+        if position < 0:
+            return None
+        last, amount, due_day = self.segments[position]
+        return (amount, due_day) if index <= last else None
+
+    @staticmethod
+    def versions_in_range(rule_ids: Iterable[int], first_day: datetime.date, last_day: datetime.date):
+        """values_list of the versions of ``rule_ids`` overlapping the range."""
+        return (
+            RecurringExpenseVersion.objects.filter(
+                recurring_expense_id__in=list(rule_ids),
+                effective_from__lte=last_day,
+                effective_to__gte=first_day,
+            )
+            .order_by()
+            .values_list('recurring_expense_id', 'effective_from', 'effective_to', 'amount', 'due_day')
+        )
+
+    @classmethod
+    def group(cls, rows: Iterable[Tuple]) -> Dict[int, 'RuleHistory']:
+        """Histories keyed by rule id from versions_in_range rows."""
+        versions = defaultdict(list)
+        for rule_id, *version in rows:
+            versions[rule_id].append(tuple(version))
+        return {rule_id: cls(rule_versions) for rule_id, rule_versions in versions.items()}
+
+
+def edited_since(versioned_until: Optional[datetime.date], first_day: datetime.date) -> bool:
+    """Whether a rule has versions reaching into a range starting at ``first_day``."""
+    return versioned_until is not None and versioned_until >= first_day
+
+
+class RecurringExpansionService:
+    """Expands recurring rules into VirtualExpense records for a month range.
+
+    Each rule's active window is reduced to a pair of month indexes once, so
+    a multi-year projection costs one comparison per rule and month; due days
+    past the end of a month are clamped to its last day.
+    Rules edited in the past carry a RuleHistory, consulted only for them, so
+    earlier months keep the amount and due day they had at the time.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[RecurringExpense],
+        histories: Optional[Dict[int, RuleHistory]] = None,
+    ):
+        histories = histories or {}
+        date_month_index = FinancesValidations.date_month_index
+        self.windows = [
+            (
+                date_month_index(rule.start_date),
+                date_month_index(rule.end_date) if rule.end_date else OPEN_ENDED,
+                rule,
+                histories.get(rule.id),
+            )
+            for rule in rules
+        ]
+
+    def expand(
+        self, start: YearMonth, end: YearMonth, paid: Optional[Set[PaidKey]] = None
+    ) -> List[VirtualExpense]:
+        """Occurrences month by month, in rule order within each month."""
+        paid = paid or set()
+        records: List[VirtualExpense] = []
+        first, last = FinancesValidations.month_index(*start), FinancesValidations.month_index(*end)
+        for index in range(first, last + 1):
+            records.extend(self._expand_index(index, paid))
+        return records
+
+    def expand_month(
+        self, year: int, month: int, paid: Optional[Set[PaidKey]] = None
+    ) -> List[VirtualExpense]:
+        return self._expand_index(FinancesValidations.month_index(year, month), paid or set())
+
+    def _expand_index(self, index: int, paid: Set[PaidKey]) -> List[VirtualExpense]:
+        year, month = FinancesValidations.month_of(index)
+        records = []
+        for first, last, rule, history in self.windows:
+            if not first <= index <= last:
+                continue
+            amount, due_day = rule.amount, rule.due_day
+            if history is not None:
+                amount, due_day = history.at(index) or (amount, due_day)
+            records.append(
+                VirtualExpense(
+                    rule.id,
+                    rule.name,
+                    amount,
+                    FinancesValidations.safe_due_date(year, month, due_day),
+                    (rule.id, month, year) in paid,
+                    rule.category,
+                    rule.category_id,
+                )
+            )
+        return records
@@ -0,0 +1,69 @@
+import datetime
+from typing import Optional
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from finances.models import Category, RecurringExpense, RecurringExpenseVersion
+from finances.services.month_cache_service import get_month_cache
+
+
+class RecurringExpenseService:
+    """Edits recurring rules without rewriting the months already past."""
+
+    VERSIONED_FIELDS = ('amount', 'due_day')
+
+    def __init__(self, user: User, today: Optional[datetime.date] = None):
+        self.user = user
+        self.today = today or timezone.localdate()
+
+    def update_rule(self, rule: RecurringExpense, **changes) -> RecurringExpense:
+        """Applies rule edits from the current month onwards.
+
+        When the amount or due day changes, the values in force until the end
+        of last month are stored as a RecurringExpenseVersion and
+        ``versioned_until`` moves up to that day. Several edits within one
+        month only keep the first month's history.
+        """
+        if 'category_id' in changes and not Category.objects.filter(
+            id=changes['category_id'], user=self.user
+        ).exists():
+            raise ValueError('Categoria não encontrada.')
+
+        with transaction.atomic():
+            if not RecurringExpense.objects.select_for_update().filter(
+                pk=rule.pk, user=self.user
+            ).exists():
+                raise ValueError('Despesa recorrente não encontrada.')
+            if any(
+                field in changes and changes[field] != getattr(rule, field)
+                for field in self.VERSIONED_FIELDS
+            ):
+                self._close_segment(rule)
+            for attr, value in changes.items():
+                setattr(rule, attr, value)
+            rule.save()
+
+        get_month_cache().invalidate_user(self.user.id)
+        return rule
+
+    def _close_segment(self, rule: RecurringExpense):
+        effective_to = self.today.replace(day=1) - datetime.timedelta(days=1)
+        if rule.end_date is not None:
+            effective_to = min(effective_to, rule.end_date)
+        if rule.versioned_until is not None:
+            effective_from = rule.versioned_until + datetime.timedelta(days=1)
+        else:
+            effective_from = rule.start_date.replace(day=1)
+        if effective_from > effective_to:
+            return
+
+        RecurringExpenseVersion.objects.create(
+            recurring_expense=rule,
+            amount=rule.amount,
+            due_day=rule.due_day,
+            effective_from=effective_from,
+            effective_to=effective_to,
+        )
+        rule.versioned_until = effective_to
@@ -0,0 +1,230 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from finances.models import Expense, MonthlyCategoryRollup
+
+ZERO = Decimal('0.00')
+
+# (year, month, category_id) -> [amount, paid_amount, count]
+RollupKey = Tuple[int, int, Optional[int]]
+Deltas = Dict[RollupKey, List]
+
+
+def _new_delta() -> List:
+    return [ZERO, ZERO, 0]
+
+
+class RollupService:
+    """Keeps MonthlyCategoryRollup in step with the user's concrete expenses.
+
+    Every write path that creates, edits or deletes Expense rows reports the
+    change here, either as model instances or as a queryset that is
+    aggregated in SQL. Recurring rules are open-ended and stay out of the
+    rollup; their totals come from the rules themselves.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def add_expenses(self, expenses: Iterable[Expense]):
+        self.apply(self._expense_deltas(expenses, sign=1))
+
+    def remove_expenses(self, expenses: Iterable[Expense]):
+        self.apply(self._expense_deltas(expenses, sign=-1))
+
+    def replace_expenses(self, previous: Iterable[Expense], current: Iterable[Expense]):
+        """Applies an edit of many rows, given their old and new states, in one pass."""
+        deltas = self._expense_deltas(previous, sign=-1)
+        for key, (amount, paid_amount, count) in self._expense_deltas(current, sign=1).items():
+            delta = deltas[key]
+            delta[0] += amount
+            delta[1] += paid_amount
+            delta[2] += count
+        self.apply(deltas)
+
+    def remove_queryset(self, queryset):
+        self.apply(self.queryset_deltas(queryset, sign=-1))
+
+    def change_paid(self, expenses: Iterable[Expense], paid: bool):
+        """Moves amounts in or out of paid_amount for rows whose flag flipped."""
+        sign = 1 if paid else -1
+        deltas: Deltas = defaultdict(_new_delta)
+        for expense in expenses:
+            key = (expense.due_date.year, expense.due_date.month, expense.category_id)
+            deltas[key][1] += sign * Decimal(expense.amount)
+        self.apply(deltas)
+
+    def reassign_category(self, category_id: int):
+        """Folds a category's rollups into the uncategorized bucket."""
+        with transaction.atomic():
+            rows = list(
+                MonthlyCategoryRollup.objects.select_for_update().filter(
+                    user=self.user, category_id=category_id
+                )
+            )
+            deltas: Deltas = defaultdict(_new_delta)
+            for row in rows:
+                deltas[(row.year, row.month, None)] = [row.amount, row.paid_amount, row.count]
+            MonthlyCategoryRollup.objects.filter(id__in=[row.id for row in rows]).delete()
+            self.apply(deltas)
+
+    def apply(self, deltas: Deltas):
+        deltas = {key: value for key, value in deltas.items() if any(value)}
+        if not deltas:
+            return
+
+        with transaction.atomic():
+            existing = self._locked_rows(deltas)
+            missing = [
+                key for key, (_, _, count) in deltas.items() if key not in existing and count > 0
+            ]
+            if missing:
+                # select_for_update cannot lock rows that do not exist yet: insert
+                # empty ones, letting a concurrent insert of the same key win, and
+                # lock whichever row ended up stored
+                MonthlyCategoryRollup.objects.bulk_create(
+                    (
+                        MonthlyCategoryRollup(
+                            user=self.user, year=year, month=month, category_id=category_id
+                        )
+                        for year, month, category_id in missing
+                    ),
+                    ignore_conflicts=True,
+                )
+                existing = self._locked_rows(deltas)
+
+            now = timezone.now()
+            to_update, to_delete = [], []
+            for (year, month, category_id), (amount, paid_amount, count) in deltas.items():
+                row = existing.get((year, month, category_id))
+                if row is None:
+                    # nothing to subtract from; rebuild_rollups repairs drift
+                    continue
+
+                row.amount += amount
+                row.paid_amount += paid_amount
+                row.count += count
+                row.updated_at = now
+                if row.count <= 0:
+                    to_delete.append(row.id)
+                else:
+                    to_update.append(row)
+
+            if to_update:
+                MonthlyCategoryRollup.objects.bulk_update(
+                    to_update, ['amount', 'paid_amount', 'count', 'updated_at']
+                )
+            if to_delete:
+                MonthlyCategoryRollup.objects.filter(id__in=to_delete).delete()
+
+    def _locked_rows(self, deltas: Deltas) -> Dict[RollupKey, MonthlyCategoryRollup]:
+        return {
+            (row.year, row.month, row.category_id): row
+            for row in MonthlyCategoryRollup.objects.select_for_update().filter(
+                user=self.user, year__in={year for year, _, _ in deltas}
+            )
+        }
+
+    @staticmethod
+    def _expense_deltas(expenses: Iterable[Expense], sign: int) -> Deltas:
+        deltas: Deltas = defaultdict(_new_delta)
+        for expense in expenses:
+            amount = sign * Decimal(expense.amount)
+            delta = deltas[(expense.due_date.year, expense.due_date.month, expense.category_id)]
+            delta[0] += amount
+            delta[1] += amount if expense.paid else ZERO
+            delta[2] += sign
+        return deltas
+
+    @staticmethod
+    def aggregate(queryset):
+        return (
+            queryset.order_by()
+            .values(
+                'user_id',
+                'category_id',
+                year=ExtractYear('due_date'),
+                month=ExtractMonth('due_date'),
+            )
+            .annotate(
+                total_amount=Sum('amount'),
+                total_paid=Sum('amount', filter=Q(paid=True)),
+                total_count=Count('id'),
+            )
+        )
+
+    @classmethod
+    def queryset_deltas(cls, queryset, sign: int = 1) -> Deltas:
+        deltas: Deltas = defaultdict(_new_delta)
+        for row in cls.aggregate(queryset):
+            deltas[(row['year'], row['month'], row['category_id'])] = [
+                sign * row['total_amount'],
+                sign * (row['total_paid'] or ZERO),
+                sign * row['total_count'],
+            ]
+        return deltas
+
+    @classmethod
+    def diff(cls, user_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Compares stored rollups with a fresh aggregate of Expense."""
+        expenses = Expense.objects.all()
+        stored = MonthlyCategoryRollup.objects.all()
+        if user_ids is not None:
+            expenses = expenses.filter(user_id__in=user_ids)
+            stored = stored.filter(user_id__in=user_ids)
+
+        fresh = {
+            (row['user_id'], row['year'], row['month'], row['category_id']): (
+                row['total_amount'],
+                row['total_paid'] or ZERO,
+                row['total_count'],
+            )
+            for row in cls.aggregate(expenses)
+        }
+        current: Dict = defaultdict(lambda: (ZERO, ZERO, 0))
+        for row in stored:
+            key = (row.user_id, row.year, row.month, row.category_id)
+            amount, paid_amount, count = current[key]
+            current[key] = (amount + row.amount, paid_amount + row.paid_amount, count + row.count)
+
+        differences = []
+        for key in sorted(set(fresh) | set(current), key=lambda k: (*k[:3], k[3] or 0)):
+            expected = fresh.get(key, (ZERO, ZERO, 0))
+            found = current.get(key, (ZERO, ZERO, 0))
+            if expected != found:
+                differences.append({'key': key, 'expected': expected, 'found': found})
+        return differences
+
+    @classmethod
+    def rebuild(cls, user_ids: Optional[Iterable[int]] = None):
+        """Replaces stored rollups with a fresh aggregate of Expense."""
+        expenses = Expense.objects.all()
+        stored = MonthlyCategoryRollup.objects.all()
+        if user_ids is not None:
+            expenses = expenses.filter(user_id__in=user_ids)
+            stored = stored.filter(user_id__in=user_ids)
+
+        with transaction.atomic():
+            stored.delete()
+            MonthlyCategoryRollup.objects.bulk_create(
+                (
+                    MonthlyCategoryRollup(
+                        user_id=row['user_id'],
+                        category_id=row['category_id'],
+                        year=row['year'],
+                        month=row['month'],
+                        amount=row['total_amount'],
+                        paid_amount=row['total_paid'] or ZERO,
+                        count=row['total_count'],
+                    )
+                    for row in cls.aggregate(expenses)
+                ),
+                batch_size=1000,
+            )
@@ -1,10 +1,14 @@
 import calendar
 import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Optional
 
+from django.db.models import Q
 from rest_framework.exceptions import ValidationError
 
 
 class FinancesValidations:
+    MAX_RANGE_MONTHS = 120
 
     @staticmethod
     def validate_month_year(year, month):
@@ -17,11 +21,154 @@ class FinancesValidations:
         except (ValueError, TypeError):
             raise ValidationError({'error': 'Ano e mês devem ser números inteiros.'})
 
+        if not (1 <= year <= 9999):
+            raise ValidationError({'error': 'Ano deve estar entre 1 e 9999.'})
+
         if not (1 <= month <= 12):
             raise ValidationError({'error': 'Mês deve estar entre 1 e 12.'})
 
         return year, month
 
+    @staticmethod
+    def _parse_year_month(value) -> tuple[int, int]:
+        """Parses one AAAA-MM value into (year, month)."""
+        try:
+            year, month = (int(part) for part in value.split('-'))
+        except (ValueError, TypeError, AttributeError):
+            raise ValidationError({'error': 'Use o formato AAAA-MM.'})
+
+        if not (1 <= year <= 9999):
+            raise ValidationError({'error': 'Use o formato AAAA-MM.'})
+
+        if not (1 <= month <= 12):
+            raise ValidationError({'error': 'Mês deve estar entre 1 e 12.'})
+
+        return year, month
+
+    @staticmethod
+    def validate_month_range(start, end):
+        if not start or not end:
+            raise ValidationError({'error': 'Os campos from e to são obrigatórios.'})
+
+        start_year, start_month = FinancesValidations._parse_year_month(start)
+        end_year, end_month = FinancesValidations._parse_year_month(end)
+
+        if (start_year, start_month) > (end_year, end_month):
+            raise ValidationError({'error': 'O início deve ser anterior ao fim.'})
+
+        span = (end_year - start_year) * 12 + end_month - start_month + 1
+        if span > FinancesValidations.MAX_RANGE_MONTHS:
+            raise ValidationError(
+                {'error': f'O intervalo máximo é de {FinancesValidations.MAX_RANGE_MONTHS} meses.'}
+            )
+
+        return (start_year, start_month), (end_year, end_month)
+
+    @staticmethod
+    def validate_export_range(start, end):
+        """Like validate_month_range, but either side may be left open and any span is allowed."""
+        bounds = [
+            FinancesValidations._parse_year_month(value) if value else None
+            for value in (start, end)
+        ]
+
+        if bounds[0] and bounds[1] and bounds[0] > bounds[1]:
+            raise ValidationError({'error': 'O início deve ser anterior ao fim.'})
+
+        return bounds[0], bounds[1]
+
+    @staticmethod
+    def validate_months_ahead(value, default: int = 12) -> int:
+        if value in (None, ''):
+            return default
+
+        try:
+            months = int(value)
+        except (ValueError, TypeError):
+            raise ValidationError({'error': 'A quantidade de meses deve ser um número inteiro.'})
+
+        if not (1 <= months <= FinancesValidations.MAX_RANGE_MONTHS):
+            raise ValidationError(
+                {'error': f'A quantidade de meses deve estar entre 1 e {FinancesValidations.MAX_RANGE_MONTHS}.'}
+            )
+
+        return months
+
+    @staticmethod
+    def validate_search_params(params) -> dict:
+        """Optional filters of the expense search, each left as None when absent."""
+        filters = {'query': (params.get('q') or '').strip()}
+
+        category = params.get('category')
+        try:
+            filters['category_id'] = int(category) if category else None
+        except ValueError:
+            raise ValidationError({'error': 'Categoria inválida.'})
+
+        for param, name in (('min', 'min_amount'), ('max', 'max_amount')):
+            raw = params.get(param)
+            try:
+                amount = Decimal(raw) if raw else None
+            except InvalidOperation:
+                amount = Decimal('NaN')
+            if amount is not None and not amount.is_finite():
+                raise ValidationError({'error': 'Valor inválido.'})
+            filters[name] = amount
+
+        paid = (params.get('paid') or '').lower()
+        if paid not in ('', 'true', 'false'):
+            raise ValidationError({'error': 'O campo paid deve ser true ou false.'})
+        filters['paid'] = None if not paid else paid == 'true'
+
+        for param, name in (('from', 'start'), ('to', 'end')):
+            raw = params.get(param)
+            filters[name] = FinancesValidations._parse_year_month(raw) if raw else None
+
+        if filters['start'] and filters['end'] and filters['start'] > filters['end']:
+            raise ValidationError({'error': 'O início deve ser anterior ao fim.'})
+
+        return filters
+
+    @staticmethod
+    def iter_months(start: tuple[int, int], end: tuple[int, int]):
+        year, month = start
+        while (year, month) <= end:
+            yield year, month
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    @staticmethod
+    def month_index(year: int, month: int) -> int:
+        """Months since year 0, so month arithmetic becomes integer arithmetic."""
+        return year * 12 + month - 1
+
+    @staticmethod
+    def date_month_index(value: datetime.date) -> int:
+        return FinancesValidations.month_index(value.year, value.month)
+
+    @staticmethod
+    def month_of(index: int) -> tuple[int, int]:
+        return index // 12, index % 12 + 1
+
+    @staticmethod
+    def month_range_q(
+        start: Optional[tuple[int, int]] = None,
+        end: Optional[tuple[int, int]] = None,
+        prefix: str = '',
+    ) -> Q:
+        """Rows whose ``year``/``month`` columns fall within [start, end]; either side may be open."""
+        year, month = f'{prefix}year', f'{prefix}month'
+        condition = Q()
+        if start is not None:
+            condition &= Q(**{f'{year}__gt': start[0]}) | Q(**{year: start[0], f'{month}__gte': start[1]})
+        if end is not None:
+            condition &= Q(**{f'{year}__lt': end[0]}) | Q(**{year: end[0], f'{month}__lte': end[1]})
+        return condition
+
+    @staticmethod
+    def month_bounds(year: int, month: int) -> tuple[datetime.date, datetime.date]:
+        last_day = calendar.monthrange(year, month)[1]
+        return datetime.date(year, month, 1), datetime.date(year, month, last_day)
+
     @staticmethod
     def safe_due_date(year: int, month: int, day: int) -> datetime.date:
         last_day = calendar.monthrange(year, month)[1]